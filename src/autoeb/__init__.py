@@ -1,8 +1,15 @@
+from .adaptive_bootstrap import AdaptiveBootstrap
 from .catpv_result import CatpvResult
 from .consel_manager import ConselManager
 from .configuration import Configuration
 from .iqtree_manager import IqtreeManager
+from .job_execution_error import JobExecutionError
+from .job_executor import JobExecutor
+from .model_parameters import ModelParameters
 from .operation_manager import OperationManager
 from .output_formatter import OutputFormatter
+from .prescreen import Prescreen
+from .slh_data import SlhData
 from .statistics_entry import StatisticsEntry
+from .thread_scheduler import ThreadScheduler
 from .value_range import ValueRange
@@ -0,0 +1,66 @@
+import math
+
+from .catpv_result import CatpvResult
+from .statistics_entry import StatisticsEntry
+
+
+class AdaptiveBootstrap:
+    """RELL bootstrapの複製数を段階的に増やす手順を表します。
+    AU検定のp値の信頼区間が有意水準をまたぐ二分岐だけが，より多い複製数で再検定されます。
+    """
+
+    __GROWTH: int = 10
+    __Z_SCORE: float = 3.0
+
+    def __init__(self, initial: int, maximum: int, sig_level: float) -> None:
+        """AdaptiveBootstrapの新しいインスタンスを初期化します。
+
+        Args:
+            initial (int): 最初に用いる複製数
+            maximum (int): 複製数の上限
+            sig_level (float): 有意水準
+        """
+        if initial < 1 or maximum < initial:
+            raise ValueError("initial must be between 1 and maximum")
+        self.__replicates: list[int] = []
+        current: int = initial
+        while current < maximum:
+            self.__replicates.append(current)
+            current *= self.__GROWTH
+        self.__replicates.append(maximum)
+        self.__sig_level: float = sig_level
+
+    @property
+    def replicates(self) -> list[int]:
+        """各段階で用いる複製数を取得します（昇順）。
+        """
+        return list(self.__replicates)
+
+    @staticmethod
+    def get_standard_error(stat: StatisticsEntry) -> float:
+        """AU検定のp値のモンテカルロ誤差の標準誤差を取得します。
+        p値はスケールごとのBPの回帰から求められるため，BPの二項分布ではなく，catpv -sが出力する回帰の標準誤差を用います。
+
+        Args:
+            stat (StatisticsEntry): 樹形の検定結果
+
+        Returns:
+            float: 標準誤差。検定結果が標準誤差を持たない場合は無限大
+        """
+        return math.inf if math.isnan(stat.au_se) else stat.au_se
+
+    def is_decided(self, catpv: CatpvResult) -> bool:
+        """二分岐の支持・不支持が検定に用いた複製数で確定しているかどうかを判定します。
+
+        Args:
+            catpv (CatpvResult): CATPVファイルの情報
+
+        Returns:
+            bool: いずれかのNNI樹形が明らかに棄却されないか，全てのNNI樹形が明らかに棄却される場合はTrue，それ以外（標準誤差が不明な場合を含む）でFalse
+        """
+        margins: list[float] = [
+            (stat.au - self.__sig_level) / max(self.get_standard_error(stat), 1e-12)
+            for stat in [catpv.stat_nni1, catpv.stat_nni2]]
+        if any([m >= self.__Z_SCORE for m in margins]):
+            return True
+        return all([m <= -self.__Z_SCORE for m in margins])
@@ -0,0 +1,61 @@
+from datetime import datetime
+from sys import stdout
+from typing import TextIO
+
+from .consts import OUTFILE_LOG
+from .core_pool import CorePool
+from .cui import BatchArguments, CommandArguments
+from .job_executor import JobExecutor
+from .operation_manager import OperationManager
+
+
+class BatchManager:
+    """複数のデータセットを1つのプロセスで解析します。
+    IQ-TREEとCONSELの処理は全てのデータセットで共有するコアに割り当てられるため，小さなデータセットの処理が同時に進みます。
+    """
+
+    def __init__(self, args: BatchArguments) -> None:
+        """BatchManagerの新しいインスタンスを初期化します。
+
+        Args:
+            args (BatchArguments): 引数
+        """
+        self.__args: BatchArguments = args
+        self.__logger: TextIO = stdout
+
+    def execute(self) -> None:
+        """処理を実行します。
+
+        Raises:
+            ArgumentError: 引数またはデータセットの一覧が不正
+            JobExecutionError: 解析に失敗したデータセットが存在する（全てのデータセットの終了後に送出）
+        """
+        datasets: list[CommandArguments] = [
+            CommandArguments(["-s", seq, "-t", tree, "-m", model, "-o", out] + self.__args.options)
+            for seq, tree, model, out in self.__args.datasets]
+        pool = CorePool(self.__args.cores)
+        print(f"Start analyzing {len(datasets)} datasets ({pool.cores} cores shared, {self.__args.concurrent_datasets} datasets at once)", file=self.__logger)
+        with JobExecutor[int, None](self.__args.concurrent_datasets) as executor:
+            for index, dataset in enumerate(datasets):
+                executor.submit(index, self.__run, dataset, pool, index, len(datasets))
+            executor.wait()
+        print(f"Finish analyzing {len(datasets)} datasets", file=self.__logger)
+
+    def __run(self, args: CommandArguments, pool: CorePool, index: int, count: int) -> None:
+        """1つのデータセットを解析します。進捗は出力先のログファイルに書き込まれます。
+
+        Args:
+            args (CommandArguments): データセットの引数
+            pool (CorePool): 全てのデータセットで共有するコア
+            index (int): データセットの番号
+            count (int): データセット数
+        """
+        start_time: datetime = datetime.now()
+        print(f"  Dataset No. {index} / {count - 1} started ('{args.out_dir}')", file=self.__logger)
+        try:
+            with open(args.get_out_file_path(OUTFILE_LOG), "wt") as log:
+                OperationManager(args, log, pool).execute()
+        except Exception as e:
+            print(f"  Dataset No. {index} / {count - 1} failed: {e}", file=self.__logger)
+            raise
+        print(f"  Dataset No. {index} / {count - 1} finished in {datetime.now() - start_time}", file=self.__logger)
@@ -0,0 +1,346 @@
+from argparse import ArgumentParser
+from datetime import datetime
+import json
+import os
+import platform
+import random
+import statistics
+from sys import argv, stdout
+import tempfile
+from time import perf_counter
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from ..catpv_result import CatpvResult
+from ..nnigen import read_tree, Tree
+from ..nnigen.io import treetype
+from ..slh_data import SlhData
+
+SHAPES: list[str] = ["balanced", "caterpillar"]
+
+
+def generate_balanced_newick(taxa: int) -> str:
+    """根の3つの部分木がそれぞれ平衡な二分木となる無根系統樹を生成します。
+
+    Args:
+        taxa (int): 葉の数（4以上）
+
+    Returns:
+        str: Newick形式の系統樹
+    """
+    def subtree(start: int, end: int) -> str:
+        if end - start == 1:
+            return f"t{start}:0.1"
+        middle: int = (start + end) // 2
+        return f"({subtree(start, middle)},{subtree(middle, end)})90:0.05"
+
+    first: int = taxa // 3
+    second: int = first + (taxa - first) // 2
+    return f"({subtree(0, first)},{subtree(first, second)},{subtree(second, taxa)});"
+
+
+def generate_caterpillar_newick(taxa: int) -> str:
+    """全ての枝が1本の経路上に並ぶ（最も深い）無根系統樹を生成します。
+
+    Args:
+        taxa (int): 葉の数（4以上）
+
+    Returns:
+        str: Newick形式の系統樹
+    """
+    # ((...((t0,t1),t2),...),t(n-2),t(n-1)); is built without recursion
+    inner: int = taxa - 2
+    parts: list[str] = ["(" * inner, "t0:0.1"]
+    parts += [f",t{index}:0.1)90:0.05" for index in range(1, inner)]
+    parts.append(f",t{taxa - 2}:0.1,t{taxa - 1}:0.1);")
+    return str.join("", parts)
+
+
+def generate_sitelh(trees: int, sites: int, seed: int) -> SlhData:
+    """座位ごとの対数尤度を乱数で生成します。
+
+    Args:
+        trees (int): ツリー数
+        sites (int): 座位数
+        seed (int): 乱数のシード値
+
+    Returns:
+        SlhData: 生成した尤度一覧
+    """
+    generator = random.Random(seed)
+    return SlhData([[-generator.uniform(1.0, 20.0) for _ in range(sites)] for _ in range(trees)])
+
+
+def generate_catpv(results: int, seed: int) -> str:
+    """catpvの出力を乱数で生成します。
+
+    Args:
+        results (int): 含める検定結果の数
+        seed (int): 乱数のシード値
+
+    Returns:
+        str: catpvの出力
+    """
+    generator = random.Random(seed)
+    lines: list[str] = []
+    for index in range(results):
+        lines.append(f"# reading {index}.pv")
+        lines.append("# rank item    obs     au     np |     bp     pp     kh     sh    wkh    wsh |")
+        for rank, item in enumerate(generator.sample([1, 2, 3], 3), 1):
+            values: list[str] = [f"{generator.random():.3f}" for _ in range(8)]
+            lines.append(f"# {rank:4d} {item:4d} {generator.uniform(-5.0, 5.0):6.1f} {str.join(' ', values[:2])} | {str.join(' ', values[2:])} |")
+        lines.append("")
+    return str.join("\n", lines)
+
+
+def measure(benchmark: str, params: dict[str, Any], function: Callable[[], object], repeats: int) -> dict[str, Any]:
+    """処理を繰り返して時間を計測した後，もう1度実行してtracemallocでメモリの最大使用量を計測します。
+
+    Args:
+        benchmark (str): ベンチマークの名前
+        params (dict[str, Any]): 入力の大きさなどの条件
+        function (Callable[[], object]): 計測する処理
+        repeats (int): 時間を計測する回数
+
+    Returns:
+        dict[str, Any]: 計測結果。処理が例外を送出した場合はerrorに例外の名前を格納
+    """
+    result: dict[str, Any] = {"benchmark": benchmark, **params}
+    try:
+        seconds: list[float] = []
+        for _ in range(repeats):
+            start: float = perf_counter()
+            function()
+            seconds.append(perf_counter() - start)
+        # tracemalloc slows down the function, so memory is measured separately from time
+        tracemalloc.start()
+        try:
+            function()
+            peak: int = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    except (RecursionError, MemoryError) as e:
+        result["error"] = type(e).__name__
+        return result
+    result["min_sec"] = min(seconds)
+    result["median_sec"] = statistics.median(seconds)
+    result["peak_bytes"] = peak
+    return result
+
+
+def run_tree_benchmarks(shape: str, taxa: int, nni_trees: int, repeats: int, work_dir: str) -> list[dict[str, Any]]:
+    """合成した系統樹の読み込み，書き出しとNNI樹形の生成を計測します。
+
+    Args:
+        shape (str): 系統樹の形（balancedまたはcaterpillar）
+        taxa (int): 葉の数
+        nni_trees (int): 生成するNNI樹形の数
+        repeats (int): 時間を計測する回数
+        work_dir (str): 一時ファイルの出力先
+
+    Returns:
+        list[dict[str, Any]]: 計測結果
+    """
+    params: dict[str, Any] = {"shape": shape, "taxa": taxa}
+    source: str = os.path.join(work_dir, f"{shape}-{taxa}.tree")
+    with open(source, "wt") as tree_io:
+        tree_io.write(generate_balanced_newick(taxa) if shape == "balanced" else generate_caterpillar_newick(taxa))
+
+    results: list[dict[str, Any]] = [measure("read_tree", params, lambda: read_tree(source, treetype.newick), repeats)]
+    if "error" in results[0]:
+        return results
+    tree: Tree = read_tree(source, treetype.newick)
+    destination: str = os.path.join(work_dir, "export.tree")
+    results.append(measure("Tree.export", params, lambda: tree.export(destination, treetype.newick), repeats))
+
+    def generate() -> None:
+        for index, _ in enumerate(tree.iterate_all_nni_trees(), 1):
+            if index >= nni_trees:
+                break
+
+    results.append(measure("iterate_all_nni_trees", {**params, "nni_trees": nni_trees}, generate, repeats))
+    return results
+
+
+def run_sitelh_benchmarks(trees: int, sites: int, repeats: int, work_dir: str) -> list[dict[str, Any]]:
+    """合成した尤度一覧の書き出し，読み込みと2分割ごとの結合を計測します。
+
+    Args:
+        trees (int): ツリー数（最尤樹形と2つずつのNNI樹形）
+        sites (int): 座位数
+        repeats (int): 時間を計測する回数
+        work_dir (str): 一時ファイルの出力先
+
+    Returns:
+        list[dict[str, Any]]: 計測結果
+    """
+    params: dict[str, Any] = {"trees": trees, "sites": sites}
+    sitelh: SlhData = generate_sitelh(trees, sites, trees * sites)
+    path: str = os.path.join(work_dir, f"{trees}-{sites}.sitelh")
+    results: list[dict[str, Any]] = [measure("SlhData.export", params, lambda: sitelh.export(path), repeats)]
+    results.append(measure("SlhData.load", params, lambda: SlhData.load(path), repeats))
+
+    def concat() -> None:
+        # the same as the AU tests: the ML tree is concatenated with 2 NNI trees of each bipartition
+        for tree_index in range(1, trees - 1, 2):
+            SlhData.concat(sitelh[0:1], sitelh[tree_index:(tree_index + 2)])
+
+    results.append(measure("SlhData.concat", params, concat, repeats))
+    return results
+
+
+def run_catpv_benchmarks(count: int, repeats: int, work_dir: str) -> list[dict[str, Any]]:
+    """合成したcatpvの出力の読み込みを計測します。
+
+    Args:
+        count (int): 出力に含まれる検定結果の数
+        repeats (int): 時間を計測する回数
+        work_dir (str): 一時ファイルの出力先
+
+    Returns:
+        list[dict[str, Any]]: 計測結果
+    """
+    path: str = os.path.join(work_dir, f"{count}.catpv")
+    with open(path, "wt") as catpv_io:
+        catpv_io.write(generate_catpv(count, count))
+    return [measure("CatpvResult.load", {"results": count}, lambda: CatpvResult.load(path), repeats)]
+
+
+def get_key(result: dict[str, Any]) -> Tuple[Any, ...]:
+    """2つの実行の結果を対応付けるキーを取得します。
+
+    Args:
+        result (dict[str, Any]): 計測結果
+
+    Returns:
+        Tuple[Any, ...]: ベンチマークの名前と条件
+    """
+    return tuple((name, value) for name, value in sorted(result.items()) if not name in ["min_sec", "median_sec", "peak_bytes", "error"])
+
+
+def compare(results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float) -> list[str]:
+    """以前の実行の結果と比較し，時間またはメモリがthreshold倍を超えて増加したベンチマークを取得します。
+
+    Args:
+        results (list[dict[str, Any]]): 今回の計測結果
+        baseline (list[dict[str, Any]]): 比較する以前の計測結果
+        threshold (float): 退行とみなす比率
+
+    Returns:
+        list[str]: 退行したベンチマークの説明
+    """
+    previous: dict[Tuple[Any, ...], dict[str, Any]] = {get_key(result): result for result in baseline}
+    regressions: list[str] = []
+    for result in results:
+        before: dict[str, Any] | None = previous.get(get_key(result))
+        if before is None:
+            continue
+        label: str = str.join(" ", [f"{name}={value}" for name, value in get_key(result)])
+        if "error" in result and not "error" in before:
+            regressions.append(f"{label}: {result['error']}")
+            continue
+        for metric in ["min_sec", "peak_bytes"]:
+            if metric in result and metric in before and before[metric] > 0 and result[metric] / before[metric] > threshold:
+                regressions.append(f"{label}: {metric} {before[metric]:.6g} -> {result[metric]:.6g} ({result[metric] / before[metric]:.2f}x)")
+    return regressions
+
+
+def format_result(result: dict[str, Any]) -> str:
+    """計測結果を表示する文字列を取得します。
+
+    Args:
+        result (dict[str, Any]): 計測結果
+
+    Returns:
+        str: 表示する文字列
+    """
+    params: str = str.join(", ", [f"{name}={value}" for name, value in result.items() if not name in ["benchmark", "min_sec", "median_sec", "peak_bytes", "error"]])
+    if "error" in result:
+        return f"{result['benchmark']:>22} ({params}): {result['error']}"
+    return f"{result['benchmark']:>22} ({params}): min {result['min_sec'] * 1000:.3f} ms, median {result['median_sec'] * 1000:.3f} ms, peak {result['peak_bytes'] / 1024:.1f} KiB"
+
+
+def parse_sizes(value: str) -> list[int]:
+    """カンマ区切りの大きさの一覧を解析します。
+
+    Args:
+        value (str): カンマ区切りの整数
+
+    Returns:
+        list[int]: 大きさの一覧
+    """
+    return [int(size) for size in value.split(",") if size != ""]
+
+
+def main(args: list[str]) -> int:
+    """合成したデータでnnigen, SlhData, CatpvResultの処理時間とメモリ使用量を計測します。
+
+    Args:
+        args (list[str]): 引数
+
+    Returns:
+        int: Exit Code（--compareで退行が見つかった場合は1）
+    """
+    parser = ArgumentParser(prog="autoeb.bench", description="Micro-benchmarks of tree handling, SITELH data and catpv parsing on synthetic inputs")
+    parser.add_argument("--taxa", default="100,1000,10000,100000", type=parse_sizes, help="comma-separated numbers of taxa of synthetic trees (default=100,1000,10000,100000)", metavar="INTS")
+    parser.add_argument("--shapes", default=str.join(",", SHAPES), type=str, help="comma-separated shapes of synthetic trees: 'balanced' and 'caterpillar' (default=balanced,caterpillar)", metavar="SHAPES")
+    parser.add_argument("--nni-trees", default=3, type=int, help="number of NNI trees generated in each repeat. each tree copies the whole tree (default=3)", metavar="INT")
+    parser.add_argument("--sitelh-trees", default="3,21", type=parse_sizes, help="comma-separated numbers of trees of synthetic SITELH data (odd, default=3,21)", metavar="INTS")
+    parser.add_argument("--sites", default="1000,10000,100000", type=parse_sizes, help="comma-separated numbers of sites of synthetic SITELH data (default=1000,10000,100000)", metavar="INTS")
+    parser.add_argument("--catpv-results", default="1,100,10000", type=parse_sizes, help="comma-separated numbers of results in synthetic catpv outputs (default=1,100,10000)", metavar="INTS")
+    parser.add_argument("-r", "--repeats", default=3, type=int, help="number of timed repeats of each benchmark (default=3)", metavar="INT")
+    parser.add_argument("--json", default=None, type=str, help="destination of the result in JSON format", metavar="FILE")
+    parser.add_argument("--compare", default=None, type=str, help="JSON result of a previous run compared with this run", metavar="FILE")
+    parser.add_argument("--threshold", default=1.2, type=float, help="ratio of time or peak memory to the previous run regarded as a regression (default=1.2)", metavar="FLOAT")
+    namespace = parser.parse_args(args)
+
+    shapes: list[str] = [shape for shape in namespace.shapes.split(",") if shape != ""]
+    for shape in shapes:
+        if not shape in SHAPES:
+            parser.error(f"shape '{shape}' must be one of {', '.join(SHAPES)}")
+    if any(taxa < 4 for taxa in namespace.taxa):
+        parser.error("'--taxa' must be 4 or more")
+    if any(trees < 3 or trees % 2 == 0 for trees in namespace.sitelh_trees):
+        parser.error("'--sitelh-trees' must be odd numbers of 3 or more")
+    if namespace.repeats < 1 or namespace.nni_trees < 1:
+        parser.error("'--repeats' and '--nni-trees' must be 1 or more")
+
+    results: list[dict[str, Any]] = []
+
+    def record(measured: list[dict[str, Any]]) -> None:
+        for result in measured:
+            print(format_result(result), file=stdout, flush=True)
+        results.extend(measured)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for shape in shapes:
+            for taxa in namespace.taxa:
+                record(run_tree_benchmarks(shape, taxa, namespace.nni_trees, namespace.repeats, work_dir))
+        for trees in namespace.sitelh_trees:
+            for sites in namespace.sites:
+                record(run_sitelh_benchmarks(trees, sites, namespace.repeats, work_dir))
+        for count in namespace.catpv_results:
+            record(run_catpv_benchmarks(count, namespace.repeats, work_dir))
+
+    if namespace.json is not None:
+        with open(namespace.json, "wt") as io:
+            json.dump({
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeats": namespace.repeats,
+                "results": results,
+            }, io, indent=2)
+    if namespace.compare is not None:
+        with open(namespace.compare, "rt") as io:
+            baseline: list[dict[str, Any]] = json.load(io)["results"]
+        regressions: list[str] = compare(results, baseline, namespace.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=stdout)
+        print(f"{len(regressions)} regression(s) against '{namespace.compare}'", file=stdout)
+        return 0 if len(regressions) == 0 else 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main(argv[1:]))
@@ -0,0 +1,188 @@
+from argparse import ArgumentParser
+from datetime import datetime
+import json
+import os
+import platform
+import random
+import shlex
+import signal
+import subprocess
+from sys import argv, executable, stdout
+import tempfile
+from time import perf_counter
+from typing import Any, Tuple
+
+from ..configuration import Configuration
+from ..resource_limits import ResourceLimits
+from .micro import generate_balanced_newick
+from .stub_programs import DEFAULT_SETTINGS, write_stub_programs
+
+
+def write_dataset(directory: str, taxa: int, sites: int) -> Tuple[str, str]:
+    """合成したDNAのアライメントと平衡な系統樹を出力します。
+
+    Args:
+        directory (str): 出力先のディレクトリ
+        taxa (int): 配列数（4以上）
+        sites (int): 座位数
+
+    Returns:
+        Tuple[str, str]: アライメントと系統樹のパス
+    """
+    generator = random.Random(taxa * sites)
+    sequence_path: str = os.path.join(directory, "seq.fa")
+    with open(sequence_path, "wt") as sequence_io:
+        for index in range(taxa):
+            sequence_io.write(f">t{index}\n{str.join('', generator.choices('ACGT', k=sites))}\n")
+    tree_path: str = os.path.join(directory, "ml.tree")
+    with open(tree_path, "wt") as tree_io:
+        tree_io.write(generate_balanced_newick(taxa) + "\n")
+    return (sequence_path, tree_path)
+
+
+def run_autoeb(arguments: list[str], env: dict[str, str], log_path: str, timeout: float | None = None) -> Tuple[int, float]:
+    """AUTOEBを子プロセスとして実行し，経過時間を計測します。
+
+    Args:
+        arguments (list[str]): AUTOEBの引数
+        env (dict[str, str]): 環境変数
+        log_path (str): 標準出力と標準エラー出力の出力先
+        timeout (float | None, optional): SIGTERMで中断するまでの秒数. Defaults to None.
+
+    Returns:
+        Tuple[int, float]: Exit Codeと経過時間（秒）
+    """
+    with open(log_path, "at") as log_io:
+        print(f"$ autoeb {shlex.join(arguments)}", file=log_io, flush=True)
+        start: float = perf_counter()
+        process = subprocess.Popen([executable, "-m", "autoeb"] + arguments, env=env, stdout=log_io, stderr=subprocess.STDOUT)
+        try:
+            return_code: int = process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.send_signal(signal.SIGTERM)
+            return_code = process.wait()
+        return (return_code, perf_counter() - start)
+
+
+def make_result(scenario: str, threads: int, effective_threads: int, return_code: int, wall: float, bipartitions: int) -> dict[str, Any]:
+    """1回の実行の計測結果を生成します。
+
+    Args:
+        scenario (str): 実行の種類
+        threads (int): 指定したスレッド数
+        effective_threads (int): CPUの上限を考慮したスレッド数
+        return_code (int): Exit Code
+        wall (float): 経過時間（秒）
+        bipartitions (int): 2分割の数
+
+    Returns:
+        dict[str, Any]: 計測結果
+    """
+    return {
+        "scenario": scenario,
+        "threads": threads,
+        "effective_threads": effective_threads,
+        "exit_code": return_code,
+        "wall_sec": wall,
+        "bipartitions": bipartitions,
+        "bipartitions_per_sec": bipartitions / wall if wall > 0 else 0.0,
+    }
+
+
+def main(args: list[str]) -> int:
+    """スタブのIQ-TREEとCONSELを使用して，AUTOEBの処理全体のスループット，スレッド数に対する性能と再開の時間を計測します。
+
+    Args:
+        args (list[str]): 引数
+
+    Returns:
+        int: Exit Code（AUTOEBの実行が失敗した場合は1）
+    """
+    parser = ArgumentParser(prog="autoeb.bench.pipeline", description="End-to-end benchmark of AUTOEB with stub IQ-TREE and CONSEL programs")
+    parser.add_argument("--taxa", default=50, type=int, help="number of sequences of the synthetic dataset (>=4, default=50)", metavar="INT")
+    parser.add_argument("--sites", default=1000, type=int, help="number of sites of the synthetic dataset (default=1000)", metavar="INT")
+    parser.add_argument("-b", "--bootstrap", default=1000, type=int, help="replicates of RELL bootstrap, which determines the size of RMT files (default=1000)", metavar="INT")
+    parser.add_argument("-T", "--threads", default="1,2,4", type=str, help="comma-separated numbers of threads measured (default=1,2,4)", metavar="INTS")
+    parser.add_argument("--resume", action="store_true", help="also measure a rerun of a finished run and a run resumed after interruption with SIGTERM")
+    parser.add_argument("--interrupt-at", default=0.5, type=float, help="ratio of the time of the full run after which the run is interrupted with '--resume' (default=0.5)", metavar="FLOAT")
+    parser.add_argument("--mode", default=DEFAULT_SETTINGS["mode"], choices=["sleep", "spin"], help="how the stubs spend the delays: 'sleep' or 'spin' (use CPU) (default=sleep)")
+    for name in ["model_delay", "iqtree_delay", "makermt_delay", "consel_delay", "catpv_delay"]:
+        unit: str = "per tree" if name == "iqtree_delay" else "per execution"
+        parser.add_argument(f"--{name.replace('_', '-')}", default=DEFAULT_SETTINGS[name], type=float, help=f"seconds spent by the stub {unit} (default={DEFAULT_SETTINGS[name]})", metavar="SEC")
+    parser.add_argument("--reject-ratio", default=DEFAULT_SETTINGS["reject_ratio"], type=float, help=f"probability that the stub catpv rejects an NNI tree (default={DEFAULT_SETTINGS['reject_ratio']})", metavar="FLOAT")
+    parser.add_argument("--autoeb-args", default="", type=str, help="additional arguments of AUTOEB, e.g. '--chunk-size 10'", metavar="ARGS")
+    parser.add_argument("--work-dir", default=None, type=str, help="directory in which the stubs, the dataset and the outputs are kept (default=temporary directory)", metavar="DIR")
+    parser.add_argument("--json", default=None, type=str, help="destination of the result in JSON format", metavar="FILE")
+    namespace = parser.parse_args(args)
+
+    if namespace.taxa < 4:
+        parser.error("'--taxa' must be 4 or more")
+    thread_counts: list[int] = [int(value) for value in namespace.threads.split(",") if value != ""]
+    if len(thread_counts) == 0 or any(threads < 1 for threads in thread_counts):
+        parser.error("'--threads' must be numbers of 1 or more")
+    cpus: int = ResourceLimits.detect().cpus
+    if max(thread_counts) > cpus:
+        print(f"Warning: AUTOEB uses at most {cpus} threads (CPUs available to the process)", file=stdout)
+
+    settings: dict[str, Any] = {name: getattr(namespace, name) for name in DEFAULT_SETTINGS.keys()}
+    bipartitions: int = namespace.taxa - 3
+    results: list[dict[str, Any]] = []
+    failed: bool = False
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        work_dir: str = namespace.work_dir or temporary_dir
+        stub_dir: str = os.path.join(work_dir, "stubs")
+        os.makedirs(stub_dir, exist_ok=True)
+        env: dict[str, str] = dict(os.environ)
+        env[Configuration.ENV_CONFIG_PATH] = write_stub_programs(stub_dir, settings)
+        env["PYTHONPATH"] = os.pathsep.join([os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else []))
+        sequence_path, tree_path = write_dataset(work_dir, namespace.taxa, namespace.sites)
+        log_path: str = os.path.join(work_dir, "autoeb.log")
+
+        def run(scenario: str, threads: int, out_dir: str, extra: list[str], timeout: float | None = None) -> dict[str, Any]:
+            arguments: list[str] = ["-s", sequence_path, "-t", tree_path, "-o", out_dir, "-m", "GTR+F+I+G4", "-b", str(namespace.bootstrap), "-T", str(threads)]
+            return_code, wall = run_autoeb(arguments + extra + shlex.split(namespace.autoeb_args), env, log_path, timeout)
+            result: dict[str, Any] = make_result(scenario, threads, min(threads, cpus), return_code, wall, bipartitions)
+            print(f"{scenario:>11} -T {threads}: {wall:.2f} s, {result['bipartitions_per_sec']:.2f} bipartitions/s (exit code {return_code})", file=stdout, flush=True)
+            results.append(result)
+            return result
+
+        for threads in thread_counts:
+            full: dict[str, Any] = run("full", threads, os.path.join(work_dir, f"out-T{threads}"), ["--redo"])
+            failed = failed or full["exit_code"] != 0
+        baseline: dict[str, Any] = results[0]
+        for result in results:
+            result["speedup"] = baseline["wall_sec"] / result["wall_sec"] if result["wall_sec"] > 0 else 0.0
+
+        if namespace.resume and not failed:
+            threads = thread_counts[-1]
+            last: dict[str, Any] = results[-1]
+            # all bipartitions are restored from the checkpoint journal
+            rerun: dict[str, Any] = run("rerun", threads, os.path.join(work_dir, f"out-T{threads}"), [])
+            out_dir: str = os.path.join(work_dir, "out-resume")
+            run("interrupted", threads, out_dir, ["--redo"], last["wall_sec"] * namespace.interrupt_at)
+            resumed: dict[str, Any] = run("resumed", threads, out_dir, [])
+            failed = rerun["exit_code"] != 0 or resumed["exit_code"] != 0
+        if namespace.work_dir is not None:
+            print(f"Outputs and the log of AUTOEB are kept in '{work_dir}'", file=stdout)
+        elif failed:
+            with open(log_path, "rt") as log_io:
+                print(log_io.read(), file=stdout)
+
+    if namespace.json is not None:
+        with open(namespace.json, "wt") as io:
+            json.dump({
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": cpus,
+                "taxa": namespace.taxa,
+                "sites": namespace.sites,
+                "bootstrap": namespace.bootstrap,
+                "stub": settings,
+                "results": results,
+            }, io, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main(argv[1:]))
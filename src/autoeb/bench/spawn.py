@@ -0,0 +1,85 @@
+from argparse import ArgumentParser
+import json
+import shlex
+import statistics
+import subprocess
+from sys import argv, stdout
+from time import perf_counter
+from typing import Any
+
+from ..job_executor import JobExecutor
+
+
+def measure(command: list[str], jobs: int, threads: int, shell: bool) -> dict[str, Any]:
+    """子プロセスの起動から終了までの時間を計測します。
+
+    Args:
+        command (list[str]): 実行するコマンド
+        jobs (int): 実行回数
+        threads (int): 同時実行数
+        shell (bool): シェルを介して実行するかどうか
+
+    Returns:
+        dict[str, Any]: 計測結果
+    """
+    def run_once() -> float:
+        start: float = perf_counter()
+        if shell:
+            subprocess.run(shlex.join(command), shell=True, check=True)
+        else:
+            subprocess.run(command, check=True)
+        return perf_counter() - start
+
+    wall_start: float = perf_counter()
+    with JobExecutor[int, float](threads) as executor:
+        for index in range(jobs):
+            executor.submit(index, run_once)
+        latencies: list[float] = sorted(executor.wait().values())
+    wall: float = perf_counter() - wall_start
+
+    def percentile(ratio: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))]
+
+    return {
+        "shell": shell,
+        "jobs": jobs,
+        "threads": threads,
+        "wall_sec": wall,
+        "jobs_per_sec": jobs / wall,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "median_ms": percentile(0.5) * 1000,
+        "p95_ms": percentile(0.95) * 1000,
+        "p99_ms": percentile(0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def main(args: list[str]) -> int:
+    """シェル経由とシェルを介さない場合の子プロセス起動レイテンシを比較します。
+
+    Args:
+        args (list[str]): 引数
+
+    Returns:
+        int: Exit Code
+    """
+    parser = ArgumentParser(prog="autoeb.bench.spawn", description="Measure spawn latency of child processes with and without shell")
+    parser.add_argument("-n", "--jobs", default=10000, type=int, help="number of jobs (default=10000)", metavar="INT")
+    parser.add_argument("-T", "--thread", default=1, type=int, help="number of concurrent jobs (default=1)", metavar="INT")
+    parser.add_argument("--command", default="true", type=str, help="command to execute (default='true')", metavar="CMD")
+    parser.add_argument("--json", default=None, type=str, help="destination of the result in JSON format", metavar="FILE")
+    namespace = parser.parse_args(args)
+
+    command: list[str] = shlex.split(namespace.command)
+    results: list[dict[str, Any]] = [measure(command, namespace.jobs, namespace.thread, shell) for shell in [True, False]]
+    for result in results:
+        label: str = "shell=True " if result["shell"] else "shell=False"
+        print(f"{label}: {result['jobs_per_sec']:.1f} jobs/s, mean {result['mean_ms']:.3f} ms, median {result['median_ms']:.3f} ms, p95 {result['p95_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms", file=stdout)
+    if namespace.json is not None:
+        with open(namespace.json, "wt") as io:
+            json.dump(results, io, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main(argv[1:]))
@@ -0,0 +1,252 @@
+import json
+import os
+import random
+import sys
+import time
+from typing import Any
+import zlib
+
+TOOLS: list[str] = ["iqtree", "makermt", "consel", "catpv"]
+DEFAULT_SETTINGS: dict[str, Any] = {
+    "mode": "sleep",
+    "model_delay": 0.5,
+    "iqtree_delay": 0.01,
+    "makermt_delay": 0.05,
+    "consel_delay": 0.05,
+    "catpv_delay": 0.0,
+    "reject_ratio": 0.5,
+}
+"""スタブの設定の既定値。遅延は秒で，iqtree_delayはツリー1つあたり，それ以外は1回の実行あたりの時間
+"""
+
+SCALES: int = 10
+
+
+def write_stub_programs(directory: str, settings: dict[str, Any]) -> str:
+    """IQ-TREEとCONSELの代わりに実行されるスタブの実行ファイルと設定を出力します。
+
+    Args:
+        directory (str): 出力先のディレクトリ
+        settings (dict[str, Any]): スタブの設定（DEFAULT_SETTINGSの一部を上書き）
+
+    Returns:
+        str: 出力したコンフィグファイル（Configurationの形式）のパス
+    """
+    settings_path: str = os.path.join(directory, "stub.json")
+    with open(settings_path, "wt") as settings_io:
+        json.dump({**DEFAULT_SETTINGS, **settings}, settings_io, indent=2)
+    for tool in TOOLS:
+        path: str = os.path.join(directory, tool)
+        with open(path, "wt") as script_io:
+            # this module is loaded without the autoeb package, whose import dominates the startup time of the stubs
+            script_io.write(f"#!{sys.executable}\n")
+            script_io.write("import importlib.util\n")
+            script_io.write("import sys\n")
+            script_io.write(f"spec = importlib.util.spec_from_file_location('stub_programs', {os.path.abspath(__file__)!r})\n")
+            script_io.write("module = importlib.util.module_from_spec(spec)\n")
+            script_io.write("spec.loader.exec_module(module)\n")
+            script_io.write(f"sys.exit(module.main({tool!r}, {settings_path!r}, sys.argv[1:]))\n")
+        os.chmod(path, 0o755)
+    config_path: str = os.path.join(directory, "config.json")
+    with open(config_path, "wt") as config_io:
+        json.dump({"iqtree_command": os.path.join(directory, "iqtree"), "consel_dir": directory}, config_io, indent=4)
+    return config_path
+
+
+def delay(settings: dict[str, Any], seconds: float) -> None:
+    """設定に従い，待機またはCPUを使用して時間を消費します。
+
+    Args:
+        settings (dict[str, Any]): スタブの設定
+        seconds (float): 消費する時間
+    """
+    if seconds <= 0:
+        return
+    if settings["mode"] == "spin":
+        end: float = time.process_time() + seconds
+        while time.process_time() < end:
+            pass
+    else:
+        time.sleep(seconds)
+
+
+def get_option(args: list[str], name: str) -> str | None:
+    """引数の一覧からオプションの値を取得します。
+
+    Args:
+        args (list[str]): 引数の一覧
+        name (str): オプション名
+
+    Returns:
+        str | None: オプションの値。指定されていない場合はNone
+    """
+    return args[args.index(name) + 1] if name in args and args.index(name) + 1 < len(args) else None
+
+
+def count_sites(sequence_path: str) -> int:
+    """アライメント（FASTAまたはPHYLIP）の座位数を取得します。
+
+    Args:
+        sequence_path (str): アライメントのパス
+
+    Returns:
+        int: 座位数
+    """
+    with open(sequence_path, "rt") as sequence_io:
+        first: str = sequence_io.readline().strip()
+        if not first.startswith(">"):
+            return int(first.split()[1])
+        sites: int = 0
+        for line in sequence_io:
+            if line.startswith(">"):
+                break
+            sites += len(line.strip())
+        return sites
+
+
+def run_iqtree(settings: dict[str, Any], args: list[str]) -> int:
+    """IQ-TREEと同じ名前の結果ファイルを出力します。-zを指定した場合はツリーごとの座位の対数尤度を，それ以外はモデルの推定結果を出力します。
+
+    Args:
+        settings (dict[str, Any]): スタブの設定
+        args (list[str]): IQ-TREEの引数
+
+    Returns:
+        int: Exit Code
+    """
+    sequence_path: str | None = get_option(args, "-s")
+    if sequence_path is None:
+        print("ERROR: -s is not specified", file=sys.stderr)
+        return 2
+    prefix: str = get_option(args, "--prefix") or sequence_path
+    model: str = get_option(args, "-m") or "GTR+F+I+G4"
+    treeset_path: str | None = get_option(args, "-z")
+    if treeset_path is None:
+        delay(settings, settings["model_delay"])
+        lines: list[str] = [f"Model of substitution: {model}", "", "Rate parameter R:", ""]
+        lines += [f"  {pair}: {rate}" for pair, rate in [("A-C", 1.5), ("A-G", 3.0), ("A-T", 0.5), ("C-G", 1.2), ("C-T", 4.0), ("G-T", 1.0)]]
+        lines += ["", "State frequencies: (empirical counts from alignment)", ""]
+        lines += [f"  pi({state}) = {frequency}" for state, frequency in [("A", 0.3), ("C", 0.2), ("G", 0.2), ("T", 0.3)]]
+        lines += ["", "Model of rate heterogeneity: Invar+Gamma with 4 categories", "Proportion of invariable sites: 0.1234", "Gamma shape alpha: 0.5678"]
+        with open(prefix + ".iqtree", "wt") as report_io:
+            report_io.write(str.join("\n", lines) + "\n")
+        tree_path: str | None = get_option(args, "-te")
+        if tree_path is not None:
+            with open(tree_path, "rt") as source, open(prefix + ".treefile", "wt") as destination:
+                destination.write(source.read())
+        return 0
+
+    with open(treeset_path, "rt") as treeset_io:
+        trees: int = sum(1 for line in treeset_io if line.strip() != "")
+    sites: int = count_sites(sequence_path)
+    delay(settings, settings["iqtree_delay"] * trees)
+    # the values are determined by the treeset, so a rerun outputs the same likelihoods
+    generator = random.Random(zlib.crc32(f"{os.path.basename(prefix)}:{trees}:{sites}".encode()))
+    base: list[float] = [-generator.uniform(1.0, 20.0) for _ in range(sites)]
+    with open(prefix + ".sitelh", "wt") as sitelh_io:
+        sitelh_io.write(f"{trees} {sites}\n")
+        for index in range(trees):
+            sitelh_io.write(f"Tree{index + 1}\t" + str.join(" ", [f"{value - generator.uniform(0.0, 0.01):.6f}" for value in base]) + "\n")
+    return 0
+
+
+def run_makermt(settings: dict[str, Any], args: list[str]) -> int:
+    """RELL bootstrapの複製数に応じた大きさのRMTファイルを出力します。
+
+    Args:
+        settings (dict[str, Any]): スタブの設定
+        args (list[str]): makermtの引数
+
+    Returns:
+        int: Exit Code
+    """
+    sitelh_path: str | None = get_option(args, "--puzzle")
+    if sitelh_path is None:
+        print("ERROR: --puzzle is not specified", file=sys.stderr)
+        return 2
+    with open(sitelh_path, "rt") as sitelh_io:
+        trees: int = int(sitelh_io.readline().split()[0])
+    replicates: int = round(float(get_option(args, "-b") or "1") * 10000)
+    delay(settings, settings["makermt_delay"])
+    # makermt writes the replicated log-likelihoods of each tree at 10 scales in double precision
+    with open(os.path.splitext(sitelh_path)[0] + ".rmt", "wb") as rmt_io:
+        rmt_io.write(bytes(8 * trees * replicates * SCALES))
+    print(f"# makermt: {trees} trees, {replicates} replicates x {SCALES} scales")
+    return 0
+
+
+def run_consel(settings: dict[str, Any], args: list[str]) -> int:
+    """RMTファイルからPVファイルとVTファイルを出力します。
+
+    Args:
+        settings (dict[str, Any]): スタブの設定
+        args (list[str]): conselの引数
+
+    Returns:
+        int: Exit Code
+    """
+    name: str = args[0]
+    if not os.path.isfile(name + ".rmt"):
+        print(f"ERROR: {name}.rmt is not found", file=sys.stderr)
+        return 1
+    delay(settings, settings["consel_delay"])
+    with open(name + ".pv", "wb") as pv_io:
+        pv_io.write(bytes(8 * 3 * 11))
+    with open(name + ".vt", "wb") as vt_io:
+        vt_io.write(bytes(8 * 3 * SCALES))
+    print(f"# consel: {name}")
+    return 0
+
+
+def run_catpv(settings: dict[str, Any], args: list[str]) -> int:
+    """catpvと同じ形式で検定結果を出力します。NNI樹形はreject_ratioの確率で棄却されるp値を持ちます。
+
+    Args:
+        settings (dict[str, Any]): スタブの設定
+        args (list[str]): catpvの引数
+
+    Returns:
+        int: Exit Code
+    """
+    name: str = args[-1]
+    if not os.path.isfile(name + ".pv"):
+        print(f"ERROR: {name}.pv is not found", file=sys.stderr)
+        return 1
+    delay(settings, settings["catpv_delay"])
+    generator = random.Random(zlib.crc32(os.path.basename(name).encode()))
+    rows: list[list[float]] = [[1, -1.0, generator.uniform(0.9, 1.0)]]
+    for nni_item in [2, 3]:
+        rejected: bool = generator.random() < settings["reject_ratio"]
+        rows.append([nni_item, generator.uniform(0.5, 20.0), generator.uniform(0.0, 0.049) if rejected else generator.uniform(0.05, 0.5)])
+    print()
+    print(f"# reading {name}.pv")
+    print("# rank item    obs     au     np |     bp     pp     kh     sh    wkh    wsh |")
+    for rank, (item, obs, au) in enumerate(sorted(rows, key=lambda x: x[1]), 1):
+        print(f"# {rank:4d} {int(item):4d} {obs:6.1f}  {au:.3f}  {au:.3f} |  {au:.3f}  {au:.3f}  {au:.3f}  {au:.3f}  {au:.3f}  {au:.3f} |")
+        if "-s" in args:
+            # standard errors follow in the next line with 'catpv -s'
+            se: str = f"({min(au, 1 - au) * 0.1:.3f})"
+            print(f"#                 {se} {se} | {se} {se} {se} {se} {se} {se} |")
+    return 0
+
+
+def main(tool: str, settings_path: str, args: list[str]) -> int:
+    """スタブを実行します。
+
+    Args:
+        tool (str): 実行するプログラム名（iqtree, makermt, consel, catpv）
+        settings_path (str): スタブの設定ファイルのパス
+        args (list[str]): プログラムの引数
+
+    Returns:
+        int: Exit Code
+    """
+    with open(settings_path, "rt") as settings_io:
+        settings: dict[str, Any] = json.load(settings_io)
+    if tool == "iqtree":
+        return run_iqtree(settings, args)
+    if tool == "makermt":
+        return run_makermt(settings, args)
+    if tool == "consel":
+        return run_consel(settings, args)
+    return run_catpv(settings, args)
@@ -0,0 +1,146 @@
+from contextlib import nullcontext
+from io import TextIOWrapper
+import math
+import os
+from typing import TextIO, Tuple
+
+from .adaptive_bootstrap import AdaptiveBootstrap
+from .catpv_result import CatpvResult
+from .checkpoint_journal import CheckpointJournal
+from .consel_manager import ConselManager
+from .slh_data import SlhData
+from .stage_profiler import StageProfiler
+
+
+class BipartitionTester:
+    """最尤樹形と2つのNNI樹形のAU検定（RELL bootstrap，AU検定，結果の集計）を作業ディレクトリで行います。
+    """
+
+    def __init__(self, consel_manager: ConselManager, work_dir: str, rell_boot: int, bootstrap: AdaptiveBootstrap | None, logger: TextIO, profiler: StageProfiler | None = None) -> None:
+        """BipartitionTesterの新しいインスタンスを初期化します。
+
+        Args:
+            consel_manager (ConselManager): CONSELを実行するクライアント
+            work_dir (str): 中間ファイルを置く作業ディレクトリ
+            rell_boot (int): RELL bootstrapの複製数（適応的に増やす場合は上限）
+            bootstrap (AdaptiveBootstrap | None): 複製数を段階的に増やす手順。Noneで常にrell_bootを用いる
+            logger (TextIO): 進捗の出力先
+            profiler (StageProfiler | None, optional): サイト尤度の出力とCATPVファイルの読み込みを計測するStageProfiler. Defaults to None.
+        """
+        self.__consel_manager: ConselManager = consel_manager
+        self.__work_dir: str = work_dir
+        self.__replicates_list: list[int] = [rell_boot] if bootstrap is None else bootstrap.replicates
+        self.__bootstrap: AdaptiveBootstrap | None = bootstrap
+        self.__logger: TextIO = logger
+        self.__profiler: StageProfiler | None = profiler
+
+    @property
+    def work_dir(self) -> str:
+        """作業ディレクトリを取得します。
+        """
+        return self.__work_dir
+
+    def get_file_path(self, filename: str) -> str:
+        """作業ディレクトリ上のファイルのパスを取得します。
+
+        Args:
+            filename (str): ファイル名
+
+        Returns:
+            str: ファイルのパス
+        """
+        return os.path.join(self.__work_dir, filename)
+
+    @staticmethod
+    def get_delta_lnl(sitelh: SlhData, tree_index: int) -> Tuple[float, float]:
+        """サイト尤度からNNI樹形と最尤樹形の対数尤度の差を計算します。
+
+        Args:
+            sitelh (SlhData): 最尤樹形とNNI樹形の尤度一覧
+            tree_index (int): 1つ目のNNI樹形のインデックス
+
+        Returns:
+            Tuple[float, float]: NNI樹形の対数尤度から最尤樹形の対数尤度を引いた値
+        """
+        ml_total: float = math.fsum(sitelh[0])
+        return (math.fsum(sitelh[tree_index]) - ml_total, math.fsum(sitelh[tree_index + 1]) - ml_total)
+
+    def test(self, slh_set: SlhData, branch_index: int, branch_count: int, seed: int, journal: CheckpointJournal | None = None, fingerprint: str = "") -> Tuple[CatpvResult, int]:
+        """AU検定を行います。失敗した場合は，次の試行がmakermtから始まるように途中の出力を削除します。
+
+        Args:
+            slh_set (SlhData): AU検定にかけるツリーの尤度一覧
+            branch_index (int): 枝番号
+            branch_count (int): 枝数
+            seed (int): シード値
+            journal (CheckpointJournal | None, optional): CONSELの各段階を記録するジャーナル. Defaults to None.
+            fingerprint (str, optional): 検定の入力のフィンガープリント. Defaults to "".
+
+        Raises:
+            CalledProcessError: CONSELのプログラムが0以外の終了コードを返した
+            IndexError: CATPVファイルに結果が含まれていない
+
+        Returns:
+            Tuple[CatpvResult, int]: CATPVファイルの情報と用いた複製数
+        """
+        consel_log: TextIOWrapper
+        try:
+            # export
+            catpv_path: str = self.get_file_path(f"{branch_index}.catpv")
+            with nullcontext() if self.__profiler is None else self.__profiler.profile("sitelh"):
+                slh_set.export(self.get_file_path(f"{branch_index}.sitelh"))
+
+            # replicates are increased only while the p-values are close to the significance level
+            for replicates in self.__replicates_list:
+                # execute CONSEL (steps recorded in the journal are resumed if their outputs exist)
+                if not self.__is_recorded(journal, CheckpointJournal.STAGE_CONSEL, branch_index, fingerprint, replicates, "pv"):
+                    if not self.__is_recorded(journal, CheckpointJournal.STAGE_MAKERMT, branch_index, fingerprint, replicates, "rmt"):
+                        # 1. makermt
+                        with open(self.get_file_path(f"{branch_index}-makermt.log"), "wt") as consel_log:
+                            self.__consel_manager.makermt(f"{branch_index}.sitelh", seed, replicates, cwd=self.__work_dir, stdout=consel_log)
+                        if journal is not None:
+                            journal.record(CheckpointJournal.STAGE_MAKERMT, branch_index, fingerprint, str(replicates))
+                    # 2. consel
+                    with open(self.get_file_path(f"{branch_index}-consel.log"), "wt") as consel_log:
+                        self.__consel_manager.consel(str(branch_index), cwd=self.__work_dir, stdout=consel_log)
+                    if journal is not None:
+                        journal.record(CheckpointJournal.STAGE_CONSEL, branch_index, fingerprint, str(replicates))
+                # 3. catpv
+                with open(catpv_path, "wt") as consel_log:
+                    # standard errors of the p-values decide whether the replicates are increased
+                    self.__consel_manager.catpv(str(branch_index), cwd=self.__work_dir, stdout=consel_log, standard_error=self.__bootstrap is not None)
+                with nullcontext() if self.__profiler is None else self.__profiler.profile("catpv"):
+                    result: CatpvResult = CatpvResult.load(catpv_path)[0]
+                if self.__bootstrap is None or self.__bootstrap.is_decided(result):
+                    break
+                if replicates != self.__replicates_list[-1]:
+                    print(f"  Operation No. {branch_index} / {branch_count - 1} is not decided with {replicates} replicates (retested with more replicates)", file=self.__logger)
+            return (result, replicates)
+        except Exception:
+            # remove partial outputs so that a retry starts from makermt
+            if journal is not None:
+                journal.discard(CheckpointJournal.STAGE_MAKERMT, branch_index)
+                journal.discard(CheckpointJournal.STAGE_CONSEL, branch_index)
+            for ext in ["rmt", "pv", "vt", "catpv"]:
+                partial_path: str = self.get_file_path(f"{branch_index}.{ext}")
+                if os.path.isfile(partial_path):
+                    os.remove(partial_path)
+            raise
+
+    def __is_recorded(self, journal: CheckpointJournal | None, stage: str, branch_index: int, fingerprint: str, replicates: int, ext: str) -> bool:
+        """CONSELの処理がジャーナルに記録され，その出力が存在するかどうかを判定します。
+
+        Args:
+            journal (CheckpointJournal | None): CONSELの各段階を記録するジャーナル
+            stage (str): 処理の種類
+            branch_index (int): 枝番号
+            fingerprint (str): 検定の入力のフィンガープリント
+            replicates (int): 複製数
+            ext (str): 処理の出力ファイルの拡張子
+
+        Returns:
+            bool: 同じ入力と複製数で記録され，出力が存在する場合はTrue，それ以外でFalse
+        """
+        if journal is None or journal.get(stage, branch_index, fingerprint) != str(replicates):
+            return False
+        return os.path.isfile(self.get_file_path(f"{branch_index}.{ext}"))
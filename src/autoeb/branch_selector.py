@@ -0,0 +1,81 @@
+from argparse import ArgumentError
+
+from .nnigen import TopologyIndex, Tree
+from .value_range import ValueRange
+
+
+class BranchSelector:
+    """範囲と，既存の支持値・枝長・クレードの条件から解析する二分岐を選択します。
+    選択の有無は枝ごとに1度だけ計算され，各段階は選択された二分岐のみを処理します。
+    """
+
+    def __init__(self, bipartition_range: ValueRange, support_below: float | None = None, length_below: float | None = None, clade: list[str] | None = None) -> None:
+        """BranchSelectorの新しいインスタンスを初期化します。条件は全て満たす二分岐が選択されます。
+
+        Args:
+            bipartition_range (ValueRange): 解析する二分岐のインデックスの範囲
+            support_below (float | None, optional): 支持値がこの値未満の二分岐を選択。Noneで支持値によらない. Defaults to None.
+            length_below (float | None, optional): 枝長がこの値未満の二分岐を選択。Noneで枝長によらない. Defaults to None.
+            clade (list[str] | None, optional): 二分岐の一方の側がこれらの葉に含まれる（クレードの内側にある）二分岐を選択。Noneでクレードによらない. Defaults to None.
+        """
+        self.__range: ValueRange = bipartition_range
+        self.__support_below: float | None = support_below
+        self.__length_below: float | None = length_below
+        self.__clade: list[str] | None = clade
+
+    @staticmethod
+    def parse_support(label: str) -> float | None:
+        """枝のラベルから支持値を取得します。"SH-aLRT/UFBoot"のように複数の値を持つ場合は最初の値を使用します。
+
+        Args:
+            label (str): 枝のラベル
+
+        Returns:
+            float | None: 支持値。数値でない場合はNone
+        """
+        try:
+            return float(label.split("/")[0])
+        except ValueError:
+            return None
+
+    def select(self, tree: Tree, topology: TopologyIndex) -> list[bool]:
+        """二分岐ごとに解析するかどうかを計算します。支持値や枝長を持たない二分岐は，それぞれの条件で選択されません。
+
+        Args:
+            tree (Tree): 最尤樹形
+            topology (TopologyIndex): 最尤樹形の索引
+
+        Raises:
+            ArgumentError: クレードの葉が最尤樹形に存在しない
+
+        Returns:
+            list[bool]: Tree.iterate_all_branches()の順に，二分岐を解析するかどうか
+        """
+        splits: list[int] = topology.branch_splits
+        result: list[bool] = self.__range.to_mask(len(splits))
+
+        clade_bits: int | None = None
+        if self.__clade is not None:
+            leaf_bits: dict[str, int] = dict[str, int]([(name, 1 << i) for i, name in enumerate(topology.leaf_names)])
+            clade_bits = 0
+            for name in self.__clade:
+                if not name in leaf_bits:
+                    raise ArgumentError(None, f"Taxon '{name}' of '--clade' option is not found in the tree")
+                clade_bits |= leaf_bits[name]
+        all_bits: int = (1 << len(topology.leaf_names)) - 1
+
+        if self.__support_below is None and self.__length_below is None and clade_bits is None:
+            return result
+        for index, branch in enumerate(tree.iterate_all_branches()):
+            if not result[index]:
+                continue
+            if self.__support_below is not None:
+                support: float | None = self.parse_support(branch.name)
+                result[index] = support is not None and support < self.__support_below
+            if self.__length_below is not None and result[index]:
+                result[index] = branch.length is not None and branch.length < self.__length_below
+            if clade_bits is not None and result[index]:
+                # the tree is unrooted, so either side of the split may lie inside the clade
+                split: int = splits[index]
+                result[index] = split & ~clade_bits == 0 or (split ^ all_bits) & ~clade_bits == 0
+        return result
@@ -1,13 +1,14 @@
 from io import TextIOWrapper
 import regex
 from regex import Pattern
-from typing import overload
+from typing import Iterable, overload
 
 from .statistics_entry import StatisticsEntry
 
 
 class CatpvResult:
     __split_regex: Pattern = regex.compile(r"\s+")
+    __token_regex: Pattern = regex.compile(r"\(\s*([^()\s]*)\s*\)|[^\s()]+")
 
     """catpvの結果を表します。
     """
@@ -34,6 +35,42 @@ class CatpvResult:
         """
         self.__stat: list[StatisticsEntry] = list[StatisticsEntry]()
 
+    @classmethod
+    def create(cls, entries: Iterable[StatisticsEntry]) -> "CatpvResult":
+        """樹形比較の結果一覧からインスタンスを生成します。
+
+        Args:
+            entries (Iterable[StatisticsEntry]): 最尤樹形と2つのNNI樹形の結果一覧
+
+        Returns:
+            CatpvResult: 生成されたCatpvResultのインスタンス
+        """
+        result = cls()
+        result.__stat = sorted(entries, key=lambda x: x.index)
+        return result
+
+    @classmethod
+    def from_rows(cls, rows: list[list[float]]) -> "CatpvResult":
+        """to_rows()で出力した値の一覧からインスタンスを生成します。
+
+        Args:
+            rows (list[list[float]]): 最尤樹形と2つのNNI樹形の統計量の一覧
+
+        Returns:
+            CatpvResult: 生成されたCatpvResultのインスタンス
+        """
+        return cls.create([StatisticsEntry(int(row[0]), int(row[1]), *row[2:]) for row in rows])
+
+    def to_rows(self) -> list[list[float]]:
+        """最尤樹形と2つのNNI樹形の統計量を，JSONなどに保存できる値の一覧として取得します。
+
+        Returns:
+            list[list[float]]: ツリーごとのrank, index, obs, au, np, bp, pp, kh, sh, wkh, wsh, auの標準誤差
+        """
+        return [
+            [stat.rank, stat.index, stat.obs, stat.au, stat.np, stat.brell, stat.pp, stat.kh, stat.sh, stat.wkh, stat.wsh, stat.au_se]
+            for stat in self.__stat]
+
     @classmethod
     @overload
     def load(cls, source: str) -> "list[CatpvResult]":
@@ -61,6 +98,7 @@ class CatpvResult:
         result = list[CatpvResult]()
         current: CatpvResult | None = None
         labels = list[str]()
+        rows = list[dict[str, str]]()
         while True:
             line: str = source.readline()
             if line == "":
@@ -70,23 +108,37 @@ class CatpvResult:
                 if current is not None:
                     current = None
                     labels.clear()
+                    rows.clear()
                 continue
             line = line[2:].strip()
             if line.startswith("reading "):
                 current = cls()
                 result.append(current)
+                labels.clear()
+                rows.clear()
                 continue
             if current is not None:
-                if len(current.__stat) == 0 and len(labels) == 0:
+                if len(rows) == 0 and len(labels) == 0:
                     labels = cls.__split_regex.split(line)
+                    continue
+                # standard errors printed by 'catpv -s' are enclosed in parentheses after the values or in the next line
+                tokens: list[regex.Match] = [t for t in cls.__token_regex.finditer(line) if t.group(0) != "|"]
+                values: list[str] = [t.group(0) for t in tokens if t.group(1) is None]
+                errors: list[str] = [t.group(1) for t in tokens if t.group(1) is not None]
+                if len(values) == 0:
+                    if len(rows) > 0 and len(errors) > 0:
+                        rows[-1]["au_se"] = errors[0]
                 else:
-                    elements: list[str] = cls.__split_regex.split(line)
+                    value_labels: list[str] = [label for label in labels if label != "|"]
                     stat_values = dict[str, str]()
-                    for index in range(len(labels)):
-                        if labels[index] == '|':
-                            continue
-                        stat_values[labels[index]] = elements[index]
-                    current.__stat.append(StatisticsEntry.from_table_dict(stat_values))
-                    current.__stat.sort(key=lambda x: x.index)
+                    count: int = 0
+                    for token in tokens:
+                        if token.group(1) is None:
+                            stat_values[value_labels[count]] = token.group(0)
+                            count += 1
+                        elif count > 0 and value_labels[count - 1] == "au":
+                            stat_values["au_se"] = token.group(1)
+                    rows.append(stat_values)
+                current.__stat = sorted([StatisticsEntry.from_table_dict(row) for row in rows], key=lambda x: x.index)
 
         return result
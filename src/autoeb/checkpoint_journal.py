@@ -0,0 +1,141 @@
+import json
+import sqlite3
+from threading import Lock
+from types import TracebackType
+from typing import Tuple
+
+from .catpv_result import CatpvResult
+from .sqlite_batch import SqliteBatch
+
+
+class CheckpointJournal:
+    """完了した処理を記録するSQLiteデータベースのジャーナルを表します。
+    記録はまとめてコミットされ，入力から計算されるフィンガープリントが一致する場合にのみ再利用されます。
+    コミットされる前に強制終了された記録は失われ，その処理は再実行されます。
+    """
+
+    STAGE_SEED: str = "seed"
+    STAGE_MODEL: str = "model"
+    STAGE_MAKERMT: str = "makermt"
+    STAGE_CONSEL: str = "consel"
+    STAGE_RESULT: str = "result"
+
+    def __init__(self, path: str) -> None:
+        """CheckpointJournalの新しいインスタンスを初期化します。記録は全てメモリに読み込まれます。
+
+        Args:
+            path (str): データベースファイルのパス（存在しない場合は作成される）
+        """
+        self.__path: str = path
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "stage TEXT NOT NULL, item INTEGER NOT NULL, fingerprint TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (stage, item))")
+        self.__connection.commit()
+        self.__batch = SqliteBatch(self.__connection)
+        self.__entries: dict[Tuple[str, int], Tuple[str, str]] = dict[Tuple[str, int], Tuple[str, str]]()
+        for stage, item, fingerprint, value in self.__connection.execute("SELECT stage, item, fingerprint, value FROM journal"):
+            self.__entries[(stage, item)] = (fingerprint, value)
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """データベースファイルのパスを取得します。
+        """
+        return self.__path
+
+    def get(self, stage: str, item: int, fingerprint: str) -> str | None:
+        """記録された値を取得します。
+
+        Args:
+            stage (str): 処理の種類
+            item (int): 処理の対象（二分岐のインデックスなど）
+            fingerprint (str): 処理の入力のフィンガープリント
+
+        Returns:
+            str | None: 記録された値。記録がないかフィンガープリントが一致しない場合はNone
+        """
+        with self.__lock:
+            entry: Tuple[str, str] | None = self.__entries.get((stage, item))
+        if entry is None or entry[0] != fingerprint:
+            return None
+        return entry[1]
+
+    def record(self, stage: str, item: int, fingerprint: str, value: str) -> None:
+        """処理の完了を記録します。複数のスレッドから呼び出すことができます。
+
+        Args:
+            stage (str): 処理の種類
+            item (int): 処理の対象（二分岐のインデックスなど）
+            fingerprint (str): 処理の入力のフィンガープリント
+            value (str): 記録する値
+        """
+        with self.__lock:
+            self.__batch.execute(
+                "INSERT OR REPLACE INTO journal (stage, item, fingerprint, value) VALUES (?, ?, ?, ?)",
+                (stage, item, fingerprint, value))
+            self.__entries[(stage, item)] = (fingerprint, value)
+
+    def discard(self, stage: str, item: int) -> None:
+        """記録を削除します。
+
+        Args:
+            stage (str): 処理の種類
+            item (int): 処理の対象（二分岐のインデックスなど）
+        """
+        with self.__lock:
+            self.__batch.execute("DELETE FROM journal WHERE stage = ? AND item = ?", (stage, item))
+            self.__entries.pop((stage, item), None)
+
+    def clear(self) -> None:
+        """全ての記録を削除します。
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM journal")
+            self.__entries.clear()
+
+    def flush(self) -> None:
+        """まとめられた記録をコミットします。
+        """
+        with self.__lock:
+            self.__batch.commit()
+
+    def get_result(self, item: int, fingerprint: str) -> Tuple[CatpvResult, int] | None:
+        """記録された二分岐の検定結果を取得します。
+
+        Args:
+            item (int): 二分岐のインデックス
+            fingerprint (str): 検定の入力のフィンガープリント
+
+        Returns:
+            Tuple[CatpvResult, int] | None: 検定結果と用いた複製数。記録がないかフィンガープリントが一致しない場合はNone
+        """
+        value: str | None = self.get(self.STAGE_RESULT, item, fingerprint)
+        if value is None:
+            return None
+        fields: dict = json.loads(value)
+        return (CatpvResult.from_rows(fields["entries"]), fields["replicates"])
+
+    def record_result(self, item: int, fingerprint: str, result: CatpvResult, replicates: int) -> None:
+        """二分岐の検定結果を記録します。複数のスレッドから呼び出すことができます。
+
+        Args:
+            item (int): 二分岐のインデックス
+            fingerprint (str): 検定の入力のフィンガープリント
+            result (CatpvResult): 検定結果
+            replicates (int): 検定に用いた複製数
+        """
+        self.record(self.STAGE_RESULT, item, fingerprint, json.dumps({"entries": result.to_rows(), "replicates": replicates}))
+
+    def close(self) -> None:
+        """まとめられた記録をコミットし，データベースとの接続を閉じます。
+        """
+        self.flush()
+        self.__connection.close()
@@ -9,6 +9,8 @@ class Configuration:
     """コンフィグを表します。
     """
 
+    ENV_CONFIG_PATH: str = "AUTOEB_CONFIG"
+
     def __init__(self) -> None:
         self.__iqtree_command: str = "iqtree"
         self.__consel_dir: str = "$PATH"
@@ -41,12 +43,12 @@ class Configuration:
 
     @classmethod
     def get_config_path(cls) -> str:
-        """コンフィグファイルのパスを取得します。
+        """コンフィグファイルのパスを取得します。環境変数AUTOEB_CONFIGが設定されている場合はそのパスを使用します。
 
         Returns:
             str: コンフィグファイルのパス
         """
-        return os.path.join(os.path.dirname(__file__), "config.json")
+        return os.environ.get(cls.ENV_CONFIG_PATH) or os.path.join(os.path.dirname(__file__), "config.json")
 
     @classmethod
     def load(cls) -> "Configuration":
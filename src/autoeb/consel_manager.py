@@ -1,16 +1,58 @@
+from contextlib import nullcontext
 from io import TextIOWrapper
 import os
-import subprocess
 from subprocess import CompletedProcess
 
 from .configuration import Configuration
+from .process_registry import ProcessRegistry
+from .resource_ledger import ResourceLedger
+from .trace_recorder import TraceRecorder
 
 
 class ConselManager:
     DIR_FROM_PATH: str = "$PATH"
-
-    def __init__(self, config: Configuration) -> None:
+    TREE_COUNT: int = 3
+    """1つのAU検定で比較するツリー数（最尤樹形と2つのNNI樹形）
+    """
+    RMT_SCALES: int = 10
+    """makermtが複製を生成するスケール数（0.5から1.4）
+    """
+    VALUE_BYTES: int = 8
+    """RMTファイルとSITELHファイルの1つの値の大きさ（倍精度浮動小数点数）
+    """
+
+    def __init__(self, config: Configuration, tracer: TraceRecorder | None = None, ledger: ResourceLedger | None = None) -> None:
         self.__consel_dir: str = config.consel_dir
+        self.__tracer: TraceRecorder | None = tracer
+        self.__ledger: ResourceLedger | None = ledger
+
+    @classmethod
+    def get_rmt_size(cls, replicates: int, trees: int = TREE_COUNT) -> int:
+        """RMTファイルの大きさを取得します。RMTファイルはツリー，スケール，複製ごとの対数尤度を持ちます。
+
+        Args:
+            replicates (int): スケールごとの複製数
+            trees (int, optional): ツリー数. Defaults to TREE_COUNT.
+
+        Returns:
+            int: RMTファイルの大きさ（バイト）
+        """
+        return trees * cls.RMT_SCALES * replicates * cls.VALUE_BYTES
+
+    @classmethod
+    def estimate_memory(cls, sites: int, replicates: int, trees: int = TREE_COUNT) -> int:
+        """1つのAU検定でCONSELのプログラムが用いるメモリを見積もります。
+
+        Args:
+            sites (int): 座位数
+            replicates (int): スケールごとの複製数
+            trees (int, optional): ツリー数. Defaults to TREE_COUNT.
+
+        Returns:
+            int: メモリ（バイト）
+        """
+        # makermt holds the site likelihood values and the replicates, and consel reads the whole RMT file
+        return trees * sites * cls.VALUE_BYTES + cls.get_rmt_size(replicates, trees)
 
     def makermt(self, sitelh_path: str, seed: int, rellboot: int, cwd: str | None = None, stdout: TextIOWrapper | None = None) -> CompletedProcess[bytes]:
         """makermtを実行します。
@@ -23,8 +65,8 @@ class ConselManager:
             stdout (TextIOWrapper | None, optional): 出力先. Defaults to None.
         """
         opt_b: float = rellboot / 10000
-        command = f"--puzzle {sitelh_path} -b {opt_b} -s {seed}"
-        return self.__invoke_app("makermt", command, cwd, stdout)
+        arguments: list[str] = ["--puzzle", sitelh_path, "-b", str(opt_b), "-s", str(seed)]
+        return self.__invoke_app("makermt", arguments, cwd, stdout)
 
     def consel(self, rmt_path: str, cwd: str | None = None, stdout: TextIOWrapper | None = None) -> CompletedProcess[bytes]:
         """conselを実行します。
@@ -34,19 +76,19 @@ class ConselManager:
             cwd (str | None, optional): 実行ディレクトリ. Defaults to None.
             stdout (TextIOWrapper | None, optional): 出力先. Defaults to None.
         """
-        command = f"{rmt_path}"
-        return self.__invoke_app("consel", command, cwd, stdout)
+        return self.__invoke_app("consel", [rmt_path], cwd, stdout)
 
-    def catpv(self, pv_path: str, cwd: str | None = None, stdout: TextIOWrapper | None = None) -> CompletedProcess[bytes]:
+    def catpv(self, pv_path: str, cwd: str | None = None, stdout: TextIOWrapper | None = None, standard_error: bool = False) -> CompletedProcess[bytes]:
         """catpvを実行します。
 
         Args:
             pv_path (str): PVファイルのパス
             cwd (str | None, optional): 実行ディレクトリ. Defaults to None.
             stdout (TextIOWrapper | None, optional): 出力先. Defaults to None.
+            standard_error (bool, optional): p値の標準誤差を出力するかどうか（catpv -s 1）. Defaults to False.
         """
-        command = f"{pv_path}"
-        return self.__invoke_app("catpv", command, cwd, stdout)
+        arguments: list[str] = ["-s", "1", pv_path] if standard_error else [pv_path]
+        return self.__invoke_app("catpv", arguments, cwd, stdout)
 
     def __get_app_path(self, appname: str) -> str:
         """アプリケーションのパスを取得します。
@@ -61,17 +103,25 @@ class ConselManager:
             return appname
         return os.path.join(self.__consel_dir, appname)
 
-    def __invoke_app(self, appname: str, command: str, cwd: str | None, stdout: TextIOWrapper | None) -> CompletedProcess[bytes]:
-        """アプリを実行します。
+    def __invoke_app(self, appname: str, arguments: list[str], cwd: str | None, stdout: TextIOWrapper | None) -> CompletedProcess[bytes]:
+        """アプリをシェルを介さずに実行します。
 
         Args:
             appname (str): アプリ名
-            command (str): コマンド
+            arguments (list[str]): 引数一覧
             cwd (str | None): 実行ディレクトリ
             stdout (TextIOWrapper | None, optional): 出力先
 
+        Raises:
+            CalledProcessError: アプリが0以外の終了コードを返した
+            OperationCancelledError: シグナルによって処理が取り消された
+
         Returns:
-            CompletedProcess[bytes]: subprocess.run()の実行結果
+            CompletedProcess[bytes]: 実行結果
         """
-        command = f"{self.__get_app_path(appname)} {command}"
-        return subprocess.run(command, shell=True, cwd=cwd, check=True, stdout=stdout)
+        command: list[str] = [self.__get_app_path(appname)] + arguments
+        with nullcontext() if self.__tracer is None else self.__tracer.span(appname, "process", args=arguments):
+            result, usage = ProcessRegistry.get_instance().run_measured(command, appname, cwd, stdout)
+        if self.__ledger is not None:
+            self.__ledger.record(usage)
+        return result
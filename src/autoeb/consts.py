@@ -6,5 +6,11 @@ OUTFILE_INDEX_TREE: str = "indexed.tree"
 OUTFILE_TREE: str = "result.tree"
 OUTFILE_ALL_TREES: str = "all.treeset"
 OUTFILE_SITELH: str = "trees.sitelh"
+OUTFILE_MODEL_PREFIX: str = "model"
+OUTFILE_SITELH_STORE: str = "sitelh.sqlite"
 OUTFILE_SUMMARY: str = "summary.txt"
+OUTFILE_CHECKPOINT: str = "checkpoint.sqlite"
 OUTFILE_TMPZIP: str = "tmp-output.tar.gz"
+OUTFILE_TMPZIP_ZSTD: str = "tmp-output.tar.zst"
+OUTFILE_RESULTS: str = "results.sqlite"
+OUTFILE_LOG: str = "autoeb.log"
@@ -0,0 +1,64 @@
+from collections import deque
+from contextlib import contextmanager
+from itertools import count
+from threading import Condition
+from typing import Generator
+
+
+class CorePool:
+    """複数のデータセットの処理で共有するCPUコアを管理します。
+    コアは要求された順に割り当てられるため，多くのコアを要求する処理が後続の小さな処理に追い越され続けることはありません。
+    """
+
+    def __init__(self, cores: int) -> None:
+        """CorePoolの新しいインスタンスを初期化します。
+
+        Args:
+            cores (int): 共有するコア数
+        """
+        if cores < 1:
+            raise ValueError("cores must be greater or equal to 1")
+        self.__cores: int = cores
+        self.__free: int = cores
+        self.__condition = Condition()
+        self.__waiting: deque[int] = deque[int]()
+        self.__tickets = count()
+
+    @property
+    def cores(self) -> int:
+        """共有するコア数を取得します。
+        """
+        return self.__cores
+
+    @property
+    def free(self) -> int:
+        """割り当てられていないコア数を取得します。
+        """
+        with self.__condition:
+            return self.__free
+
+    @contextmanager
+    def acquire(self, cores: int = 1) -> Generator[int, None, None]:
+        """コアを割り当てます。空きがない場合は，先に要求された処理への割り当てと解放を待機します。
+
+        Args:
+            cores (int, optional): 要求するコア数（共有するコア数を上限とする）. Defaults to 1.
+
+        Yields:
+            Generator[int, None, None]: 割り当てられたコア数
+        """
+        share: int = max(1, min(cores, self.__cores))
+        with self.__condition:
+            ticket: int = next(self.__tickets)
+            self.__waiting.append(ticket)
+            self.__condition.wait_for(lambda: self.__waiting[0] == ticket and share <= self.__free)
+            self.__waiting.popleft()
+            self.__free -= share
+            # the next request may also be satisfied by the remaining cores
+            self.__condition.notify_all()
+        try:
+            yield share
+        finally:
+            with self.__condition:
+                self.__free += share
+                self.__condition.notify_all()
@@ -1,3 +1,6 @@
+from .batch_arguments import BatchArguments
 from .command_arguments import CommandArguments
+from .merge_arguments import MergeArguments
+from .worker_arguments import WorkerArguments
 
 __version__ = "1.1.1"
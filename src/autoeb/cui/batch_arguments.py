@@ -0,0 +1,105 @@
+from argparse import ArgumentError, ArgumentParser, Namespace
+import os
+from typing import Tuple
+
+
+class BatchArguments:
+    """複数のデータセットを1つのプロセスで解析するコマンドの引数を表すクラスです。
+    """
+
+    __parser: ArgumentParser | None = None
+    __DATASET_OPTIONS: set[str] = {"-s", "--seq", "-t", "--tree", "-m", "--model", "-o", "--out"}
+    __UNSUPPORTED_OPTIONS: set[str] = {"--metrics", "--metrics-textfile", "--trace"}
+
+    def __init__(self, args: list[str]) -> None:
+        """BatchArgumentsの新しいインスタンスを初期化します。
+
+        Args:
+            args (list[str]): コマンド引数（サブコマンド名を除く）
+        """
+        self.__namespace: Namespace
+        self.__options: list[str]
+        self.__namespace, self.__options = self.get_arg_parser().parse_known_args(args)
+
+    @property
+    def manifest(self) -> str:
+        """データセットの一覧のファイルのパスを取得します。
+        """
+        result: str = self.__namespace.manifest
+        if not os.path.isfile(result):
+            raise ArgumentError(None, f"Manifest file '{result}' does not exists")
+        return os.path.abspath(result)
+
+    @property
+    def datasets(self) -> list[Tuple[str, str, str, str]]:
+        """データセットの一覧を取得します。相対パスはデータセットの一覧のファイルの位置を基準とします。
+
+        Returns:
+            list[Tuple[str, str, str, str]]: 配列ファイル，ツリーファイル，進化モデル，出力先の一覧
+        """
+        manifest: str = self.manifest
+        base_dir: str = os.path.dirname(manifest)
+        result: list[Tuple[str, str, str, str]] = []
+        with open(manifest, "rt") as manifest_io:
+            for number, line in enumerate(manifest_io, 1):
+                if line.strip() == "" or line.startswith("#"):
+                    continue
+                columns: list[str] = line.rstrip("\r\n").split("\t")
+                if len(columns) != 4:
+                    raise ArgumentError(None, f"Line {number} of '{manifest}' must have 4 tab-separated columns (sequence, tree, model and destination)")
+                seq, tree, model, out = columns
+                result.append((os.path.join(base_dir, seq), os.path.join(base_dir, tree), model, os.path.join(base_dir, out)))
+        return result
+
+    @property
+    def cores(self) -> int:
+        """全てのデータセットで共有するコア数を取得します。指定がない場合はプロセスが利用できるCPU数です。
+        """
+        result: int | None = self.__namespace.cores
+        if result is None:
+            from ..resource_limits import ResourceLimits
+            return ResourceLimits.detect().cpus
+        if result < 1:
+            raise ArgumentError(None, "Value of '--cores' option must be greater or equal to 1")
+        return result
+
+    @property
+    def concurrent_datasets(self) -> int:
+        """同時に解析するデータセット数の上限を取得します。
+        """
+        result: int | None = self.__namespace.datasets
+        if result is None:
+            return self.cores
+        if result < 1:
+            raise ArgumentError(None, "Value of '--datasets' option must be greater or equal to 1")
+        return result
+
+    @property
+    def options(self) -> list[str]:
+        """全てのデータセットに与えるAUTOEBのオプションを取得します。
+        """
+        for option in self.__options:
+            if option.split("=", 1)[0] in self.__DATASET_OPTIONS:
+                raise ArgumentError(None, f"Option '{option}' must be specified in the manifest")
+            if option.split("=", 1)[0] in self.__UNSUPPORTED_OPTIONS:
+                # the datasets would overwrite the metrics of each other
+                raise ArgumentError(None, f"Option '{option}' is not supported in batch mode")
+        return list(self.__options)
+
+    @classmethod
+    def get_arg_parser(cls) -> ArgumentParser:
+        """使用するArgumentParserのインスタンスを取得します。
+
+        Returns:
+            ArgumentParser: 使用するArgumentParserのインスタンス
+        """
+        if not cls.__parser:
+            result = ArgumentParser(
+                prog="AUTOEB batch",
+                description="Analyze datasets listed in a manifest in one process. the other options are given to every dataset",
+                usage="%(prog)s [-h] [--cores INT] [--datasets INT] MANIFEST [AUTOEB options]")
+            result.add_argument("manifest", type=str, help="tab-separated file whose lines are sequence file, tree file, model and destination folder", metavar="MANIFEST")
+            result.add_argument("--cores", default=None, type=int, help="number of cores shared by IQ-TREE and CONSEL of all datasets (>=1, default=CPUs available to the process)", metavar="INT")
+            result.add_argument("--datasets", default=None, type=int, help="number of datasets analyzed concurrently (>=1, default=value of '--cores')", metavar="INT")
+            cls.__parser = result
+        return cls.__parser
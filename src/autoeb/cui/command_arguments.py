@@ -1,5 +1,6 @@
 from argparse import ArgumentError, ArgumentParser, Namespace
 import os
+import shutil
 
 from ..nnigen.io import TreeIOHandler, treetype
 from ..output_formatter import OutputFormatter
@@ -53,6 +54,17 @@ class CommandArguments:
             raise ArgumentError(None, "Value of '-b' option must be greater or equal to 1000")
         return result
 
+    @property
+    def adaptive_bootstrap(self) -> int | None:
+        """適応的なRELL bootstrapで最初に用いる複製数を取得します。適応的に増やさない場合はNoneです。
+        """
+        result: int | None = self.__namespace.adaptive_bootstrap
+        if result is None:
+            return None
+        if result < 1000 or self.rell_boot < result:
+            raise ArgumentError(None, "Value of '--adaptive-bootstrap' option must be between 1000 and the value of '-b' option")
+        return result
+
     @property
     def seed(self) -> int:
         """RELL-bootのシード値を取得します。
@@ -77,6 +89,33 @@ class CommandArguments:
         """
         return ValueRange.parse(self.__namespace.range)
 
+    @property
+    def support_below(self) -> float | None:
+        """解析を行う枝の既存の支持値の上限（この値未満）を取得します。支持値によらない場合はNoneです。
+        """
+        return self.__namespace.support_below
+
+    @property
+    def length_below(self) -> float | None:
+        """解析を行う枝の枝長の上限（この値未満）を取得します。枝長によらない場合はNoneです。
+        """
+        result: float | None = self.__namespace.length_below
+        if result is not None and result <= 0:
+            raise ArgumentError(None, "Value of '--length-below' option must be larger than 0")
+        return result
+
+    @property
+    def clade(self) -> list[str] | None:
+        """解析を行う枝を含むクレードの葉の名前を取得します。クレードによらない場合はNoneです。
+        """
+        result: str | None = self.__namespace.clade
+        if result is None:
+            return None
+        names: list[str] = [name.strip() for name in result.split(",") if name.strip() != ""]
+        if len(names) < 2:
+            raise ArgumentError(None, "'--clade' option must have 2 or more taxa")
+        return names
+
     @property
     def sig_level(self) -> float:
         """有意水準を取得します。
@@ -95,11 +134,23 @@ class CommandArguments:
 
     @property
     def threads(self) -> int:
-        """スレッド数を取得します。
+        """スレッド数を取得します。0が指定された場合はプロセスが利用できるCPU数です。
         """
         result: int = self.__namespace.thread
-        if result < 1:
-            raise ArgumentError(None, "Value of '-T' option must be greater or equal to 1")
+        if result < 0:
+            raise ArgumentError(None, "Value of '-T' option must be greater or equal to 0")
+        if result == 0:
+            from ..resource_limits import ResourceLimits
+            return ResourceLimits.detect().cpus
+        return result
+
+    @property
+    def retry(self) -> int:
+        """失敗した二分岐のCONSEL処理を再実行する回数を取得します。
+        """
+        result: int = self.__namespace.retry
+        if result < 0:
+            raise ArgumentError(None, "Value of '--retry' option must be greater or equal to 0")
         return result
 
     @property
@@ -120,18 +171,148 @@ class CommandArguments:
             raise ArgumentError(None, f"Text file '{result}' does not exist")
         return result
 
+    @property
+    def chunk_size(self) -> int:
+        """IQ-TREEの1プロセスで評価する二分岐数を取得します。0で分割しません。
+        """
+        result: int = self.__namespace.chunk_size
+        if result < 0:
+            raise ArgumentError(None, "Value of '--chunk-size' option must be greater or equal to 0")
+        return result
+
+    @property
+    def iqtree_workers(self) -> int:
+        """同時に実行するIQ-TREEのプロセス数を取得します。
+        """
+        result: int = self.__namespace.iqtree_workers
+        if result < 1:
+            raise ArgumentError(None, "Value of '--iqtree-workers' option must be greater or equal to 1")
+        return result
+
+    @property
+    def iqtree_run_prefix(self) -> str | None:
+        """モデルパラメータを読み込むIQ-TREEの実行結果のprefixを取得します。
+        """
+        result: str | None = self.__namespace.from_iqtree_run
+        if result is None:
+            return None
+        if not os.path.isfile(result + ".iqtree"):
+            raise ArgumentError(None, f"IQ-TREE report '{result}.iqtree' does not exist")
+        return os.path.abspath(result)
+
+    @property
+    def model_cache_dir(self) -> str | None:
+        """モデルパラメータのキャッシュディレクトリを取得します。キャッシュを使用しない場合はNoneです。
+        """
+        result: str | None = self.__namespace.model_cache
+        if result is None:
+            return None
+        return os.path.abspath(result)
+
+    @property
+    def sitelh_store_path(self) -> str:
+        """ツリーごとのサイト尤度を保存するデータベースのパスを取得します。
+        """
+        result: str | None = self.__namespace.sitelh_store
+        if result is None:
+            from ..consts import OUTFILE_SITELH_STORE
+            return os.path.abspath(self.get_out_file_path(OUTFILE_SITELH_STORE))
+        return os.path.abspath(result)
+
+    @property
+    def queue_path(self) -> str | None:
+        """二分岐の検定をワーカーに分担させるジョブキューのデータベースファイルのパスを取得します。ワーカーを用いない場合はNoneです。
+        """
+        result: str | None = self.__namespace.queue
+        if result is None:
+            return None
+        if not os.path.isdir(os.path.dirname(os.path.abspath(result))):
+            raise ArgumentError(None, f"Directory of queue file '{result}' does not exist")
+        from ..work_queue import WorkQueue
+        try:
+            WorkQueue.check_locks(result)
+        except OSError as e:
+            raise ArgumentError(None, f"Queue file '{result}' requires a file system with working POSIX file locks: {e}")
+        return os.path.abspath(result)
+
+    @property
+    def metrics_path(self) -> str | None:
+        """処理の段階とジョブの状態の変化を追記するJSON Linesファイルのパスを取得します。記録しない場合はNoneです。
+        """
+        return self.__get_metrics_file(self.__namespace.metrics, "metrics")
+
+    @property
+    def metrics_textfile_path(self) -> str | None:
+        """Prometheusのtextfile形式で集計値を出力するファイルのパスを取得します。出力しない場合はNoneです。
+        """
+        return self.__get_metrics_file(self.__namespace.metrics_textfile, "metrics-textfile")
+
+    @property
+    def trace_path(self) -> str | None:
+        """処理の区間をChromeのtrace event形式で出力するファイルのパスを取得します。出力しない場合はNoneです。
+        """
+        return self.__get_metrics_file(self.__namespace.trace, "trace")
+
+    @property
+    def profile_stages(self) -> list[str]:
+        """cProfileとtracemallocで計測する段階の名前を取得します。計測しない場合は空のリストです。
+        """
+        from ..stage_profiler import StageProfiler
+        result: str | None = self.__namespace.profile
+        if result is None:
+            return []
+        if result == "all":
+            return list(StageProfiler.STAGES)
+        stages: list[str] = [stage.strip() for stage in result.split(",")]
+        for stage in stages:
+            if not stage in StageProfiler.STAGES:
+                raise ArgumentError(None, f"Stage '{stage}' of '--profile' option must be one of {', '.join(StageProfiler.STAGES)} or 'all'")
+        return stages
+
+    @property
+    def scratch_dir(self) -> str | None:
+        """二分岐ごとの中間ファイルを置く作業ディレクトリの作成先を取得します。出力先に直接置く場合はNoneです。
+        """
+        result: str | None = self.__namespace.scratch
+        if result is None:
+            return None
+        if not os.path.isdir(result):
+            raise ArgumentError(None, f"Scratch directory '{result}' does not exist")
+        return os.path.abspath(result)
+
+    @property
+    def prescreen(self) -> bool:
+        """AU検定の前にサイト尤度からKH検定・SH検定による判定を行うかどうかを取得します。
+        """
+        return self.__namespace.prescreen
+
     @property
     def iqtree_verbose(self) -> bool:
         """IQ-TREEのログを全て出力するかどうかを取得します。
         """
         return self.__namespace.iqtree_verbose
 
+    @property
+    def progress(self) -> bool:
+        """二分岐の検定の進捗を表示するかどうかを取得します。
+        """
+        return self.__namespace.progress
+
     @property
     def output_tmp_files(self) -> bool:
         """中間ファイルを残すかどうかを取得します。
         """
         return self.__namespace.output_tmp_files
 
+    @property
+    def tmp_compression(self) -> str:
+        """中間ファイルのアーカイブの圧縮方式を取得します。
+        """
+        result: str = self.__namespace.tmp_compression
+        if result == "zstd" and shutil.which("zstd") is None:
+            raise ArgumentError(None, "'zstd' is not found")
+        return result
+
     @property
     def redo(self) -> bool:
         """チェックポイントを無視して再解析を行うかどうかを取得します。
@@ -164,17 +345,53 @@ class CommandArguments:
         parser.add_argument("-t", "--tree", type=str, required=True, help="ML-tree file", metavar="FILE")
         parser.add_argument("-m", "--model", type=str, required=True, help="substitution model", metavar="MODEL")
         parser.add_argument("--iqtree-param", default=None, type=str, help="IQ-TREE parameter arguments (default is empty string)", metavar="PARAM")
+        parser.add_argument("--chunk-size", default=0, type=int, help="number of bipartitions evaluated by each IQ-TREE process. if 0, all bipartitions are evaluated at once (>=0, default=0)", metavar="INT")
+        parser.add_argument("--iqtree-workers", default=1, type=int, help="number of IQ-TREE processes evaluating chunks concurrently. threads specified by '-T' are split between them (>=1, default=1)", metavar="INT")
+        parser.add_argument("--from-iqtree-run", default=None, type=str, help="prefix of the IQ-TREE run which estimated the model. parameters in 'PREFIX.iqtree' are used without estimation", metavar="PREFIX")
+        parser.add_argument("--model-cache", default=None, type=str, help="directory to cache estimated model parameters. the parameters are estimated before the site likelihood calculation and reused by later runs (default=no cache)", metavar="DIR")
+        parser.add_argument("--sitelh-store", default=None, type=str, help="database storing site likelihood values of each tree (default=OUT/sitelh.sqlite)", metavar="FILE")
+        parser.add_argument("--scratch", default=None, type=str, help="directory where intermediates of each bipartition are placed, e.g. /dev/shm. only the results are kept in the destination folder (default=destination folder)", metavar="DIR")
         parser.add_argument("--range", default="ALL", type=str, help="the range: which branch to be analyzed. e.g.'ALL', '3-10', '2,3,10-20', '5-', '-20' (default=ALL)", metavar="RANGE")
+        parser.add_argument("--support-below", default=None, type=float, help="analyze only branches whose support label in the ML tree is below the value. the first value is used for labels like 'SH-aLRT/UFBoot'", metavar="FLOAT")
+        parser.add_argument("--length-below", default=None, type=float, help="analyze only branches whose length in the ML tree is below the value (>0)", metavar="FLOAT")
+        parser.add_argument("--clade", default=None, type=str, help="comma-separated taxa of a clade. analyze only branches inside the clade, i.e. branches one side of which consists only of the taxa", metavar="TAXA")
         parser.add_argument("--sig-level", default=0.05, type=float, help="the significance level (0-1, default=0.05)", metavar="FLOAT")
         parser.add_argument("-b", "--bootstrap", default=10_0000, type=int, help="replicates of RELL bootstrap (>=1000, default=100,000)", metavar="INT")
+        parser.add_argument("--adaptive-bootstrap", default=None, type=int, help="initial replicates of RELL bootstrap. replicates are increased up to '-b' only for bipartitions whose p-values are close to the significance level (>=1000)", metavar="INT")
+        parser.add_argument("--prescreen", action="store_true", help="decide bipartitions clearly supported or not supported by KH and SH tests computed from site likelihood values, and perform AU test only for the others")
         parser.add_argument("--seed", default=-1, type=int, help="seed of random value (>= -1). if larger than 0, specified value is used for seed (default=-1)", metavar="INT")
         parser.add_argument("-o", "--out", type=str, required=True, help="destination folder", metavar="DIR")
         parser.add_argument("-f", "--out-format", default='{src}/{bin}', type=str, help="format of branch name (default='{src}/{bin}')", metavar="STR")
-        parser.add_argument("-T", "--thread", default=1, type=int, help="numbmer of threads IQ-TREE uses (default=1)", metavar="INT")
+        parser.add_argument("-T", "--thread", default=1, type=int, help="numbmer of threads IQ-TREE uses. if 0, CPUs available to the process (cgroup quota and affinity) are used (>=0, default=1)", metavar="INT")
+        parser.add_argument("--queue", default=None, type=str, help="job queue on a shared filesystem. AU tests of bipartitions are performed by workers started by 'python -m autoeb worker FILE' instead of this process", metavar="FILE")
+        parser.add_argument("--retry", default=1, type=int, help="number of retries of failed CONSEL operations for each bipartition (>=0, default=1)", metavar="INT")
+        parser.add_argument("--progress", action="store_true", help="show the numbers of queued, running and finished bipartitions on stderr")
+        parser.add_argument("--metrics", default=None, type=str, help="JSON Lines file to which start and end of stages and state changes of jobs are appended", metavar="FILE")
+        parser.add_argument("--metrics-textfile", default=None, type=str, help="file to which counts of jobs, throughput and ETA of each stage are written in Prometheus textfile format", metavar="FILE")
+        parser.add_argument("--trace", default=None, type=str, help="file to which the timeline of the operations and external programs of each thread is written in Chrome trace event format", metavar="FILE")
+        parser.add_argument("--profile", default=None, type=str, help="comma-separated stages profiled by cProfile and tracemalloc: 'nni', 'sitelh', 'catpv', 'summary' or 'all'. reports are written in the destination folder", metavar="STAGES")
         parser.add_argument("--iqtree-verbose", action="store_true", help="redirect IQ-TREE stdout")
         parser.add_argument("--output-tmp-files", action="store_true", help="output files IQ-TREE and CONSEL generated")
+        parser.add_argument("--tmp-compression", default="gzip", choices=["gzip", "zstd"], help="compression of the archive of temporary files. compressed in multi-threads by 'pigz' or 'zstd' (default=gzip)")
         parser.add_argument("--redo", action="store_true", help="Ignore checkpoints and redo the analysis")
 
+    @staticmethod
+    def __get_metrics_file(path: str | None, option: str) -> str | None:
+        """メトリクスやトレースの出力先のパスを検証して取得します。
+
+        Args:
+            path (str | None): 指定されたパス
+            option (str): オプション名
+
+        Returns:
+            str | None: 出力先の絶対パス。指定がない場合はNone
+        """
+        if path is None:
+            return None
+        if not os.path.isdir(os.path.dirname(os.path.abspath(path))):
+            raise ArgumentError(None, f"Directory of '--{option}' file '{path}' does not exist")
+        return os.path.abspath(path)
+
     def get_out_file_path(self, filename: str) -> str:
         """出力ファイルパスを取得します。
 
@@ -0,0 +1,78 @@
+from argparse import ArgumentError, ArgumentParser, Namespace
+import os
+
+from ..output_formatter import OutputFormatter
+
+
+class MergeArguments:
+    """出力先を分けて解析した結果を統合するコマンドの引数を表すクラスです。
+    """
+
+    __parser: ArgumentParser | None = None
+
+    def __init__(self, args: list[str]) -> None:
+        """MergeArgumentsの新しいインスタンスを初期化します。
+
+        Args:
+            args (list[str]): コマンド引数（サブコマンド名を除く）
+        """
+        self.__namespace: Namespace = self.get_arg_parser().parse_args(args)
+
+    @property
+    def shard_dirs(self) -> list[str]:
+        """統合する出力先ディレクトリの一覧を取得します。
+        """
+        from ..consts import OUTFILE_RESULTS
+        result: list[str] = []
+        for directory in self.__namespace.dirs:
+            if not os.path.isfile(os.path.join(directory, OUTFILE_RESULTS)):
+                raise ArgumentError(None, f"'{OUTFILE_RESULTS}' is not found in '{directory}'")
+            if not os.path.abspath(directory) in result:
+                result.append(os.path.abspath(directory))
+        return result
+
+    @property
+    def out_dir(self) -> str:
+        """出力先ディレクトリを取得します。
+        """
+        result: str = os.path.abspath(self.__namespace.out)
+        if result in [os.path.abspath(directory) for directory in self.__namespace.dirs]:
+            raise ArgumentError(None, "Destination folder must be different from the merged folders")
+        if not os.path.isdir(result):
+            os.mkdir(result)
+        return result
+
+    @property
+    def out_format(self) -> str | None:
+        """出力フォーマットを取得します。解析時のフォーマットを用いる場合はNoneです。
+        """
+        result: str | None = self.__namespace.out_format
+        if result is not None and not OutputFormatter.check_format(result):
+            raise ArgumentError(None, "Invalid format by '-f' option was detected")
+        return result
+
+    @classmethod
+    def get_arg_parser(cls) -> ArgumentParser:
+        """使用するArgumentParserのインスタンスを取得します。
+
+        Returns:
+            ArgumentParser: 使用するArgumentParserのインスタンス
+        """
+        if not cls.__parser:
+            result = ArgumentParser(prog="AUTOEB merge", description="Merge the results of runs analyzing different ranges of bipartitions")
+            result.add_argument("dirs", nargs="+", type=str, help="destination folders of the runs", metavar="DIR")
+            result.add_argument("-o", "--out", type=str, required=True, help="destination folder of the merged results", metavar="DIR")
+            result.add_argument("-f", "--out-format", default=None, type=str, help="format of branch name (default=format of the runs)", metavar="STR")
+            cls.__parser = result
+        return cls.__parser
+
+    def get_out_file_path(self, filename: str) -> str:
+        """出力ファイルパスを取得します。
+
+        Args:
+            filename (str): ファイル名
+
+        Returns:
+            str: out_dirを反映したファイルのパス
+        """
+        return os.path.join(self.out_dir, filename)
@@ -0,0 +1,88 @@
+from argparse import ArgumentError, ArgumentParser, Namespace
+import os
+
+
+class WorkerArguments:
+    """ワーカーのコマンド引数を表すクラスです。
+    """
+
+    __parser: ArgumentParser | None = None
+
+    def __init__(self, args: list[str]) -> None:
+        """WorkerArgumentsの新しいインスタンスを初期化します。
+
+        Args:
+            args (list[str]): コマンド引数（サブコマンド名を除く）
+        """
+        self.__namespace: Namespace = self.get_arg_parser().parse_args(args)
+
+    @property
+    def queue_path(self) -> str:
+        """ジョブキューのデータベースファイルのパスを取得します。
+        """
+        result: str = self.__namespace.queue
+        if not os.path.isfile(result):
+            raise ArgumentError(None, f"Queue file '{result}' does not exists")
+        from ..work_queue import WorkQueue
+        try:
+            WorkQueue.check_locks(result)
+        except OSError as e:
+            raise ArgumentError(None, f"Queue file '{result}' requires a file system with working POSIX file locks: {e}")
+        return os.path.abspath(result)
+
+    @property
+    def lease(self) -> float:
+        """ジョブのリースの期間（秒）を取得します。
+        """
+        result: float = self.__namespace.lease
+        if result < 1:
+            raise ArgumentError(None, "Lease must be larger or equal to 1")
+        return result
+
+    @property
+    def idle_timeout(self) -> float:
+        """取得できるジョブがない状態でワーカーを終了するまでの時間（秒）を取得します。0で受付が終了するまで待機します。
+        """
+        result: float = self.__namespace.idle_timeout
+        if result < 0:
+            raise ArgumentError(None, "Idle timeout must be larger or equal to 0")
+        return result
+
+    @property
+    def jobs(self) -> int:
+        """同時に実行するジョブ数を取得します。0の場合はプロセスが利用できるCPU数です。
+        """
+        result: int = self.__namespace.jobs
+        if result < 0:
+            raise ArgumentError(None, "Value of '-j' option must be greater or equal to 0")
+        from ..resource_limits import ResourceLimits
+        cpus: int = ResourceLimits.detect().cpus
+        return cpus if result == 0 else result
+
+    @property
+    def scratch_dir(self) -> str | None:
+        """中間ファイルを置く作業ディレクトリの作成先を取得します。Noneで一時ディレクトリを用います。
+        """
+        result: str | None = self.__namespace.scratch
+        if result is None:
+            return None
+        if not os.path.isdir(result):
+            raise ArgumentError(None, f"Scratch directory '{result}' does not exist")
+        return os.path.abspath(result)
+
+    @classmethod
+    def get_arg_parser(cls) -> ArgumentParser:
+        """使用するArgumentParserのインスタンスを取得します。
+
+        Returns:
+            ArgumentParser: 使用するArgumentParserのインスタンス
+        """
+        if not cls.__parser:
+            result = ArgumentParser(prog="AUTOEB worker", description="Perform AU tests of bipartitions queued by 'autoeb --queue'")
+            result.add_argument("queue", type=str, help="queue file written by 'autoeb --queue'", metavar="QUEUE")
+            result.add_argument("--lease", default=60.0, type=float, help="seconds for which a claimed job is locked. the lease is renewed while the job is running (>=1, default=60)", metavar="SEC")
+            result.add_argument("--idle-timeout", default=0.0, type=float, help="exit after no job is claimed for the seconds. if 0, wait until the queue is closed (>=0, default=0)", metavar="SEC")
+            result.add_argument("-j", "--jobs", default=1, type=int, help="number of jobs run at once by the worker. if 0, the CPUs available to the process are used (>=0, default=1)", metavar="INT")
+            result.add_argument("--scratch", default=None, type=str, help="directory where intermediates of each job are placed, e.g. /dev/shm (default=temporary directory)", metavar="DIR")
+            cls.__parser = result
+        return cls.__parser
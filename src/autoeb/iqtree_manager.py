@@ -1,20 +1,29 @@
+from contextlib import nullcontext
+import os
+import shlex
 from subprocess import CompletedProcess
-import subprocess
 
 from .configuration import Configuration
+from .process_registry import ProcessRegistry
+from .resource_ledger import ResourceLedger
+from .trace_recorder import TraceRecorder
 
 
 class IqtreeManager:
     """IQ-TREEの実行を行います。
     """
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(self, config: Configuration, tracer: TraceRecorder | None = None, ledger: ResourceLedger | None = None) -> None:
         """IqtreeManagerの新しいインスタンスを初期化します。
 
         Args:
             config (Configuration): コンフィグ情報
+            tracer (TraceRecorder | None, optional): 実行を記録するTraceRecorder. Defaults to None.
+            ledger (ResourceLedger | None, optional): 資源の使用量を集計するResourceLedger. Defaults to None.
         """
         self.__iqtree_command: str = config.iqtree_command
+        self.__tracer: TraceRecorder | None = tracer
+        self.__ledger: ResourceLedger | None = ledger
         self.__other_params: str = ""
 
     @property
@@ -60,7 +69,31 @@ class IqtreeManager:
             threads (int | None, optional): -T. Defaults to None.
             cwd (str | None, optional): 実行ディレクトリ. Defaults to None.
         """
-        command = f"-s {sequence_path} -m {model} -te {input_tree_path} -z {target_trees_path} -wsl"
+        command: list[str] = ["-s", sequence_path, "-m", model, "-te", input_tree_path, "-z", target_trees_path, "-wsl"]
+        return self.__invoke_iqtree(command, verbose, redo, prefix, threads, cwd)
+
+    def fit_model(self,
+                  sequence_path: str,
+                  model: str,
+                  input_tree_path: str,
+                  verbose: bool = False,
+                  redo: bool = False,
+                  prefix: str | None = None,
+                  threads: int | None = None,
+                  cwd: str | None = None) -> CompletedProcess[bytes]:
+        """ツリーを固定してモデルパラメータを推定し，レポートファイル（.iqtree）を出力します。
+
+        Args:
+            sequence_path (str): 配列ファイルのパス
+            model (str): 進化モデル
+            input_tree_path (str): モデルフィッティングに用いるツリーのパス
+            verbose (bool, optional): ログを出力にリダイレクトするかどうか. Defaults to False.
+            redo (bool, optional): --redo. Defaults to False.
+            prefix (str | None, optional): --prefix. Defaults to None.
+            threads (int | None, optional): -T. Defaults to None.
+            cwd (str | None, optional): 実行ディレクトリ. Defaults to None.
+        """
+        command: list[str] = ["-s", sequence_path, "-m", model, "-te", input_tree_path]
         return self.__invoke_iqtree(command, verbose, redo, prefix, threads, cwd)
 
     def exec_autest(self,
@@ -88,32 +121,51 @@ class IqtreeManager:
             threads (int | None, optional): -T. Defaults to None.
             cwd (str | None, optional): 実行ディレクトリ. Defaults to None.
         """
-        command = f"-s {sequence_path} -m {model} -te {input_tree_path} -z {treeset_path} -zb {rellboot_count} -au"
+        command: list[str] = ["-s", sequence_path, "-m", model, "-te", input_tree_path, "-z", treeset_path, "-zb", str(rellboot_count), "-au"]
         return self.__invoke_iqtree(command, verbose, redo, prefix, threads, cwd)
 
-    def __invoke_iqtree(self, command: str, verbose: bool, redo: bool, prefix: str | None, threads: int | None, cwd: str | None) -> CompletedProcess[bytes]:
-        """IQ-TREEを実行します。
+    def __invoke_iqtree(self, arguments: list[str], verbose: bool, redo: bool, prefix: str | None, threads: int | None, cwd: str | None) -> CompletedProcess[bytes]:
+        """IQ-TREEをシェルを介さずに実行します。
 
         Args:
-            command (str): コマンド
+            arguments (list[str]): 引数一覧
             verbose (bool): ログを出力にリダイレクトするかどうか
             redo (bool): --redoオプション
             prefix (str | None): --prefixオプション
             threads (int | None): -T オプション
             cwd (str | None): 実行ディレクトリ
 
+        Raises:
+            CalledProcessError: IQ-TREEが0以外の終了コードを返した
+            OperationCancelledError: シグナルによって処理が取り消された
+
         Returns:
-            CompletedProcess[bytes]: subprocess.run()実行結果
+            CompletedProcess[bytes]: 実行結果
         """
-        command = f"{self.__iqtree_command} {command}"
+        command: list[str] = self.__split(self.__iqtree_command) + arguments
         if threads is not None:
-            command += f" -T {threads}"
+            command += ["-T", str(threads)]
         if not verbose:
-            command += " --quiet"
+            command.append("--quiet")
         if redo:
-            command += " --redo"
+            command.append("--redo")
         if prefix is not None:
-            command += f" --prefix {prefix}"
-        if len(self.other_params) > 0:
-            command += f" {self.other_params}"
-        return subprocess.run(command, shell=True, cwd=cwd, check=True)
+            command += ["--prefix", prefix]
+        command += self.__split(self.other_params)
+        with nullcontext() if self.__tracer is None else self.__tracer.span("iqtree", "process", threads=threads, prefix=prefix):
+            result, usage = ProcessRegistry.get_instance().run_measured(command, "iqtree", cwd)
+        if self.__ledger is not None:
+            self.__ledger.record(usage)
+        return result
+
+    @staticmethod
+    def __split(text: str) -> list[str]:
+        """コマンドライン文字列を引数一覧に分割します。
+
+        Args:
+            text (str): 分割する文字列
+
+        Returns:
+            list[str]: 引数一覧
+        """
+        return shlex.split(text, posix=os.name != "nt")
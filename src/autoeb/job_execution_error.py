@@ -0,0 +1,19 @@
+class JobExecutionError(Exception):
+    """並列実行したジョブが失敗した場合を表すエラーのクラスです。
+    """
+
+    def __init__(self, failures: dict[object, BaseException]) -> None:
+        """JobExecutionErrorの新しいインスタンスを初期化します。
+
+        Args:
+            failures (dict[object, BaseException]): 失敗したジョブのキーと最後に発生した例外
+        """
+        self.__failures: dict[object, BaseException] = failures
+        keys: str = str.join(", ", [str(key) for key in failures])
+        super().__init__(f"{len(failures)} job(s) failed: {keys}")
+
+    @property
+    def failures(self) -> dict[object, BaseException]:
+        """失敗したジョブのキーと最後に発生した例外を取得します。
+        """
+        return self.__failures
@@ -0,0 +1,151 @@
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from threading import Lock
+from types import TracebackType
+from typing import Any, Callable, Generator, Generic, Hashable, TextIO, Tuple, TypeVar
+
+from .job_execution_error import JobExecutionError
+from .operation_cancelled_error import OperationCancelledError
+from .progress_monitor import ProgressMonitor
+
+TKey = TypeVar("TKey", bound=Hashable)
+TResult = TypeVar("TResult")
+
+
+class JobExecutor(Generic[TKey, TResult]):
+    """ジョブを同時実行数の上限付きで並列に実行し，結果を収集します。
+    """
+
+    def __init__(self, max_workers: int, retries: int = 0, logger: TextIO | None = None, progress: ProgressMonitor | None = None, name: str = "") -> None:
+        """JobExecutorの新しいインスタンスを初期化します。
+
+        Args:
+            max_workers (int): 同時に実行するジョブ数の上限
+            retries (int, optional): 失敗したジョブを再実行する回数. Defaults to 0.
+            logger (TextIO | None, optional): 失敗を報告する出力先. Defaults to None.
+            progress (ProgressMonitor | None, optional): ジョブの状態を集計するProgressMonitor. Defaults to None.
+            name (str, optional): ジョブを実行するスレッドの名前の接頭辞. Defaults to "".
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater or equal to 1")
+        if retries < 0:
+            raise ValueError("retries must be greater or equal to 0")
+        self.__retries: int = retries
+        self.__logger: TextIO | None = logger
+        self.__progress: ProgressMonitor | None = progress
+        self.__pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.__futures: dict[TKey, Future[TResult]] = dict[TKey, Future[TResult]]()
+        self.__lock = Lock()
+
+    def __enter__(self) -> "JobExecutor[TKey, TResult]":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.shutdown(cancel=exc_type is not None)
+
+    def submit(self, key: TKey, function: Callable[..., TResult], *args: Any) -> None:
+        """ジョブを追加します。
+
+        Args:
+            key (TKey): ジョブを識別するキー
+            function (Callable[..., TResult]): 実行する関数
+            args (Any): functionに渡す引数
+
+        Raises:
+            ValueError: keyが既に追加されている
+        """
+        with self.__lock:
+            if key in self.__futures:
+                raise ValueError(f"Job '{key}' has already been submitted")
+            # recorded before the job is started by the pool
+            if self.__progress is not None:
+                self.__progress.submit(key)
+            self.__futures[key] = self.__pool.submit(self.__run, key, function, args)
+
+    def wait(self) -> dict[TKey, TResult]:
+        """追加された全てのジョブの終了を待機し，結果を取得します。
+
+        Raises:
+            JobExecutionError: 再実行を含めて失敗したジョブが存在する
+
+        Returns:
+            dict[TKey, TResult]: ジョブのキーと結果の辞書（追加順）
+        """
+        with self.__lock:
+            futures = dict[TKey, Future[TResult]](self.__futures)
+        wait(futures.values())
+
+        result = dict[TKey, TResult]()
+        failures = dict[object, BaseException]()
+        for key, future in futures.items():
+            error: BaseException | None = future.exception()
+            if error is None:
+                result[key] = future.result()
+            else:
+                failures[key] = error
+        if len(failures) > 0:
+            raise JobExecutionError(failures)
+        return result
+
+    def as_completed(self) -> Generator[Tuple[TKey, TResult], None, None]:
+        """追加された全てのジョブについて，終了した順に結果を列挙します。
+
+        Raises:
+            JobExecutionError: 再実行を含めて失敗したジョブが存在する（全てのジョブの終了後に送出）
+
+        Yields:
+            Generator[Tuple[TKey, TResult], None, None]: 成功したジョブのキーと結果を列挙するGeneratorのインスタンス
+        """
+        with self.__lock:
+            keys = dict[Future[TResult], TKey]([(future, key) for key, future in self.__futures.items()])
+
+        failures = dict[object, BaseException]()
+        for future in as_completed(keys):
+            error: BaseException | None = future.exception()
+            if error is None:
+                yield (keys[future], future.result())
+            else:
+                failures[keys[future]] = error
+        if len(failures) > 0:
+            raise JobExecutionError(failures)
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """実行を終了します。
+
+        Args:
+            cancel (bool, optional): 開始していないジョブを取り消すかどうか. Defaults to False.
+        """
+        self.__pool.shutdown(wait=True, cancel_futures=cancel)
+
+    def __run(self, key: TKey, function: Callable[..., TResult], args: tuple[Any, ...]) -> TResult:
+        """ジョブを実行します。失敗した場合は上限回数まで再実行します。
+
+        Args:
+            key (TKey): ジョブのキー
+            function (Callable[..., TResult]): 実行する関数
+            args (tuple[Any, ...]): functionに渡す引数
+
+        Returns:
+            TResult: functionの戻り値
+        """
+        if self.__progress is not None:
+            self.__progress.start(key)
+        succeeded: bool = False
+        try:
+            attempt: int = 0
+            while True:
+                attempt += 1
+                try:
+                    result: TResult = function(*args)
+                    succeeded = True
+                    return result
+                except OperationCancelledError:
+                    # cancelled jobs are not retried
+                    raise
+                except Exception as e:
+                    if self.__logger is not None:
+                        print(f"  Job {key} failed (attempt {attempt} / {self.__retries + 1}): {e}", file=self.__logger)
+                    if attempt > self.__retries:
+                        raise
+        finally:
+            if self.__progress is not None:
+                self.__progress.finish(key, succeeded)
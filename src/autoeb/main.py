@@ -1,8 +1,14 @@
 from argparse import ArgumentError
-from sys import stderr
+import signal
+from sys import stderr, stdout
 
-from .cui import CommandArguments
+from .batch_manager import BatchManager
+from .cui import BatchArguments, CommandArguments, MergeArguments, WorkerArguments
+from .job_execution_error import JobExecutionError
+from .merge_manager import MergeManager
 from .operation_manager import OperationManager
+from .process_registry import ProcessRegistry
+from .queue_worker import QueueWorker
 
 
 def main(args: list[str]) -> int:
@@ -18,6 +24,33 @@ def main(args: list[str]) -> int:
         print("Arguments is not specified", file=stderr)
         CommandArguments.get_arg_parser().print_help()
         return 1
+
+    # running external programs are terminated by SIGINT and SIGTERM
+    registry: ProcessRegistry = ProcessRegistry.get_instance()
+    registry.install_signal_handlers()
+    try:
+        if args[0] == "worker":
+            return run_worker(args[1:])
+        if args[0] == "merge":
+            return run_merge(args[1:])
+        if args[0] == "batch":
+            return run_batch(args[1:])
+        return run_analysis(args)
+    except KeyboardInterrupt:
+        signal_number: int = registry.signal_number or signal.SIGINT
+        print(f"Cancelled by {signal.Signals(signal_number).name}", file=stderr)
+        return 128 + signal_number
+
+
+def run_analysis(args: list[str]) -> int:
+    """1つのデータセットを解析するメイン関数
+
+    Args:
+        args (list[str]): 引数
+
+    Returns:
+        int: Exit Code
+    """
     arguments = CommandArguments(args)
     manager = OperationManager(arguments)
 
@@ -26,5 +59,69 @@ def main(args: list[str]) -> int:
     except ArgumentError as e:
         print(e.message, file=stderr)
         return 1
+    except JobExecutionError as e:
+        print(e, file=stderr)
+        return 1
+
+    return 0
+
+
+def run_worker(args: list[str]) -> int:
+    """ジョブキューのジョブを実行するワーカーのメイン関数
+
+    Args:
+        args (list[str]): 引数（サブコマンド名を除く）
+
+    Returns:
+        int: Exit Code
+    """
+    arguments = WorkerArguments(args)
+    try:
+        worker = QueueWorker(arguments.queue_path, arguments.lease, arguments.idle_timeout, arguments.scratch_dir, stdout, arguments.jobs)
+        worker.run()
+    except ArgumentError as e:
+        print(e.message, file=stderr)
+        return 1
+
+    return 0
+
+
+def run_merge(args: list[str]) -> int:
+    """出力先を分けて解析した結果を統合するメイン関数
+
+    Args:
+        args (list[str]): 引数（サブコマンド名を除く）
+
+    Returns:
+        int: Exit Code
+    """
+    manager = MergeManager(MergeArguments(args))
+    try:
+        manager.execute()
+    except ArgumentError as e:
+        print(e.message, file=stderr)
+        return 1
+
+    return 0
+
+
+def run_batch(args: list[str]) -> int:
+    """複数のデータセットを1つのプロセスで解析するメイン関数
+
+    Args:
+        args (list[str]): 引数（サブコマンド名を除く）
+
+    Returns:
+        int: Exit Code
+    """
+    manager = BatchManager(BatchArguments(args))
+    try:
+        manager.execute()
+    except ArgumentError as e:
+        print(e.message, file=stderr)
+        return 1
+    except JobExecutionError as e:
+        print(e, file=stderr)
+        return 1
 
     return 0
@@ -0,0 +1,130 @@
+from argparse import ArgumentError
+from datetime import datetime
+from distutils.file_util import copy_file
+import os
+from sys import stdout
+from typing import Any, TextIO, Tuple
+
+from .catpv_result import CatpvResult
+from .consts import *
+from .cui import CommandArguments, MergeArguments
+from .nnigen import read_tree, TopologyIndex, Tree
+from .nnigen.io import treetype
+from .operation_manager import OperationManager
+from .output_formatter import OutputFormatter
+from .result_table import ResultTable
+from .summary import SummaryInfo
+
+
+class MergeManager:
+    """出力先を分けて解析した結果を，再計算せずに1つの結果に統合します。
+    """
+
+    def __init__(self, args: MergeArguments) -> None:
+        """MergeManagerの新しいインスタンスを初期化します。
+
+        Args:
+            args (MergeArguments): 引数
+        """
+        self.__args: MergeArguments = args
+        self.__logger: TextIO = stdout
+
+    def execute(self) -> None:
+        """処理を実行します。
+
+        Raises:
+            ArgumentError: 解析の条件が一致しない，または同じ二分岐の結果が異なる
+        """
+        start_time: datetime = datetime.now()
+        shard_dirs: list[str] = self.__args.shard_dirs
+        metadata, rows = self.__load_results(shard_dirs)
+
+        # the same inputs are confirmed by the hashes of the files in the metadata
+        for filename in [INFILE_SEQ, INFILE_TREE, OUTFILE_INDEX_TREE]:
+            copy_file(os.path.join(shard_dirs[0], filename), self.__args.get_out_file_path(filename))
+        tree: Tree = read_tree(self.__args.get_out_file_path(INFILE_TREE), treetype.newick)
+        leaf_names: list[str] = TopologyIndex(tree).leaf_names
+        bipartition_count: int = sum([1 for _ in tree.iterate_all_branches()])
+        missing: list[int] = [i for i in range(bipartition_count) if not i in rows]
+        if len(missing) > 0:
+            print(f"Results of {len(missing)} bipartitions are not found (not annotated): {str.join(',', [str(i) for i in missing])}", file=self.__logger)
+
+        out_format: str = self.__args.out_format or metadata["out_format"]
+        catpv_results: dict[int, CatpvResult] = dict[int, CatpvResult]([(i, ResultTable.to_catpv(row)) for i, row in rows.items()])
+        screened: dict[int, bool] = dict[int, bool]([(i, bool(row["supported"])) for i, row in rows.items() if row["method"] == "prescreen"])
+        sig_level: float = float(metadata["sig_level"])
+        valid_nni: list[Tuple[float, Tree]] = OperationManager.map_results(tree, catpv_results, OutputFormatter(out_format), sig_level, screened)
+        tree.export(self.__args.get_out_file_path(OUTFILE_TREE), treetype.newick)
+
+        # rows of the previous merge are not kept
+        results_path: str = self.__args.get_out_file_path(OUTFILE_RESULTS)
+        if os.path.isfile(results_path):
+            os.remove(results_path)
+        with ResultTable(results_path) as results:
+            results.set_leaves(leaf_names)
+            results.set_metadata(metadata | {"out_format": out_format})
+            for i, row in rows.items():
+                results.write(
+                    i, row["split"], row["fingerprint"], row["method"], row["replicates"], bool(row["supported"]),
+                    (row["delta_lnl_nni1"], row["delta_lnl_nni2"]), catpv_results[i], row["elapsed"])
+
+        # the summary is written from the arguments the runs were given
+        summary_args: list[str] = [
+            "-s", self.__args.get_out_file_path(INFILE_SEQ),
+            "-t", self.__args.get_out_file_path(INFILE_TREE),
+            "-m", metadata["model"],
+            "-o", self.__args.out_dir,
+            "-f", out_format,
+            "-b", metadata["rell_boot"],
+            "--sig-level", metadata["sig_level"],
+            "--seed", "-1" if metadata["seed_generated"] == "True" else metadata["seed"]]
+        if metadata["adaptive_bootstrap"] != "":
+            summary_args += ["--adaptive-bootstrap", metadata["adaptive_bootstrap"]]
+        replicates: dict[int, int] | None = None
+        if metadata["adaptive_bootstrap"] != "":
+            replicates = dict[int, int]([(i, row["replicates"]) for i, row in rows.items() if row["replicates"] is not None])
+        summary = SummaryInfo(
+            valid_nni,
+            CommandArguments(summary_args),
+            datetime.now() - start_time,
+            int(metadata["seed"]),
+            replicates,
+            screened if metadata["prescreen"] == "True" else None)
+        summary.write(self.__args.get_out_file_path(OUTFILE_SUMMARY))
+        print(f"Results of {len(rows)} / {bipartition_count} bipartitions are merged into '{self.__args.out_dir}'", file=self.__logger)
+
+    def __load_results(self, shard_dirs: list[str]) -> Tuple[dict[str, str], dict[int, dict[str, Any]]]:
+        """各出力先の結果の表を読み込み，解析の条件が一致することを確認します。
+
+        Args:
+            shard_dirs (list[str]): 統合する出力先ディレクトリの一覧
+
+        Raises:
+            ArgumentError: 解析の条件が一致しない，または同じ二分岐の結果が異なる
+
+        Returns:
+            Tuple[dict[str, str], dict[int, dict[str, Any]]]: 解析の条件と，二分岐のインデックスごとの結果の行
+        """
+        metadata: dict[str, str] | None = None
+        rows: dict[int, dict[str, Any]] = dict[int, dict[str, Any]]()
+        for shard_dir in shard_dirs:
+            with ResultTable(os.path.join(shard_dir, OUTFILE_RESULTS)) as table:
+                current: dict[str, str] = table.get_metadata()
+                loaded: dict[int, dict[str, Any]] = table.read()
+            if len(current) == 0:
+                raise ArgumentError(None, f"Conditions of the analysis are not recorded in '{shard_dir}'")
+            if metadata is None:
+                metadata = current
+            else:
+                # the branch name format does not affect the results
+                different: list[str] = [key for key in sorted(set(metadata) | set(current)) if key != "out_format" and metadata.get(key) != current.get(key)]
+                if len(different) > 0:
+                    raise ArgumentError(None, f"'{shard_dir}' was analyzed with different {str.join(', ', different)} from '{shard_dirs[0]}'")
+
+            for i, row in loaded.items():
+                if i in rows and rows[i]["fingerprint"] != row["fingerprint"]:
+                    raise ArgumentError(None, f"Results of bipartition {i} are different in the merged folders")
+                rows.setdefault(i, row)
+            print(f"Results of {len(loaded)} bipartitions are loaded from '{shard_dir}'", file=self.__logger)
+        assert metadata is not None
+        return (metadata, dict(sorted(rows.items())))
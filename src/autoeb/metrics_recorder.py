@@ -0,0 +1,291 @@
+from contextlib import contextmanager
+import json
+import os
+from threading import Lock
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Generator, Hashable, TextIO, Tuple
+
+from .operation_cancelled_error import OperationCancelledError
+from .process_usage import ProcessUsage
+from .resource_ledger import ResourceLedger
+
+if TYPE_CHECKING:
+    from .progress_monitor import ProgressMonitor
+
+
+class MetricsRecorder:
+    """処理の段階とジョブの状態の変化をJSON Lines形式のイベントとして記録し，Prometheusのtextfile形式の集計値を出力します。
+    """
+
+    __TEXTFILE_INTERVAL: float = 5.0
+
+    def __init__(self, events_path: str | None, textfile_path: str | None, labels: dict[str, str] | None = None, ledger: ResourceLedger | None = None) -> None:
+        """MetricsRecorderの新しいインスタンスを初期化します。
+
+        Args:
+            events_path (str | None): イベントを追記するファイルのパス。Noneで記録しない
+            textfile_path (str | None): Prometheusのtextfile形式で集計値を出力するファイルのパス。Noneで出力しない
+            labels (dict[str, str] | None, optional): 全ての集計値に付加するラベル. Defaults to None.
+            ledger (ResourceLedger | None, optional): プログラム別の資源の使用量を集計するResourceLedger. Defaults to None.
+        """
+        self.__textfile_path: str | None = textfile_path
+        self.__labels: dict[str, str] = dict[str, str]() if labels is None else dict[str, str](labels)
+        self.__ledger: ResourceLedger | None = ledger
+        self.__lock = Lock()
+        self.__write_lock = Lock()
+        self.__events_io: TextIO | None = None if events_path is None else open(events_path, "at")
+        self.__start: float = time.time()
+        self.__last_event: float = self.__start
+        self.__last_write: float = 0.0
+        self.__stages: dict[str, Tuple[float, float | None, str]] = dict[str, Tuple[float, float | None, str]]()
+        self.__monitors: dict[str, "ProgressMonitor"] = dict[str, "ProgressMonitor"]()
+        self.__io_bytes: dict[str, int] = dict[str, int]()
+        self.__jobs: dict[Tuple[str, Hashable], dict[str, float]] = dict[Tuple[str, Hashable], dict[str, float]]()
+
+    def __enter__(self) -> "MetricsRecorder":
+        self.__emit("run_start", {"pid": os.getpid()})
+        self.__write_textfile(True)
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.__emit("run_end", {"status": self.__get_status(exc_type), "seconds": time.time() - self.__start})
+        self.__write_textfile(True)
+        self.close()
+
+    def close(self) -> None:
+        """イベントのファイルを閉じます。
+        """
+        with self.__lock:
+            if self.__events_io is not None:
+                self.__events_io.close()
+                self.__events_io = None
+
+    def start_stage(self, stage: str, monitor: "ProgressMonitor | None" = None) -> None:
+        """処理の段階の開始を記録します。
+
+        Args:
+            stage (str): 段階の名前
+            monitor (ProgressMonitor | None, optional): 段階のジョブの状態を集計するProgressMonitor. Defaults to None.
+        """
+        with self.__lock:
+            self.__stages[stage] = (time.time(), None, "running")
+            if monitor is not None:
+                self.__monitors[stage] = monitor
+        self.__emit("stage_start", {"stage": stage})
+        self.__write_textfile(True)
+
+    def end_stage(self, stage: str, exc_type: type[BaseException] | None = None) -> None:
+        """処理の段階の終了を記録します。
+
+        Args:
+            stage (str): 段階の名前
+            exc_type (type[BaseException] | None, optional): 段階を中断した例外の型。Noneで正常終了. Defaults to None.
+        """
+        status: str = self.__get_status(exc_type)
+        end: float = time.time()
+        with self.__lock:
+            start: float = self.__stages[stage][0] if stage in self.__stages else end
+            self.__stages[stage] = (start, end, status)
+            io_bytes: int = self.__io_bytes.get(stage, 0)
+        self.__emit("stage_end", {"stage": stage, "status": status, "seconds": end - start, "io_bytes": io_bytes})
+        self.__write_textfile(True)
+
+    @contextmanager
+    def stage(self, stage: str) -> Generator[None, None, None]:
+        """処理の段階の開始と終了を記録するコンテキストマネージャーを取得します。
+
+        Args:
+            stage (str): 段階の名前
+
+        Yields:
+            Generator[None, None, None]: 段階の開始と終了を記録するコンテキストマネージャー
+        """
+        self.start_stage(stage)
+        try:
+            yield
+        except BaseException as e:
+            self.end_stage(stage, type(e))
+            raise
+        self.end_stage(stage)
+
+    def record_job(self, stage: str, key: Hashable, state: str, **fields: Any) -> None:
+        """ジョブの状態の変化を記録します。終了したジョブには待機時間と実行時間が付加されます。
+
+        Args:
+            stage (str): 段階の名前
+            key (Hashable): ジョブのキー
+            state (str): ジョブの状態（queued, started, doneまたはfailed）
+            fields (Any): イベントに付加する値
+        """
+        now: float = time.time()
+        with self.__lock:
+            times: dict[str, float] = self.__jobs.setdefault((stage, key), dict[str, float]())
+            times[state] = now
+            values: dict[str, Any] = {"stage": stage, "key": key if isinstance(key, (int, str)) else str(key)}
+            if state == "started" and "queued" in times:
+                values["queue_seconds"] = now - times["queued"]
+            if state in ("done", "failed"):
+                del self.__jobs[(stage, key)]
+                values["status"] = state
+                values["queue_seconds"] = times.get("started", now) - times.get("queued", times.get("started", now))
+                values["run_seconds"] = now - times.get("started", now)
+                values["io_bytes"] = int(times.get("io_bytes", 0))
+                for name in ["cpu_user_seconds", "cpu_system_seconds", "max_rss_bytes"]:
+                    if name in times:
+                        values[name] = times[name]
+        values.update(fields)
+        self.__emit("job_finished" if state in ("done", "failed") else f"job_{state}", values)
+        self.__write_textfile(False)
+
+    def record_skip(self, stage: str, count: int) -> None:
+        """実行せずに完了したジョブ（再開・事前判定）を記録します。
+
+        Args:
+            stage (str): 段階の名前
+            count (int): ジョブの数
+        """
+        self.__emit("job_skipped", {"stage": stage, "count": count})
+        self.__write_textfile(False)
+
+    def add_io(self, stage: str, key: Hashable, size: int) -> None:
+        """ジョブが読み書きしたファイルの大きさを加算します。ジョブの終了のイベントに付加されます。
+
+        Args:
+            stage (str): 段階の名前
+            key (Hashable): ジョブのキー
+            size (int): ファイルの大きさ（バイト）
+        """
+        with self.__lock:
+            self.__io_bytes[stage] = self.__io_bytes.get(stage, 0) + size
+            times: dict[str, float] = self.__jobs.setdefault((stage, key), dict[str, float]())
+            times["io_bytes"] = times.get("io_bytes", 0) + size
+
+    def add_usage(self, stage: str, key: Hashable, usage: ProcessUsage | None) -> None:
+        """ジョブが実行したプログラムの資源の使用量を設定します。ジョブの終了のイベントに付加されます。
+
+        Args:
+            stage (str): 段階の名前
+            key (Hashable): ジョブのキー
+            usage (ProcessUsage | None): 資源の使用量。プログラムを実行していない場合はNone
+        """
+        if usage is None:
+            return
+        with self.__lock:
+            times: dict[str, float] = self.__jobs.setdefault((stage, key), dict[str, float]())
+            times["cpu_user_seconds"] = usage.user_time
+            times["cpu_system_seconds"] = usage.system_time
+            times["max_rss_bytes"] = usage.max_rss
+
+    def format_textfile(self) -> str:
+        """Prometheusのtextfile形式の集計値を取得します。
+
+        Returns:
+            str: textfile形式の集計値
+        """
+        now: float = time.time()
+        lines: list[str] = []
+
+        def add(name: str, kind: str, help: str, samples: list[Tuple[dict[str, str], float]]) -> None:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{self.__format_labels(labels)} {float(value)!r}")
+
+        with self.__lock:
+            stages: dict[str, Tuple[float, float | None, str]] = dict(self.__stages)
+            monitors: dict[str, "ProgressMonitor"] = dict(self.__monitors)
+            io_bytes: dict[str, int] = dict(self.__io_bytes)
+            last_event: float = self.__last_event
+        add("autoeb_start_timestamp_seconds", "gauge", "Time when the run started", [({}, self.__start)])
+        add("autoeb_last_event_timestamp_seconds", "gauge", "Time of the last recorded event", [({}, last_event)])
+        add("autoeb_stage_running", "gauge", "Whether the stage is running", [({"stage": s}, 1 if v[1] is None else 0) for s, v in stages.items()])
+        add("autoeb_stage_duration_seconds", "gauge", "Elapsed time of the stage", [({"stage": s}, (now if v[1] is None else v[1]) - v[0]) for s, v in stages.items()])
+        add("autoeb_jobs_total", "gauge", "Number of jobs of the stage", [({"stage": s}, m.total) for s, m in monitors.items()])
+        job_samples: list[Tuple[dict[str, str], float]] = []
+        for stage, monitor in monitors.items():
+            for state, count in zip(["queued", "running", "done", "failed"], monitor.counts):
+                job_samples.append(({"stage": stage, "state": state}, count))
+        add("autoeb_jobs", "gauge", "Number of jobs of the stage in each state", job_samples)
+        add("autoeb_throughput_jobs_per_second", "gauge", "Jobs finished per second since the first job started", [({"stage": s}, m.throughput) for s, m in monitors.items()])
+        add("autoeb_eta_seconds", "gauge", "Estimated time until all jobs of the stage are finished", [({"stage": s}, eta) for s, m in monitors.items() if (eta := m.eta) is not None])
+        add("autoeb_io_bytes_total", "counter", "Size of files written and read by the jobs of the stage", [({"stage": s}, v) for s, v in io_bytes.items()])
+        if self.__ledger is not None:
+            programs: dict[str, ProcessUsage] = self.__ledger.programs
+            add("autoeb_processes_total", "counter", "Number of finished processes of the external program", [({"program": p}, u.processes) for p, u in programs.items()])
+            cpu_samples: list[Tuple[dict[str, str], float]] = []
+            for program, usage in programs.items():
+                cpu_samples += [({"program": program, "mode": "user"}, usage.user_time), ({"program": program, "mode": "system"}, usage.system_time)]
+            add("autoeb_process_cpu_seconds_total", "counter", "CPU time of the external program", cpu_samples)
+            add("autoeb_process_wall_seconds_total", "counter", "Elapsed time of the external program", [({"program": p}, u.wall_time) for p, u in programs.items()])
+            add("autoeb_process_max_rss_bytes", "gauge", "Maximum resident set size of the processes of the external program", [({"program": p}, u.max_rss) for p, u in programs.items()])
+        return str.join("\n", lines) + "\n"
+
+    def __format_labels(self, labels: dict[str, str]) -> str:
+        """ラベルをtextfile形式の文字列に変換します。
+
+        Args:
+            labels (dict[str, str]): 集計値ごとのラベル
+
+        Returns:
+            str: textfile形式のラベル
+        """
+        merged: dict[str, str] = dict(self.__labels, **labels)
+        if len(merged) == 0:
+            return ""
+        escaped: list[str] = []
+        for name, value in merged.items():
+            value = value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+            escaped.append(f"{name}=\"{value}\"")
+        return "{" + str.join(",", escaped) + "}"
+
+    def __emit(self, event: str, values: dict[str, Any]) -> None:
+        """イベントを1行のJSONとして追記します。
+
+        Args:
+            event (str): イベントの名前
+            values (dict[str, Any]): イベントの値
+        """
+        now: float = time.time()
+        with self.__lock:
+            self.__last_event = now
+            if self.__events_io is not None:
+                self.__events_io.write(json.dumps(dict({"time": round(now, 6), "event": event}, **values)) + "\n")
+                self.__events_io.flush()
+
+    def __write_textfile(self, force: bool) -> None:
+        """textfile形式の集計値を一時ファイルを介して置き換えます。ジョブの状態の変化では一定の間隔でのみ書き込みます。
+
+        Args:
+            force (bool): 間隔によらず書き込むかどうか
+        """
+        if self.__textfile_path is None:
+            return
+        with self.__lock:
+            now: float = time.time()
+            if not force and now - self.__last_write < self.__TEXTFILE_INTERVAL:
+                return
+            self.__last_write = now
+        with self.__write_lock:
+            content: str = self.format_textfile()
+            # the collector never reads a partially written file
+            tmp_path: str = f"{self.__textfile_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wt") as textfile_io:
+                textfile_io.write(content)
+            os.replace(tmp_path, self.__textfile_path)
+
+    @staticmethod
+    def __get_status(exc_type: type[BaseException] | None) -> str:
+        """例外の型から終了状態を取得します。
+
+        Args:
+            exc_type (type[BaseException] | None): 処理を中断した例外の型
+
+        Returns:
+            str: finished, failedまたはcancelled
+        """
+        if exc_type is None:
+            return "finished"
+        if issubclass(exc_type, (KeyboardInterrupt, OperationCancelledError)):
+            return "cancelled"
+        return "failed"
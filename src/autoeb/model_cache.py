@@ -0,0 +1,101 @@
+import hashlib
+import os
+
+from .json_helper import deserialize, serialize
+from .model_parameters import ModelParameters
+
+
+class ModelCache:
+    """推定済みのモデルパラメータを保存するキャッシュを表します。
+    キーは配列，モデル，ツリー，IQ-TREEのその他引数から計算されるハッシュ値です。
+    """
+
+    def __init__(self, directory: str) -> None:
+        """ModelCacheの新しいインスタンスを初期化します。
+
+        Args:
+            directory (str): キャッシュを保存するディレクトリ（存在しない場合は作成される）
+
+        Raises:
+            OSError: ディレクトリを作成できない
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.__directory: str = directory
+
+    @property
+    def directory(self) -> str:
+        """キャッシュを保存するディレクトリを取得します。
+        """
+        return self.__directory
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """ファイルの内容のハッシュ値を計算します。
+
+        Args:
+            path (str): ファイルのパス
+
+        Returns:
+            str: SHA-256ハッシュ値
+        """
+        with open(path, "rb") as io:
+            return hashlib.file_digest(io, "sha256").hexdigest()
+
+    @classmethod
+    def create_key(cls, sequence_path: str, model: str, tree_path: str, other_params: str) -> str:
+        """キャッシュのキーを生成します。
+
+        Args:
+            sequence_path (str): 配列ファイルのパス
+            model (str): 進化モデル
+            tree_path (str): モデルフィッティングに用いるツリーのパス
+            other_params (str): IQ-TREEのその他引数
+
+        Returns:
+            str: キャッシュのキー
+        """
+        source: str = str.join("\n", [cls.hash_file(sequence_path), model, cls.hash_file(tree_path), other_params])
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def load(self, key: str) -> ModelParameters | None:
+        """キャッシュからモデルパラメータを読み込みます。
+
+        Args:
+            key (str): キャッシュのキー
+
+        Returns:
+            ModelParameters | None: 読み込んだモデルパラメータ。キャッシュが存在しない場合はNone
+        """
+        path: str = self.__get_path(key)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rt") as io:
+            return deserialize(io.read(-1), ModelParameters)
+
+    def save(self, key: str, parameters: ModelParameters) -> None:
+        """モデルパラメータをキャッシュに保存します。
+
+        Args:
+            key (str): キャッシュのキー
+            parameters (ModelParameters): 保存するモデルパラメータ
+
+        Raises:
+            OSError: キャッシュファイルを書き込めない
+        """
+        path: str = self.__get_path(key)
+        # write to a temporary file and rename it so that other processes never read a partial file
+        tmp_path: str = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wt") as io:
+            io.write(serialize(parameters))
+        os.replace(tmp_path, path)
+
+    def __get_path(self, key: str) -> str:
+        """キャッシュファイルのパスを取得します。
+
+        Args:
+            key (str): キャッシュのキー
+
+        Returns:
+            str: キャッシュファイルのパス
+        """
+        return os.path.join(self.__directory, f"{key}.json")
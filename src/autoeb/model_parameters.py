@@ -0,0 +1,202 @@
+from io import TextIOBase
+import regex
+from typing import overload
+
+
+class ModelParameters:
+    """IQ-TREEで推定された置換モデルのパラメータを表します。
+    """
+
+    __DNA_RATE_PAIRS: list[str] = ["A-C", "A-G", "A-T", "C-G", "C-T", "G-T"]
+
+    def __init__(self) -> None:
+        """ModelParametersの新しいインスタンスを初期化します。
+        """
+        self.__model: str = ""
+        self.__rates: dict[str, float] = dict[str, float]()
+        self.__frequencies: list[float] = []
+        self.__equal_frequencies: bool = False
+        self.__invariable: float | None = None
+        self.__gamma_alpha: float | None = None
+        self.__free_rates: list[list[float]] = []
+        self.__mixture: bool = False
+
+    @property
+    def model(self) -> str:
+        """推定に用いられた置換モデルを取得します。
+        """
+        return self.__model
+
+    @property
+    def rates(self) -> dict[str, float]:
+        """置換速度パラメータを取得します。
+        """
+        return self.__rates
+
+    @property
+    def frequencies(self) -> list[float]:
+        """状態頻度を取得します。
+        """
+        return self.__frequencies
+
+    @property
+    def invariable(self) -> float | None:
+        """不変サイトの割合を取得します。
+        """
+        return self.__invariable
+
+    @property
+    def gamma_alpha(self) -> float | None:
+        """ガンマ分布の形状パラメータを取得します。
+        """
+        return self.__gamma_alpha
+
+    @property
+    def free_rates(self) -> list[list[float]]:
+        """FreeRateモデルの各カテゴリの割合と速度を取得します。
+        """
+        return self.__free_rates
+
+    @property
+    def is_mixture(self) -> bool:
+        """混合モデルかどうかを取得します。混合モデルの重みは固定されません。
+        """
+        return self.__mixture
+
+    @overload
+    @classmethod
+    def load(cls, source: str) -> "ModelParameters":
+        """IQ-TREEのレポートファイル（.iqtree）を読み込みます。
+
+        Args:
+            source (str): 読み込むファイルのパス
+
+        Raises:
+            ValueError: 置換モデルが記載されていない
+
+        Returns:
+            ModelParameters: sourceを読み込んで生成されたModelParametersの新しいインスタンス
+        """
+        ...
+
+    @overload
+    @classmethod
+    def load(cls, source: TextIOBase) -> "ModelParameters":
+        """IQ-TREEのレポートファイル（.iqtree）を読み込みます。
+
+        Args:
+            source (TextIOBase): 読み込むストリームオブジェクト
+
+        Raises:
+            ValueError: 置換モデルが記載されていない
+
+        Returns:
+            ModelParameters: sourceを読み込んで生成されたModelParametersの新しいインスタンス
+        """
+        ...
+
+    @classmethod
+    def load(cls, source: str | TextIOBase) -> "ModelParameters":
+        if isinstance(source, str):
+            with open(source, "rt") as io:
+                return cls.load(io)
+
+        result = cls()
+        section: str = ""
+        number: str = r"([-+]?[\d.]+(?:[eE][-+]?\d+)?)"
+        for line in source:
+            line = line.rstrip()
+            if len(line) > 0 and not line[0].isspace():
+                # new section starts at non-indented line
+                section = ""
+                if line.startswith("Model of substitution:") and result.__model == "":
+                    result.__model = line.split(':', 1)[1].strip()
+                elif line.startswith("Mixture model of substitution:"):
+                    # reports of mixture models have no "Model of substitution:" line
+                    result.__mixture = True
+                    if result.__model == "":
+                        result.__model = line.split(':', 1)[1].strip()
+                elif line.startswith("Rate parameter R:"):
+                    section = "rates"
+                elif line.startswith("State frequencies:"):
+                    section = "frequencies"
+                    result.__equal_frequencies = "equal" in line
+                elif line.startswith("Proportion of invariable sites:"):
+                    result.__invariable = float(line.split(':', 1)[1])
+                elif line.startswith("Gamma shape alpha:"):
+                    result.__gamma_alpha = float(line.split(':', 1)[1])
+                elif line.startswith("Site proportion and rates:"):
+                    result.__free_rates = [[float(w), float(r)] for w, r in regex.findall(rf"\({number},{number}\)", line)]
+                continue
+            if section == "rates":
+                match = regex.match(rf"^\s+([A-Z]-[A-Z]):\s+{number}$", line)
+                if match is not None:
+                    result.__rates[match.group(1)] = float(match.group(2))
+            elif section == "frequencies":
+                result.__frequencies += [float(f) for f in regex.findall(rf"pi\(\w+\)\s*=\s*{number}", line)]
+
+        if result.__model == "":
+            raise ValueError("Substitution model is not found in the report")
+        return result
+
+    def to_fixed_model(self) -> str:
+        """推定されたパラメータを固定した置換モデルの文字列を取得します。混合モデルは速度の不均一性のみ固定され，成分の重みとパラメータは推定されます。
+
+        Returns:
+            str: IQ-TREEの-mオプションに与えるモデル文字列
+        """
+        tokens: list[str] = self.__split_model(self.model)
+        dna: bool = not self.is_mixture and all([pair in self.rates for pair in self.__DNA_RATE_PAIRS]) and (len(self.frequencies) == 4 or self.__equal_frequencies)
+        if dna:
+            # any reversible DNA model is expressed by GTR with fixed values
+            g_t: float = self.rates["G-T"]
+            tokens[0] = "GTR{" + str.join(',', [self.__format(self.rates[pair] / g_t) for pair in self.__DNA_RATE_PAIRS[:-1]]) + "}"
+            frequencies: list[float] = self.frequencies if len(self.frequencies) == 4 else [0.25] * 4
+            tokens = [t for t in tokens if regex.match(r"^F[A-Z]?$", t) is None]
+            tokens.insert(1, "F{" + str.join(',', [self.__format(f) for f in frequencies]) + "}")
+
+        for i in range(1, len(tokens)):
+            if tokens[i] == "I" and self.invariable is not None:
+                tokens[i] = "I{" + self.__format(self.invariable) + "}"
+            elif regex.match(r"^G\d*$", tokens[i]) and self.gamma_alpha is not None:
+                tokens[i] += "{" + self.__format(self.gamma_alpha) + "}"
+            elif regex.match(r"^R\d*$", tokens[i]) and len(self.free_rates) > 0:
+                tokens[i] += "{" + str.join(',', [self.__format(v) for pair in self.free_rates for v in pair]) + "}"
+        return str.join('+', tokens)
+
+    @staticmethod
+    def __split_model(model: str) -> list[str]:
+        """モデル文字列を括弧の外側の'+'で分割します。
+
+        Args:
+            model (str): モデル文字列
+
+        Returns:
+            list[str]: 分割されたモデル文字列
+        """
+        result: list[str] = []
+        level: int = 0
+        start: int = 0
+        for index in range(len(model)):
+            char: str = model[index]
+            if char in "{(":
+                level += 1
+            elif char in "})":
+                level -= 1
+            elif char == '+' and level == 0:
+                result.append(model[start:index])
+                start = index + 1
+        result.append(model[start:])
+        return result
+
+    @staticmethod
+    def __format(value: float) -> str:
+        """パラメータの値を文字列に変換します。
+
+        Args:
+            value (float): 値
+
+        Returns:
+            str: 変換後の文字列
+        """
+        return format(value, ".6g")
@@ -4,6 +4,8 @@ from .not_supported_error import NotSupportedError
 from .tree_format_error import TreeFormatError
 from .node import Node
 from .tree import Tree
+from .topology_index import TopologyIndex
+from .tree_counters import TreeCounters
 if TYPE_CHECKING:
     from .io.iohandler import TreeIOHandler
     from typing import TextIO
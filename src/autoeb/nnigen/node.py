@@ -1,6 +1,8 @@
 from copy import deepcopy
 from typing import Generator, Tuple
 
+from .tree_counters import TreeCounters
+
 
 class Node:
     """系統樹の枝を表すクラスです。
@@ -194,14 +196,22 @@ class Node:
             Generator[Node, None, None]: 自身を含む全ノードを列挙するGeneratorのインスタンス
         """
 
-        # 自身を最初にリターン
-        yield self
-        for child in self.get_next_nodes():
-            # 次に子要素をリターン
-            yield child
-            # 孫要素以下を列挙
-            for descendant in Node.__iterate_next(child, self):
-                yield descendant
+        # counted once when the generator is finished or closed
+        visited: int = 0
+        try:
+            # 自身を最初にリターン
+            visited += 1
+            yield self
+            for child in self.get_next_nodes():
+                # 次に子要素をリターン
+                visited += 1
+                yield child
+                # 孫要素以下を列挙
+                for descendant in Node.__iterate_next(child, self):
+                    visited += 1
+                    yield descendant
+        finally:
+            TreeCounters.add_visited(visited)
 
     def find_root(self) -> "Node":
         """ルートとなるNodeのインスタンスを取得します。
@@ -264,6 +274,7 @@ class Node:
         # -next1-|         +-next3
         #        +-result3-|
         #                  +-next2
+        TreeCounters.add_copies(3)
         result1 = deepcopy(self)
 
         result2 = deepcopy(self)
@@ -0,0 +1,123 @@
+import hashlib
+from typing import Tuple
+
+from .node import Node
+from .tree import Tree
+
+
+class TopologyIndex:
+    """系統樹の各二分岐を葉集合のビット列として索引化します。
+    ビット列は葉の名前の昇順に割り当てたビットの論理和です。
+    """
+
+    def __init__(self, tree: Tree) -> None:
+        """TopologyIndexの新しいインスタンスを初期化します。
+
+        Args:
+            tree (Tree): 索引化するTreeのインスタンス
+        """
+        root: Node = tree.root
+        top_nodes: list[Node] = [n for n in [root.next1, root, root.next2] if n is not None]
+
+        # collect nodes in pre-order without recursion so that deep trees can be processed
+        nodes: list[Node] = []
+        stack: list[Node] = list(reversed(top_nodes))
+        while len(stack) > 0:
+            current: Node = stack.pop()
+            nodes.append(current)
+            if not current.is_leaf:
+                stack.append(current.next4)  # type:ignore
+                stack.append(current.next3)  # type:ignore
+
+        self.__leaf_names: list[str] = sorted([n.name for n in nodes if n.is_leaf])
+        leaf_bits: dict[str, int] = dict[str, int]([(self.__leaf_names[i], 1 << i) for i in range(len(self.__leaf_names))])
+        self.__all_bits: int = (1 << len(self.__leaf_names)) - 1
+
+        # leaves under each node (children are next3 and next4)
+        bits: dict[int, int] = dict[int, int]()
+        for current in reversed(nodes):
+            if current.is_leaf:
+                bits[id(current)] = leaf_bits[current.name]
+            else:
+                bits[id(current)] = bits[id(current.next3)] | bits[id(current.next4)]
+
+        self.__branch_splits: list[int] = []
+        self.__nni_splits: list[Tuple[int, int]] = []
+        topology_hash: int = 0
+        for branch in tree.iterate_all_branches():
+            # around the branch:  next3 (A), next4 (B), next2 (C) and the others (D)
+            a: int = bits[id(branch.next3)]
+            b: int = bits[id(branch.next4)]
+            c: int = bits[id(branch.next2)]
+            self.__branch_splits.append(a | b)
+            # 1st NNI exchanges next2 and next3, 2nd NNI exchanges next2 and next4
+            self.__nni_splits.append((c | b, a | c))
+            topology_hash ^= self.__hash_split(a | b)
+        self.__topology_hash: int = topology_hash
+
+    @property
+    def leaf_names(self) -> list[str]:
+        """ビットに対応する葉の名前の一覧（昇順）を取得します。
+        """
+        return self.__leaf_names
+
+    @property
+    def branch_splits(self) -> list[int]:
+        """各二分岐で分割される葉集合のビット列を取得します。順序はTree.iterate_all_branches()と一致します。
+        """
+        return self.__branch_splits
+
+    @property
+    def topology_hash(self) -> str:
+        """系統樹のトポロジーのハッシュ値を取得します。枝長，ラベル，ルートの位置に依存しません。
+        """
+        return self.__format_hash(self.__topology_hash)
+
+    def get_nni_topology_hashes(self, branch_index: int) -> Tuple[str, str]:
+        """二分岐のNNI樹形2つのトポロジーのハッシュ値を取得します。
+
+        Args:
+            branch_index (int): 二分岐のインデックス
+
+        Returns:
+            Tuple[str, str]: Node.get_nni()の2つ目と3つ目の樹形のハッシュ値
+        """
+        base: int = self.__topology_hash ^ self.__hash_split(self.__branch_splits[branch_index])
+        nni_1, nni_2 = self.__nni_splits[branch_index]
+        return (self.__format_hash(base ^ self.__hash_split(nni_1)), self.__format_hash(base ^ self.__hash_split(nni_2)))
+
+    def normalize(self, split: int) -> int:
+        """二分岐のビット列を，名前が最小の葉を含まない側に正規化します。
+
+        Args:
+            split (int): 二分岐のビット列
+
+        Returns:
+            int: 正規化されたビット列
+        """
+        return split ^ self.__all_bits if split & 1 else split
+
+    def __hash_split(self, split: int) -> int:
+        """二分岐のハッシュ値を計算します。
+
+        Args:
+            split (int): 二分岐のビット列
+
+        Returns:
+            int: ハッシュ値
+        """
+        normalized: int = self.normalize(split)
+        digest: bytes = hashlib.sha256(normalized.to_bytes((len(self.__leaf_names) + 7) // 8, "little")).digest()
+        return int.from_bytes(digest, "little")
+
+    @staticmethod
+    def __format_hash(value: int) -> str:
+        """ハッシュ値を文字列に変換します。
+
+        Args:
+            value (int): ハッシュ値
+
+        Returns:
+            str: 16進数表記のハッシュ値
+        """
+        return format(value, "064x")
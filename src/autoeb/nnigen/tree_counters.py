@@ -0,0 +1,36 @@
+from threading import local
+from typing import Tuple
+
+
+class TreeCounters:
+    """走査したノード数とコピーしたツリー数を呼び出したスレッドごとに数えます。
+    """
+
+    __local = local()
+
+    @classmethod
+    def add_visited(cls, count: int) -> None:
+        """走査したノード数を加算します。
+
+        Args:
+            count (int): ノード数
+        """
+        cls.__local.visited = getattr(cls.__local, "visited", 0) + count
+
+    @classmethod
+    def add_copies(cls, count: int) -> None:
+        """コピーしたツリー数を加算します。
+
+        Args:
+            count (int): コピー数
+        """
+        cls.__local.copies = getattr(cls.__local, "copies", 0) + count
+
+    @classmethod
+    def get_counts(cls) -> Tuple[int, int]:
+        """呼び出したスレッドの現在の値を取得します。区間の値は2回の呼び出しの差で求めます。
+
+        Returns:
+            Tuple[int, int]: 走査したノード数とコピーしたツリー数
+        """
+        return (getattr(cls.__local, "visited", 0), getattr(cls.__local, "copies", 0))
@@ -0,0 +1,18 @@
+class OperationCancelledError(Exception):
+    """シグナルによって処理が取り消された場合を表すエラーのクラスです。
+    """
+
+    def __init__(self, program: str) -> None:
+        """OperationCancelledErrorの新しいインスタンスを初期化します。
+
+        Args:
+            program (str): 取り消された外部プログラム
+        """
+        self.__program: str = program
+        super().__init__(f"'{program}' is cancelled")
+
+    @property
+    def program(self) -> str:
+        """取り消された外部プログラムを取得します。
+        """
+        return self.__program
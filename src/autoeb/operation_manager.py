@@ -1,53 +1,175 @@
+from contextlib import ExitStack, contextmanager, nullcontext
 from copy import deepcopy
 from datetime import datetime
 from distutils.file_util import copy_file
 import glob
-from io import TextIOWrapper
-from multiprocessing.pool import ThreadPool
+import hashlib
+from itertools import islice
+import math
 import os
 import random
-from sys import stdout
-from tarfile import open as opentar
-from typing import Generator, TextIO, Tuple
-
+import regex
+from sys import stderr, stdout
+from threading import Lock, Semaphore
+import time
+from typing import Any, Container, ContextManager, Generator, Iterable, TextIO, Tuple
+
+from .adaptive_bootstrap import AdaptiveBootstrap
+from .bipartition_tester import BipartitionTester
+from .branch_selector import BranchSelector
 from .catpv_result import CatpvResult
+from .checkpoint_journal import CheckpointJournal
 from .configuration import Configuration
 from .consel_manager import ConselManager
 from .consts import *
+from .core_pool import CorePool
 from .cui import CommandArguments
 from .iqtree_manager import IqtreeManager
-from .nnigen import read_tree, Tree
+from .json_helper import deserialize, serialize
+from .job_execution_error import JobExecutionError
+from .job_executor import JobExecutor
+from .metrics_recorder import MetricsRecorder
+from .model_cache import ModelCache
+from .model_parameters import ModelParameters
+from .nnigen import read_tree, Node, TopologyIndex, Tree, TreeCounters
 from .output_formatter import OutputFormatter
+from .prescreen import Prescreen
+from .progress_monitor import ProgressMonitor
+from .resource_ledger import ResourceLedger
+from .resource_limits import ResourceLimits
+from .result_table import ResultTable
+from .scratch_dir import ScratchDir
+from .sitelh_store import SitelhStore
 from .slh_data import SlhData
+from .stage_profiler import StageProfiler
 from .summary import SummaryInfo
-from .value_range import ValueRange
+from .thread_scheduler import ThreadScheduler
+from .tmp_archive import TmpArchive
+from .trace_recorder import TraceRecorder
+from .work_queue import WorkQueue
 
 
 class OperationManager:
     """AUTOEBの処理を担当します。
     """
 
-    def __init__(self, args: CommandArguments) -> None:
+    __TMPFILE_PATTERN = regex.compile(r"^(\d+)(?:\.[^.]+|-nni[12]\..+|-makermt\.log|-consel\.log)$")
+    __QUEUE_POLL_INTERVAL: float = 1.0
+
+    def __init__(self, args: CommandArguments, logger: TextIO | None = None, pool: CorePool | None = None) -> None:
         """OpeartionManagerの新しいインスタンスを初期化します。
 
         Args:
             args (CommandArguments): 引数
+            logger (TextIO | None, optional): 進捗の出力先。Noneで標準出力. Defaults to None.
+            pool (CorePool | None, optional): 他のデータセットの処理と共有するコア。Noneで'-T'のスレッド数を占有する. Defaults to None.
         """
         self.__args: CommandArguments = args
         self.__config: Configuration = Configuration.load()
-        self.__logger: TextIO = stdout
+        self.__logger: TextIO = stdout if logger is None else logger
+        self.__pool: CorePool | None = pool
+        self.__threads: int = 1
+        self.__progress: ProgressMonitor | None = None
+        self.__metrics: MetricsRecorder | None = None
+        self.__tracer: TraceRecorder | None = None
+        self.__ledger: ResourceLedger = ResourceLedger()
+        self.__profiler: StageProfiler = StageProfiler(args.profile_stages, args.out_dir)
+        self.__bootstrap: AdaptiveBootstrap | None = None
+        self.__replicates: dict[int, int] = dict[int, int]()
+        self.__prescreen: Prescreen | None = None
+        self.__screened: dict[int, CatpvResult] = dict[int, CatpvResult]()
+        self.__screen_decisions: dict[int, bool] = dict[int, bool]()
+        self.__scratch: ScratchDir = ScratchDir(None, args.out_dir)
+        self.__archive: TmpArchive | None = None
+        self.__journal: CheckpointJournal | None = None
+        self.__fingerprints: dict[int, str] = dict[int, str]()
+        self.__resumed: dict[int, CatpvResult] = dict[int, CatpvResult]()
+        self.__results: ResultTable | None = None
+        self.__splits: dict[int, str] = dict[int, str]()
+        self.__queue: WorkQueue | None = None
+        self.__sitelh_fingerprint: str = ""
+        self.__topologies: dict[int, list[str]] = dict[int, list[str]]()
+        self.__queued: list[int] = []
+        self.__limits: ResourceLimits = ResourceLimits(1, None)
+        self.__consel_workers: int = 1
+        self.__memory_slots: Semaphore | None = None
+        self.__memory_lock: Lock = Lock()
 
     def execute(self) -> None:
         """処理を実行します。
         """
+        limits: ResourceLimits = ResourceLimits.detect()
+        self.__threads = self.__args.threads
+        if self.__threads > limits.cpus:
+            print(f"{limits.cpus} threads are used instead of {self.__threads} (CPUs available to the process)", file=self.__logger)
+            self.__threads = limits.cpus
+        if self.__pool is None:
+            # IQ-TREE and CONSEL share the cores, so the cores released by one phase are used by the other
+            self.__pool = CorePool(self.__threads)
+        self.__journal = CheckpointJournal(self.__args.get_out_file_path(OUTFILE_CHECKPOINT))
+        if self.__args.redo:
+            self.__journal.clear()
+        self.__results = ResultTable(self.__args.get_out_file_path(OUTFILE_RESULTS))
+        if self.__args.output_tmp_files:
+            self.__archive = self.__open_archive()
+        queue_path: str | None = self.__args.queue_path
+        if queue_path is not None:
+            self.__queue = WorkQueue(queue_path)
+            self.__queue.reset()
+        metrics_path: str | None = self.__args.metrics_path
+        metrics_textfile_path: str | None = self.__args.metrics_textfile_path
+        if metrics_path is not None or metrics_textfile_path is not None:
+            self.__metrics = MetricsRecorder(metrics_path, metrics_textfile_path, {"out": self.__args.out_dir}, self.__ledger)
+        trace_path: str | None = self.__args.trace_path
+        if trace_path is not None:
+            self.__tracer = TraceRecorder(trace_path)
+        self.__profiler.start()
+        metrics_context: ContextManager[object] = nullcontext()
+        if self.__metrics is not None:
+            metrics_context = self.__metrics
+        try:
+            with metrics_context:
+                self.__execute(self.__journal, self.__results, limits)
+        finally:
+            if self.__queue is not None:
+                # workers waiting for jobs exit when the queue is closed
+                self.__queue.finish()
+                self.__queue.close()
+            if self.__archive is not None:
+                with self.__span("close archive", "archive"):
+                    self.__archive.close()
+            self.__results.close()
+            self.__journal.close()
+            self.__profiler.stop()
+            for report in self.__profiler.write_reports():
+                print(f"Profile of the stage is written in '{report}'", file=self.__logger)
+            if self.__tracer is not None:
+                # the trace is written even if the operation fails or is cancelled
+                self.__tracer.write()
+                print(f"Trace of the operations is written in '{self.__tracer.path}'", file=self.__logger)
+
+    def __execute(self, journal: CheckpointJournal, results: ResultTable, limits: ResourceLimits) -> None:
+        """中間ファイルのアーカイブ，ジャーナル，結果の表を開いた状態で処理を実行します。
+
+        Args:
+            journal (CheckpointJournal): 完了した処理を記録するジャーナル
+            results (ResultTable): 二分岐ごとの検定結果を保存する表
+            limits (ResourceLimits): プロセスが利用できるCPUとメモリの上限
+        """
         start_time: datetime = datetime.now()
+        tree_counts: Tuple[int, int] = TreeCounters.get_counts()
         SEQ_PATH: str = os.path.abspath(self.__args.get_out_file_path(INFILE_SEQ))
         TREE_PATH: str = os.path.abspath(self.__args.get_out_file_path(INFILE_TREE))
         SITELH_PATH: str = os.path.abspath(self.__args.get_out_file_path(OUTFILE_SITELH))
         ALL_TREE_PATH: str = os.path.abspath(self.__args.get_out_file_path(OUTFILE_ALL_TREES))
 
-        actual_seed: int = random.randrange(1, 0x7FFFFFFF) if self.__args.seed == -1 else self.__args.seed  # Max: max value of 32-bit signed integer
-        branch_range: ValueRange = self.__args.bipartition_range
+        actual_seed: int = self.__args.seed
+        if actual_seed == -1:
+            # random seed is kept in the journal so that the resumed operations use the same seed
+            recorded_seed: str | None = journal.get(CheckpointJournal.STAGE_SEED, 0, "")
+            actual_seed = random.randrange(1, 0x7FFFFFFF) if recorded_seed is None else int(recorded_seed)  # Max: max value of 32-bit signed integer
+            journal.record(CheckpointJournal.STAGE_SEED, 0, "", str(actual_seed))
+        selector = BranchSelector(self.__args.bipartition_range, self.__args.support_below, self.__args.length_below, self.__args.clade)
         tree: Tree = read_tree(self.__args.tree_file, self.__args.tree_type)
         self.__output_indexed_tree(tree)
         bipartition_count: int = self.__get_nniable_bipartition_count(tree)
@@ -57,154 +179,212 @@ class OperationManager:
         if self.__args.tree_file != TREE_PATH:
             copy_file(self.__args.tree_file, TREE_PATH)
 
-        bipartition_index = 0
-        iqtree_manager = IqtreeManager(self.__config)
+        iqtree_manager = IqtreeManager(self.__config, self.__tracer, self.__ledger)
         if not self.__args.iqtree_params is None:
             iqtree_manager.load_other_params(self.__args.iqtree_params)
-        consel_manager = ConselManager(self.__config)
+        consel_manager = ConselManager(self.__config, self.__tracer, self.__ledger)
 
         formatter = OutputFormatter(self.__args.out_format)
+        adaptive_bootstrap: int | None = self.__args.adaptive_bootstrap
+        if adaptive_bootstrap is not None:
+            self.__bootstrap = AdaptiveBootstrap(adaptive_bootstrap, self.__args.rell_boot, self.__args.sig_level)
+        if self.__args.prescreen:
+            self.__prescreen = Prescreen(self.__args.sig_level)
+
+        self.__scratch = ScratchDir(self.__args.scratch_dir, self.__args.out_dir)
+        if self.__scratch.is_separated:
+            print(f"Intermediates of each bipartition are placed in '{self.__scratch.path}'", file=self.__logger)
+        tester = BipartitionTester(consel_manager, self.__scratch.path, self.__args.rell_boot, self.__bootstrap, self.__logger, self.__profiler)
+
+        topology = TopologyIndex(tree)
+        # the selection is computed once for all branches, and the stages below handle only the selected bipartitions
+        selection: list[bool] = selector.select(tree, topology)
+        targets: list[int] = [i for i in range(bipartition_count) if selection[i]]
+        if len(targets) < bipartition_count:
+            print(f"{len(targets)} of {bipartition_count} bipartitions are selected", file=self.__logger)
+        results.set_leaves(topology.leaf_names)
+        results.set_metadata(self.__create_metadata(SEQ_PATH, TREE_PATH, actual_seed, iqtree_manager.other_params))
 
-        if not self.__args.redo and os.path.isfile(SITELH_PATH):
-            print(f"Site likelyhood calculation is skipped ('{OUTFILE_SITELH}' already exists)", file=self.__logger)
-        else:
-            # generating NNI-trees
-            print("Start generating NNI trees", file=self.__logger)
-            print(f"ML tree and NNI trees are written in '{ALL_TREE_PATH}'", file=self.__logger)
-
-            with open(ALL_TREE_PATH, "wt") as trees_io:
-                # output ML tree
-                tree.export(trees_io, self.__args.tree_type)
-                trees_io.write("\n")
-
-                # output NNI trees
-                for nni_set in self.__iterate_nni_pairs(tree):
-                    # skip if not at specified branch
-                    if not bipartition_index in branch_range:
-                        bipartition_index += 1
-                        continue
-
-                    print(f"  NNI-tree No. {bipartition_index}-1", file=self.__logger)
-                    nni_set[1].export(trees_io, self.__args.tree_type)
-                    trees_io.write("\n")
-
-                    print(f"  NNI-tree No. {bipartition_index}-2", file=self.__logger)
-                    nni_set[2].export(trees_io, self.__args.tree_type)
-                    trees_io.write("\n")
-
-                    # increment branch index
-                    bipartition_index += 1
-
-            print("Finish generating NNI trees", file=self.__logger)
+        # CONSEL runs in SINGLE thread
+        # To run fast, CONSEL should be run in parallel
+        catpv_results: dict[int, CatpvResult]
+        # the number of running CONSEL processes is limited by the shared cores,
+        # and by the memory for the RELL-bootstrap replicates once the number of sites is known
+        consel_workers: int = self.__threads if self.__pool is None else self.__pool.cores
+        self.__limits = limits
+        self.__consel_workers = consel_workers
+        progress = ProgressMonitor("AU tests", len(targets), stderr if self.__args.progress else None, self.__metrics, "au_test")
+        self.__progress = progress
+        with progress, JobExecutor[int, CatpvResult](consel_workers, self.__args.retry, self.__logger, progress, "consel") as executor, SitelhStore(self.__args.sitelh_store_path) as store:
+            # parameters of the model are fixed when they are given by the upstream run or the cache
+            model_cache_dir: str | None = self.__args.model_cache_dir
+            fixed_model: str | None = None
+            iqtree_run_prefix: str | None = self.__args.iqtree_run_prefix
+            if iqtree_run_prefix is not None:
+                fixed_model = self.__load_upstream_model(iqtree_run_prefix)
+            elif model_cache_dir is not None:
+                fixed_model = self.__fit_model(iqtree_manager, SEQ_PATH, TREE_PATH, self.__open_model_cache(model_cache_dir))
+
+            # site likelihood values are stored for each tree topology,
+            # so that only the trees missing from the store are evaluated by IQ-TREE
+            fingerprint: str = SitelhStore.create_fingerprint(
+                SEQ_PATH,
+                self.__args.model if fixed_model is None else fixed_model,
+                topology.topology_hash if fixed_model is None else "",
+                iqtree_manager.other_params)
+            nni_hashes: dict[int, Tuple[str, str]] = dict[int, Tuple[str, str]]([(i, topology.get_nni_topology_hashes(i)) for i in targets])
+            # workers load the site likelihood values of each job from the store
+            self.__sitelh_fingerprint = fingerprint
+            self.__topologies = dict[int, list[str]]([(i, [topology.topology_hash, nni_hashes[i][0], nni_hashes[i][1]]) for i in targets])
+
+            # bipartitions tested with the same inputs are resumed from the journal
+            for i in targets:
+                self.__fingerprints[i] = self.__create_test_fingerprint(fingerprint, topology.topology_hash, nni_hashes[i], actual_seed)
+                self.__splits[i] = str.join("", ["1" if (topology.branch_splits[i] >> p) & 1 else "0" for p in range(len(topology.leaf_names))])
+                recorded: Tuple[CatpvResult, int] | None = journal.get_result(i, self.__fingerprints[i])
+                if recorded is not None:
+                    self.__resumed[i] = recorded[0]
+                    self.__replicates[i] = recorded[1]
+                    # rows written by the previous run are kept (site likelihood values are not loaded for resumed bipartitions)
+                    self.__write_result(i, recorded[0], self.__estimate_delta_lnl(recorded[0]), recorded[1], None, False)
+            pending: list[int] = [i for i in targets if not i in self.__resumed]
+
+            stored: dict[str, list[float]] = dict[str, list[float]]()
+            if not self.__args.redo and len(pending) > 0:
+                stored = store.load(fingerprint, [topology.topology_hash] + [h for i in pending for h in nni_hashes[i]])
+            loaded: list[int] = []
+            if topology.topology_hash in stored:
+                loaded = [i for i in pending if nni_hashes[i][0] in stored and nni_hashes[i][1] in stored]
+            loaded_set: set[int] = set(loaded)
+            missing: list[int] = [i for i in pending if not i in loaded_set]
+
+            print("Start CONSEL operations", file=self.__logger)
+            if len(self.__resumed) > 0:
+                print(f"Operations of {len(self.__resumed)} bipartitions have already done (skipped, recorded in '{journal.path}')", file=self.__logger)
+                progress.skip(len(self.__resumed))
+            if len(loaded) > 0:
+                print(f"Site likelyhood calculation of {len(loaded)} bipartitions is skipped (loaded from '{store.path}')", file=self.__logger)
+                loaded_sitelh = SlhData([stored[topology.topology_hash]] + [stored[h] for i in loaded for h in nni_hashes[i]])
+                self.__submit_consel(executor, tester, loaded_sitelh, loaded, bipartition_count, actual_seed)
+
+            if len(missing) > 0:
+                # IQ-TREE evaluates the bipartitions chunk by chunk,
+                # and CONSEL operations of each chunk start as soon as its site likelihood values are calculated
+                chunk_size: int = self.__args.chunk_size
+                if chunk_size == 0 and self.__args.iqtree_workers > 1:
+                    chunk_size = -(-len(missing) // self.__args.iqtree_workers)
+                chunks: list[list[int]] = self.__split_chunks(missing, chunk_size)
+                scheduler = ThreadScheduler(self.__threads, min(self.__args.iqtree_workers, len(chunks)))
+
+                # parameters of the model are estimated only once when the trees are evaluated by several IQ-TREE processes
+                if fixed_model is None and len(chunks) > 1:
+                    fixed_model = self.__fit_model(iqtree_manager, SEQ_PATH, TREE_PATH, None)
+                model: str = self.__args.model if fixed_model is None else fixed_model
+
+                print("Start generating NNI trees and calculating site likelyhood value", file=self.__logger)
+                missing_mask: list[bool] = [False] * bipartition_count
+                for i in missing:
+                    missing_mask[i] = True
+                nni_pairs: Generator[Tuple[int, Tree, Tree], None, None] = self.__iterate_target_nni_pairs(tree, missing_mask)
+                sitelh_progress = ProgressMonitor("Site likelihood", len(chunks), None, self.__metrics, "sitelh")
+                with sitelh_progress, JobExecutor[int, SlhData](scheduler.workers, 0, self.__logger, sitelh_progress, "iqtree") as iqtree_executor:
+                    for chunk_index in range(len(chunks)):
+                        chunk: list[int] = chunks[chunk_index]
+                        treeset_path: str = ALL_TREE_PATH if len(chunks) == 1 else self.__args.get_out_file_path(f"all-{chunk_index}.treeset")
+                        sitelh_prefix: str = os.path.splitext(SITELH_PATH)[0] if len(chunks) == 1 else self.__args.get_out_file_path(f"trees-{chunk_index}")
+
+                        # generating NNI-trees
+                        print(f"ML tree and NNI trees are written in '{treeset_path}'", file=self.__logger)
+                        with self.__span("generate NNI trees", "nni", chunk=chunk_index), self.__profiler.profile("nni"):
+                            self.__write_treeset(treeset_path, tree, islice(nni_pairs, len(chunk)))
+                        iqtree_executor.submit(chunk_index, self.__calc_chunk_sitelh, iqtree_manager, scheduler, model, treeset_path, sitelh_prefix, chunk_index, len(chunks))
+
+                    # store site likelihood values and execute CONSEL to compare Log-likelihood
+                    for chunk_index, evaluated in iqtree_executor.as_completed():
+                        chunk = chunks[chunk_index]
+                        values = dict[str, list[float]]([(topology.topology_hash, evaluated[0])])
+                        for offset in range(len(chunk)):
+                            values[nni_hashes[chunk[offset]][0]] = evaluated[1 + offset * 2]
+                            values[nni_hashes[chunk[offset]][1]] = evaluated[2 + offset * 2]
+                        with self.__span("store site likelihood", "io", chunk=chunk_index):
+                            store.save(fingerprint, values)
+                        self.__submit_consel(executor, tester, evaluated, chunk, bipartition_count, actual_seed)
+                        # results of the bipartitions finished so far are committed once per chunk
+                        self.__flush_records(journal, results)
+                print("Finish calculating site likelyhood value", file=self.__logger)
+            with self.__span("wait for AU tests", "wait"):
+                catpv_results = executor.wait()
+            if self.__queue is not None:
+                with self.__span("collect queue jobs", "wait"):
+                    catpv_results.update(self.__collect_jobs(self.__queue, bipartition_count))
+            catpv_results.update(self.__screened)
+            catpv_results.update(self.__resumed)
+            self.__flush_records(journal, results)
 
-            # execute IQ-TREE to calculate site likelihood value
-            print("Start calculating site likelyhood value", file=self.__logger)
-            operation_start: datetime = datetime.now()
+        print("Finish CONSEL operation", file=self.__logger)
 
-            iqtree_manager.calc_sitelh(
-                SEQ_PATH,
-                self.__args.model,
-                TREE_PATH,
-                ALL_TREE_PATH,
-                self.__args.iqtree_verbose,
-                self.__args.redo,
-                os.path.splitext(SITELH_PATH)[0],
-                self.__args.threads,
-                self.__args.out_dir)
+        with self.__span("map results", "summary"), self.__profiler.profile("summary"):
+            valid_nni: list[Tuple[float, Tree]] = self.map_results(tree, catpv_results, formatter, self.__args.sig_level, self.__screen_decisions)
+            tree.export(self.__args.get_out_file_path(OUTFILE_TREE), self.__args.tree_type)
 
-            operation_end: datetime = datetime.now()
-            print(f"Finish calculating site likelyhood value in {(operation_end - operation_start)}", file=self.__logger)
+        finish_time: datetime = datetime.now()
+        visited, copies = TreeCounters.get_counts()
 
-        sitelh: SlhData = SlhData.load(SITELH_PATH)
+        # generate summary file
+        summary = SummaryInfo(valid_nni, self.__args, finish_time - start_time, actual_seed, None if self.__bootstrap is None else self.__replicates, None if self.__prescreen is None else self.__screen_decisions, self.__ledger, (visited - tree_counts[0], copies - tree_counts[1]), (len(targets), bipartition_count))
+        with self.__span("write summary", "summary"), self.__profiler.profile("summary"):
+            summary.write(self.__args.get_out_file_path(OUTFILE_SUMMARY))
 
-        # execute CONSEL to compare Log-likelihood
-        print("Start CONSEL operations", file=self.__logger)
+        # process tmp files
+        # intermediates of each bipartition are already archived or removed except those left by failed operations
+        tmp_files: list[str] = [self.__args.get_out_file_path(f) for f in self.__iterate_sitelh_tmpfiles()]
+        tmp_files += self.__list_bipartition_tmpfiles(set(targets))
+        with self.__span("archive intermediates" if self.__archive is not None else "remove intermediates", "archive"):
+            if self.__archive is not None:
+                self.__archive.move(tmp_files)
+            else:
+                for file in tmp_files:
+                    os.remove(file)
+            self.__scratch.cleanup()
+        if os.path.isfile(os.path.join(self.__args.out_dir, "parameters")):
+            os.remove(os.path.join(self.__args.out_dir, "parameters"))
 
-        # CONSEL runs in SINGLE thread
-        # To run fast, CONSEL should be run in parallel
-        actual_tree_index: int = 1
-        ml_sitelh: SlhData = SlhData([sitelh[0]])
-        with ThreadPool(processes=self.__args.threads) as pool:
-            for bipartition_index in range(bipartition_count):
-                # skip if not specified branch
-                if not bipartition_index in self.__args.bipartition_range:
-                    continue
-                pool.apply_async(self.__invoke_consel, (consel_manager, SlhData.concat(ml_sitelh, sitelh[actual_tree_index:(actual_tree_index + 2)]), bipartition_index, bipartition_count, actual_seed))
-                actual_tree_index += 2
-            pool.close()
-            pool.join()
+    @staticmethod
+    def map_results(tree: Tree, catpv_results: dict[int, CatpvResult], formatter: OutputFormatter, sig_level: float, screened: dict[int, bool]) -> list[Tuple[float, Tree]]:
+        """二分岐の検定結果を枝名に反映し，棄却されなかったNNI樹形を取得します。
 
-        print("Finish CONSEL operation", file=self.__logger)
+        Args:
+            tree (Tree): 最尤樹形（枝名が書き換えられる）
+            catpv_results (dict[int, CatpvResult]): 二分岐のインデックスと検定結果。含まれない二分岐の枝名は変更されない
+            formatter (OutputFormatter): 枝名のフォーマット
+            sig_level (float): 有意水準
+            screened (dict[int, bool]): 事前判定で結果が確定した二分岐のインデックスと支持されるかどうか
 
-        catpv: CatpvResult
-        bipartition_index = 0
+        Returns:
+            list[Tuple[float, Tree]]: AU検定で棄却されなかったNNI樹形とAU検定のp値（事前判定で確定した二分岐を除く）
+        """
+        bipartition_index: int = 0
         valid_nni = list[Tuple[float, Tree]]()
         for current in tree.iterate_all_branches():
-            # skip if not specified branch
-            if not bipartition_index in branch_range:
+            # skip if the bipartition is not tested
+            catpv: CatpvResult | None = catpv_results.get(bipartition_index)
+            if catpv is None:
                 bipartition_index += 1
                 continue
-            # parse CATPV file
-            catpv = CatpvResult.load(self.__args.get_out_file_path(f"{bipartition_index}.catpv"))[0]
             # change branch name
-            current.name = formatter.format(current.name, catpv, self.__args.sig_level)
+            current.name = formatter.format(current.name, catpv, sig_level, screened.get(bipartition_index))
+            if bipartition_index in screened:
+                # the pre-screen has no AU p-values, so its NNI trees are not listed
+                bipartition_index += 1
+                continue
             nni: list[Tree] = [Tree(nni.find_root()) for nni in current.get_nni()]
-            if self.__args.sig_level <= catpv.stat_nni1.au:
+            if sig_level <= catpv.stat_nni1.au:
                 valid_nni.append((catpv.stat_nni1.au, nni[1]))
-            if self.__args.sig_level <= catpv.stat_nni2.au:
+            if sig_level <= catpv.stat_nni2.au:
                 valid_nni.append((catpv.stat_nni2.au, nni[2]))
             # increment branch index
             bipartition_index += 1
-
-        tree.export(self.__args.get_out_file_path(OUTFILE_TREE), self.__args.tree_type)
-
-        finish_time: datetime = datetime.now()
-
-        # generate summary file
-        summary = SummaryInfo(valid_nni, self.__args, finish_time - start_time, actual_seed)
-        summary.write(self.__args.get_out_file_path(OUTFILE_SUMMARY))
-
-        # process tmp files
-        tmp_files: list[str] | Generator[str, None, None]
-        if self.__args.output_tmp_files:
-            with opentar(self.__args.get_out_file_path(OUTFILE_TMPZIP), "w:gz") as tario:
-                fullpath: str
-                # trees
-                tario.add(ALL_TREE_PATH, OUTFILE_ALL_TREES)
-                os.remove(ALL_TREE_PATH)
-                # sitelh
-                tmp_files = glob.glob("trees.*", root_dir=self.__args.out_dir)
-                for file in tmp_files:
-                    fullpath = os.path.join(self.__args.out_dir, file)
-                    tario.add(fullpath, file)
-                    os.remove(fullpath)
-                bipartition_index = -1
-                # CONSEL output
-                for i in range(bipartition_count):
-                    bipartition_index += 1
-                    if not bipartition_index in branch_range:
-                        continue
-                    tmp_files = self.__iterate_all_tmpfiles(i)
-                    for file in tmp_files:
-                        fullpath = os.path.join(self.__args.out_dir, file)
-                        tario.add(fullpath, file)
-                        os.remove(fullpath)
-        else:
-            # trees
-            os.remove(ALL_TREE_PATH)
-            # sitelh
-            tmp_files = [self.__args.get_out_file_path(f) for f in glob.glob("trees.*", root_dir=self.__args.out_dir)]
-            for file in tmp_files:
-                os.remove(file)
-            # CONSEL output
-            for i in range(bipartition_count):
-                if not i in branch_range:
-                    continue
-                tmp_files = [os.path.join(self.__args.out_dir, f) for f in self.__iterate_all_tmpfiles(i)]
-                for file in tmp_files:
-                    os.remove(file)
-        if os.path.isfile(os.path.join(self.__args.out_dir, "parameters")):
-            os.remove(os.path.join(self.__args.out_dir, "parameters"))
+        return valid_nni
 
     @staticmethod
     def __get_nniable_bipartition_count(tree: Tree) -> int:
@@ -227,6 +407,7 @@ class OperationManager:
         Args:
             tree (Tree): インデックス化するTreeインスタンス（このインスタンス自体は改変されない）
         """
+        TreeCounters.add_copies(1)
         clone: Tree = deepcopy(tree)
         index = 0
         for current in clone.iterate_all_branches():
@@ -235,75 +416,563 @@ class OperationManager:
         clone.export(self.__args.get_out_file_path(OUTFILE_INDEX_TREE), self.__args.tree_type)
 
     @staticmethod
-    def __iterate_nni_pairs(tree: Tree) -> Generator[Tuple[Tree, Tree, Tree], None, None]:
-        """最尤樹形とNNI樹形2つからなる組の一覧を列挙します。
+    def __split_chunks(targets: list[int], chunk_size: int) -> list[list[int]]:
+        """解析する二分岐をIQ-TREEで一度に評価するチャンクに分割します。
+
+        Args:
+            targets (list[int]): 解析する二分岐のインデックス一覧
+            chunk_size (int): チャンクあたりの二分岐数。0以下で分割しない
+
+        Returns:
+            list[list[int]]: チャンクの一覧（要素数1以上）
+        """
+        if chunk_size <= 0 or len(targets) == 0:
+            return [targets]
+        return [targets[i:(i + chunk_size)] for i in range(0, len(targets), chunk_size)]
+
+    @staticmethod
+    def __iterate_target_nni_pairs(tree: Tree, targets: list[bool]) -> Generator[Tuple[int, Tree, Tree], None, None]:
+        """解析する二分岐のインデックスとNNI樹形2つからなる組の一覧を列挙します。NNI樹形は解析する二分岐についてのみ生成されます。
 
         Args:
             tree (Tree): 処理するTreeのインスタンス
+            targets (list[bool]): 二分岐ごとに解析するかどうか
 
         Yields:
-            Generator[Tuple[Tree, Tree, Tree], None, None]: 最尤樹形とNNI樹形2つからなる組の一覧を列挙するGeneratorのインスタンス
-        """
-        generator: Generator[Tree, None, None] = tree.iterate_all_nni_trees()
-        ml: Tree = next(generator)
-        while True:
-            try:
-                nni_1: Tree = next(generator)
-                nni_2: Tree = next(generator)
-                yield (ml, nni_1, nni_2)
-            except StopIteration:
-                return
+            Generator[Tuple[int, Tree, Tree], None, None]: 二分岐のインデックスとNNI樹形2つからなる組の一覧を列挙するGeneratorのインスタンス
+        """
+        # the same trees as Tree.iterate_all_nni_trees(), without copying the tree for the other branches
+        for bipartition_index, branch in enumerate(tree.iterate_all_branches()):
+            if targets[bipartition_index]:
+                nni: Tuple[Node, Node, Node] = branch.get_nni()
+                yield (bipartition_index, Tree(nni[1].find_root()), Tree(nni[2].find_root()))
+
+    def __write_treeset(self, path: str, tree: Tree, nni_pairs: Iterable[Tuple[int, Tree, Tree]]) -> None:
+        """最尤樹形とNNI樹形の一覧をファイルに出力します。
+
+        Args:
+            path (str): 出力先のパス
+            tree (Tree): 最尤樹形
+            nni_pairs (Iterable[Tuple[int, Tree, Tree]]): 二分岐のインデックスとNNI樹形2つからなる組の一覧
+        """
+        with open(path, "wt") as trees_io:
+            # output ML tree
+            tree.export(trees_io, self.__args.tree_type)
+            trees_io.write("\n")
+
+            # output NNI trees
+            for bipartition_index, nni_1, nni_2 in nni_pairs:
+                print(f"  NNI-tree No. {bipartition_index}-1", file=self.__logger)
+                nni_1.export(trees_io, self.__args.tree_type)
+                trees_io.write("\n")
+
+                print(f"  NNI-tree No. {bipartition_index}-2", file=self.__logger)
+                nni_2.export(trees_io, self.__args.tree_type)
+                trees_io.write("\n")
+
+    def __fit_model(self, iqtree_manager: IqtreeManager, sequence_path: str, tree_path: str, cache: ModelCache | None) -> str:
+        """最尤樹形でモデルパラメータを推定し，パラメータを固定したモデルを取得します。
+
+        Args:
+            iqtree_manager (IqtreeManager): IQ-TREEを実行するクライアント
+            sequence_path (str): 配列ファイルのパス
+            tree_path (str): 最尤樹形のファイルのパス
+            cache (ModelCache | None): モデルパラメータのキャッシュ。Noneでキャッシュを使用しない
+
+        Returns:
+            str: パラメータを固定したモデル文字列
+        """
+        key: str = ModelCache.create_key(sequence_path, self.__args.model, tree_path, iqtree_manager.other_params)
+        parameters: ModelParameters | None = None
+        if cache is not None:
+            if not self.__args.redo:
+                parameters = cache.load(key)
+            if parameters is not None:
+                print(f"Estimation of model parameters is skipped (loaded from cache '{key}')", file=self.__logger)
+
+        recorded: str | None = None if self.__journal is None else self.__journal.get(CheckpointJournal.STAGE_MODEL, 0, key)
+        if parameters is None and recorded is not None:
+            print(f"Estimation of model parameters is skipped (recorded in '{OUTFILE_CHECKPOINT}')", file=self.__logger)
+            parameters = deserialize(recorded, ModelParameters)
+
+        if parameters is None:
+            prefix: str = self.__args.get_out_file_path(OUTFILE_MODEL_PREFIX)
+            print("Start estimating model parameters on ML tree", file=self.__logger)
+            operation_start: datetime = datetime.now()
+            # checkpoints of IQ-TREE are ignored because completed estimation is recorded in the journal
+            with self.__acquire_cores(self.__threads) as threads, nullcontext() if self.__metrics is None else self.__metrics.stage("model"), self.__span("estimate model parameters", "iqtree"), self.__ledger.scope("model", 0):
+                iqtree_manager.fit_model(
+                    sequence_path,
+                    self.__args.model,
+                    tree_path,
+                    self.__args.iqtree_verbose,
+                    True,
+                    prefix,
+                    threads,
+                    self.__args.out_dir)
+            operation_end: datetime = datetime.now()
+            print(f"Finish estimating model parameters in {(operation_end - operation_start)}", file=self.__logger)
+            parameters = ModelParameters.load(prefix + ".iqtree")
+            if cache is not None:
+                try:
+                    cache.save(key, parameters)
+                except OSError as e:
+                    print(f"Model parameters are not cached: {e}", file=self.__logger)
+        if self.__journal is not None and recorded is None:
+            self.__journal.record(CheckpointJournal.STAGE_MODEL, 0, key, serialize(parameters))
+
+        return self.__get_fixed_model(parameters)
+
+    def __open_model_cache(self, directory: str) -> ModelCache | None:
+        """モデルパラメータのキャッシュを開きます。
+
+        Args:
+            directory (str): キャッシュを保存するディレクトリ
+
+        Returns:
+            ModelCache | None: モデルパラメータのキャッシュ。ディレクトリを作成できない場合はNone
+        """
+        try:
+            return ModelCache(directory)
+        except OSError as e:
+            # the analysis does not depend on the cache, so it continues without caching
+            print(f"Model cache '{directory}' is not used: {e}", file=self.__logger)
+            return None
+
+    def __load_upstream_model(self, prefix: str) -> str:
+        """ML樹形を推定したIQ-TREEの実行結果からモデルパラメータを読み込み，パラメータを固定したモデルを取得します。
+
+        Args:
+            prefix (str): IQ-TREEの実行結果のprefix
+
+        Returns:
+            str: パラメータを固定したモデル文字列
+        """
+        parameters: ModelParameters = ModelParameters.load(prefix + ".iqtree")
+        print(f"Estimation of model parameters is skipped (loaded from '{prefix}.iqtree')", file=self.__logger)
+        if parameters.model != self.__args.model:
+            print(f"Model '{parameters.model}' in '{prefix}.iqtree' is used instead of '{self.__args.model}'", file=self.__logger)
+        return self.__get_fixed_model(parameters)
+
+    def __get_fixed_model(self, parameters: ModelParameters) -> str:
+        """パラメータを固定したモデルを取得します。
+
+        Args:
+            parameters (ModelParameters): モデルパラメータ
+
+        Returns:
+            str: パラメータを固定したモデル文字列
+        """
+        result: str = parameters.to_fixed_model()
+        print(f"Model parameters are fixed: {result}", file=self.__logger)
+        if parameters.is_mixture:
+            print("Weights of mixture model are estimated by each IQ-TREE process", file=self.__logger)
+        return result
+
+    def __calc_chunk_sitelh(self, iqtree_manager: IqtreeManager, scheduler: ThreadScheduler, model: str, treeset_path: str, sitelh_prefix: str, chunk_index: int, chunk_count: int) -> SlhData:
+        """チャンクのツリー一覧の尤度を計算して読み込みます。
+
+        Args:
+            iqtree_manager (IqtreeManager): IQ-TREEを実行するクライアント
+            scheduler (ThreadScheduler): IQ-TREEに割り当てるスレッド数を管理するThreadScheduler
+            model (str): 進化モデル
+            treeset_path (str): 尤度計算を行うツリー一覧のパス
+            sitelh_prefix (str): 出力するSITELHファイルのprefix
+            chunk_index (int): チャンク番号
+            chunk_count (int): チャンク数
+
+        Returns:
+            SlhData: チャンクのツリー一覧の尤度
+        """
+        with scheduler.allocate() as share, self.__acquire_cores(share) as threads, self.__ledger.scope("sitelh", chunk_index):
+            # execute IQ-TREE to calculate site likelihood value
+            print(f"Start calculating site likelyhood value of chunk {chunk_index + 1} / {chunk_count} ({threads} threads)", file=self.__logger)
+            operation_start: datetime = datetime.now()
+
+            # checkpoints of IQ-TREE are ignored because the treeset differs from run to run
+            iqtree_manager.calc_sitelh(
+                os.path.abspath(self.__args.get_out_file_path(INFILE_SEQ)),
+                model,
+                os.path.abspath(self.__args.get_out_file_path(INFILE_TREE)),
+                treeset_path,
+                self.__args.iqtree_verbose,
+                True,
+                sitelh_prefix,
+                threads,
+                self.__args.out_dir)
+
+            operation_end: datetime = datetime.now()
+            print(f"Finish calculating site likelyhood value of chunk {chunk_index + 1} / {chunk_count} in {(operation_end - operation_start)}", file=self.__logger)
+        if self.__metrics is not None:
+            self.__metrics.add_io("sitelh", chunk_index, os.path.getsize(treeset_path) + os.path.getsize(sitelh_prefix + ".sitelh"))
+            self.__metrics.add_usage("sitelh", chunk_index, self.__ledger.get("sitelh", chunk_index))
+        with self.__span("load site likelihood", "io", chunk=chunk_index), self.__profiler.profile("sitelh"):
+            return SlhData.load(sitelh_prefix + ".sitelh")
+
+    def __submit_consel(self, executor: JobExecutor[int, CatpvResult], tester: BipartitionTester, sitelh: SlhData, targets: list[int], branch_count: int, seed: int) -> None:
+        """二分岐ごとのCONSELの実行を追加します。
+
+        Args:
+            executor (JobExecutor[int, CatpvResult]): CONSELを実行するJobExecutor
+            tester (BipartitionTester): AU検定を行うBipartitionTester
+            sitelh (SlhData): 最尤樹形とtargetsに対応するNNI樹形の尤度一覧
+            targets (list[int]): 二分岐のインデックス一覧
+            branch_count (int): 枝数
+            seed (int): シード値
+        """
+        self.__limit_memory(sitelh.site_count)
+        # bipartitions clearly decided by the pre-screen are not tested by CONSEL
+        screens: list[CatpvResult] | None = None if self.__prescreen is None else self.__prescreen.evaluate(sitelh)
+        ml_sitelh: SlhData = SlhData([sitelh[0]])
+        for offset in range(len(targets)):
+            if self.__prescreen is not None and screens is not None:
+                decision: bool | None = self.__prescreen.decide(screens[offset])
+                if decision is not None:
+                    self.__screened[targets[offset]] = screens[offset]
+                    self.__screen_decisions[targets[offset]] = decision
+                    if self.__progress is not None:
+                        self.__progress.skip(1)
+                    self.__write_result(targets[offset], screens[offset], BipartitionTester.get_delta_lnl(sitelh, 1 + offset * 2), None, None, True, decision)
+                    print(f"  Operation No. {targets[offset]} / {branch_count - 1} is decided by pre-screen ({'supported' if decision else 'not supported'})", file=self.__logger)
+                    continue
+            if self.__queue is not None:
+                self.__queue.put(targets[offset], self.__create_job_payload(targets[offset], branch_count, seed), self.__args.retry + 1)
+                self.__queued.append(targets[offset])
+                if self.__progress is not None:
+                    self.__progress.submit(targets[offset])
+                continue
+            tree_index: int = 1 + offset * 2
+            executor.submit(targets[offset], self.__invoke_consel, tester, SlhData.concat(ml_sitelh, sitelh[tree_index:(tree_index + 2)]), targets[offset], branch_count, seed)
 
-    def __invoke_consel(self, consel_manager: ConselManager, slh_set: SlhData, branch_index: int, branch_count: int, seed: int) -> None:
+    def __invoke_consel(self, tester: BipartitionTester, slh_set: SlhData, branch_index: int, branch_count: int, seed: int) -> CatpvResult:
         """CONSELを実行します。
 
         Args:
-            consel_manager (ConselManager): CONSELを実行するクライアント
+            tester (BipartitionTester): AU検定を行うBipartitionTester
             slh_set (SlhData): AU検定にかけるツリーの尤度一覧
             branch_index (int): 枝番号
             branch_count (int): 枝数
             seed (int): シード値
+
+        Raises:
+            CalledProcessError: CONSELのプログラムが0以外の終了コードを返した
+            IndexError: CATPVファイルに結果が含まれていない
+
+        Returns:
+            CatpvResult: CATPVファイルの情報
         """
         operation_start = datetime.now()
-        consel_log: TextIOWrapper
-        catpv_outpath: str = self.__args.get_out_file_path(f"{branch_index}.catpv")
+        journal: CheckpointJournal | None = self.__journal
+        fingerprint: str = self.__fingerprints[branch_index]
+
+        with self.__acquire_memory(), self.__acquire_cores(1), self.__span(f"AU test {branch_index}", "au_test", bipartition=branch_index), self.__ledger.scope("au_test", branch_index):
+            result, replicates = tester.test(slh_set, branch_index, branch_count, seed, journal, fingerprint)
+        self.__replicates[branch_index] = replicates
+        if journal is not None:
+            journal.record_result(branch_index, fingerprint, result, replicates)
+            journal.discard(CheckpointJournal.STAGE_MAKERMT, branch_index)
+            journal.discard(CheckpointJournal.STAGE_CONSEL, branch_index)
+        self.__write_result(branch_index, result, BipartitionTester.get_delta_lnl(slh_set, 1), replicates, (datetime.now() - operation_start).total_seconds(), True)
+        with self.__span("release intermediates", "archive", bipartition=branch_index):
+            tmp_size: int = self.__release_tmpfiles(branch_index)
+        if self.__metrics is not None:
+            self.__metrics.add_io("au_test", branch_index, tmp_size)
+            self.__metrics.add_usage("au_test", branch_index, self.__ledger.get("au_test", branch_index))
+
+        operation_end = datetime.now()
+        print(f"  Operation No. {branch_index} / {branch_count - 1} finished in {(operation_end - operation_start)}", file=self.__logger)
+        return result
+
+    def __flush_records(self, journal: CheckpointJournal, results: ResultTable) -> None:
+        """ジャーナルと結果の表にまとめられた記録をコミットします。
+
+        Args:
+            journal (CheckpointJournal): 完了した処理を記録するジャーナル
+            results (ResultTable): 二分岐ごとの検定結果を保存する表
+        """
+        with self.__span("commit records", "io"):
+            journal.flush()
+            results.flush()
 
-        # skip if IQ-TREE is executed (with log)
-        if not self.__args.redo and os.path.isfile(catpv_outpath):
-            print(f"  Operation No. {branch_index} / {branch_count - 1} has already done (skipped).", file=self.__logger)
+    def __limit_memory(self, site_count: int) -> None:
+        """座位数から1つのAU検定が用いるメモリを見積もり，メモリに収まる同時実行数を設定します。設定は最初の呼び出しでのみ行われます。
+
+        Args:
+            site_count (int): 座位数
+        """
+        with self.__memory_lock:
+            if self.__memory_slots is not None:
+                return
+            # the adaptive RELL-bootstrap may increase the replicates up to '-b'
+            job_memory: int = ConselManager.estimate_memory(site_count, self.__args.rell_boot)
+            memory_workers: int = self.__limits.get_max_jobs(job_memory)
+            if memory_workers < self.__consel_workers:
+                print(f"AU tests run in {memory_workers} threads at once due to the memory limit", file=self.__logger)
+            self.__memory_slots = Semaphore(min(self.__consel_workers, memory_workers))
+
+    @contextmanager
+    def __acquire_memory(self) -> Generator[None, None, None]:
+        """メモリの上限に収まるよう，AU検定の実行を待機します。
+        """
+        if self.__memory_slots is None:
+            yield
             return
+        with self.__memory_slots:
+            yield
 
-        # export
-        slh_set.export(self.__args.get_out_file_path(f"{branch_index}.sitelh"))
-
-        # execute CONSEL
-        if not self.__args.redo and not os.path.isfile(catpv_outpath):
-            if not self.__args.redo and not os.path.isfile(self.__args.get_out_file_path(f"{branch_index}.pv")):
-                if not self.__args.redo and not os.path.isfile(self.__args.get_out_file_path(f"{branch_index}.rmt")):
-                    # 1. makermt
-                    with open(self.__args.get_out_file_path(f"{branch_index}-makermt.log"), "wt") as consel_log:
-                        consel_manager.makermt(f"{branch_index}.sitelh", seed, self.__args.rell_boot, cwd=self.__args.out_dir, stdout=consel_log)
-                # 2. consel
-                with open(self.__args.get_out_file_path(f"{branch_index}-consel.log"), "wt") as consel_log:
-                    consel_manager.consel(str(branch_index), cwd=self.__args.out_dir, stdout=consel_log)
-            # 3. catpv
-            with open(catpv_outpath, "wt") as consel_log:
-                consel_manager.catpv(str(branch_index), cwd=self.__args.out_dir, stdout=consel_log)
+    def __acquire_cores(self, cores: int) -> ContextManager[int]:
+        """他のデータセットの処理と共有するコアを割り当てます。コアを共有しない場合は何もしません。
 
-        operation_end = datetime.now()
-        print(f"  Operation No. {branch_index} / {branch_count - 1} finished in {(operation_end - operation_start)}", file=self.__logger)
+        Args:
+            cores (int): 要求するコア数
+
+        Returns:
+            ContextManager[int]: 割り当てられたコア数を返すコンテキストマネージャー
+        """
+        if self.__pool is None:
+            return nullcontext(cores)
+        if self.__tracer is not None:
+            return self.__acquire_traced_cores(self.__pool, cores)
+        return self.__pool.acquire(cores)
 
-    def __iterate_all_tmpfiles(self, index: int) -> Generator[str, None, None]:
-        """インデックスに対応する中間ファイルを全て列挙します。
+    @contextmanager
+    def __acquire_traced_cores(self, pool: CorePool, cores: int) -> Generator[int, None, None]:
+        """コアを割り当て，割り当てを待機した区間を記録します。
 
         Args:
-            index (int): インデックス
+            pool (CorePool): コアを割り当てるCorePool
+            cores (int): 要求するコア数
 
         Yields:
-            Generator[str, None, None]: indexに対応する枝の中間ファイル名を列挙するイテレータのインスタンス
+            Generator[int, None, None]: 割り当てられたコア数
+        """
+        with ExitStack() as stack:
+            with self.__span("wait for cores", "wait", cores=cores):
+                threads: int = stack.enter_context(pool.acquire(cores))
+            yield threads
+
+    def __span(self, name: str, category: str, **args: Any) -> ContextManager[None]:
+        """処理の区間を記録するコンテキストマネージャーを取得します。トレースを出力しない場合は何もしません。
+
+        Args:
+            name (str): 区間の名前
+            category (str): 区間の分類
+            args (Any): 区間に付加する値
+
+        Returns:
+            ContextManager[None]: 区間を記録するコンテキストマネージャー
+        """
+        if self.__tracer is None:
+            return nullcontext()
+        return self.__tracer.span(name, category, **args)
+
+    def __create_job_payload(self, branch_index: int, branch_count: int, seed: int) -> dict:
+        """ワーカーが二分岐の検定を行うためのジョブの内容を作成します。
+
+        Args:
+            branch_index (int): 枝番号
+            branch_count (int): 枝数
+            seed (int): シード値
+
+        Returns:
+            dict: ジョブの内容
+        """
+        return {
+            "index": branch_index,
+            "branch_count": branch_count,
+            "seed": seed,
+            "store": self.__args.sitelh_store_path,
+            "fingerprint": self.__sitelh_fingerprint,
+            "topologies": self.__topologies[branch_index],
+            "rell_boot": self.__args.rell_boot,
+            "adaptive_bootstrap": self.__args.adaptive_bootstrap,
+            "sig_level": self.__args.sig_level,
+        }
+
+    def __collect_jobs(self, queue: WorkQueue, branch_count: int) -> dict[int, CatpvResult]:
+        """ジョブキューに追加した全てのジョブが終了するまで待機し，結果を取得します。
+
+        Args:
+            queue (WorkQueue): ジョブキュー
+            branch_count (int): 枝数
+
+        Raises:
+            JobExecutionError: 再実行を含めて失敗したジョブが存在する（全てのジョブの終了後に送出）
+
+        Returns:
+            dict[int, CatpvResult]: 二分岐のインデックスと検定結果
+        """
+        results: dict[int, CatpvResult] = dict[int, CatpvResult]()
+        failures: dict[object, BaseException] = dict[object, BaseException]()
+        remaining: set[int] = set(self.__queued)
+        if len(remaining) > 0:
+            print(f"Waiting for {len(remaining)} jobs in '{queue.path}' (start workers by 'python -m autoeb worker {queue.path}')", file=self.__logger)
+        while len(remaining) > 0:
+            for job_id, state, value in queue.collect():
+                if not job_id in remaining:
+                    continue
+                remaining.remove(job_id)
+                if self.__progress is not None:
+                    self.__progress.start(job_id)
+                    self.__progress.finish(job_id, state == WorkQueue.STATE_DONE)
+                if state != WorkQueue.STATE_DONE:
+                    print(f"  Operation No. {job_id} / {branch_count - 1} failed: {value}", file=self.__logger)
+                    failures[job_id] = RuntimeError(value)
+                    continue
+                result: CatpvResult = CatpvResult.from_rows(value["entries"])
+                replicates: int = value["replicates"]
+                self.__replicates[job_id] = replicates
+                if self.__journal is not None:
+                    self.__journal.record_result(job_id, self.__fingerprints[job_id], result, replicates)
+                self.__write_result(job_id, result, (value["delta_lnl"][0], value["delta_lnl"][1]), replicates, value["elapsed"], True)
+                results[job_id] = result
+                print(f"  Operation No. {job_id} / {branch_count - 1} finished in {value['elapsed']:.3f} s by worker '{value['worker']}'", file=self.__logger)
+            if len(remaining) > 0:
+                time.sleep(self.__QUEUE_POLL_INTERVAL)
+        if len(failures) > 0:
+            raise JobExecutionError(failures)
+        return results
+
+    def __write_result(self, branch_index: int, result: CatpvResult, delta_lnl: Tuple[float, float], replicates: int | None, elapsed: float | None, replace: bool, supported: bool | None = None) -> None:
+        """二分岐の検定結果を結果の表に保存します。
+
+        Args:
+            branch_index (int): 枝番号
+            result (CatpvResult): 検定結果
+            delta_lnl (Tuple[float, float]): NNI樹形の対数尤度から最尤樹形の対数尤度を引いた値
+            replicates (int | None): RELL bootstrapの複製数。複製を生成していない場合はNone
+            elapsed (float | None): 検定に要した時間（秒）
+            replace (bool): 保存された結果を置き換えるかどうか
+            supported (bool | None, optional): 二分岐が支持されるかどうか。Noneで有意水準とAU検定のp値から判定する. Defaults to None.
+        """
+        if self.__results is None:
+            return
+        if supported is None:
+            supported = result.stat_nni1.au < self.__args.sig_level and result.stat_nni2.au < self.__args.sig_level
+        method: str = "prescreen" if branch_index in self.__screened else "consel"
+        self.__results.write(branch_index, self.__splits[branch_index], self.__fingerprints[branch_index], method, replicates, supported, delta_lnl, result, elapsed, replace)
+
+    @staticmethod
+    def __estimate_delta_lnl(result: CatpvResult) -> Tuple[float, float]:
+        """検定結果の統計量obsからNNI樹形と最尤樹形の対数尤度の差を計算します。
+
+        Args:
+            result (CatpvResult): 検定結果
+
+        Returns:
+            Tuple[float, float]: NNI樹形の対数尤度から最尤樹形の対数尤度を引いた値
+        """
+        # obs is the difference from the best of the other trees, i.e. L_best - L_i except for the best tree
+        differences: list[float] = [0.0 if stat.rank == 1 else -stat.obs for stat in [result.stat_ml, result.stat_nni1, result.stat_nni2]]
+        return (differences[1] - differences[0], differences[2] - differences[0])
+
+    def __create_metadata(self, sequence_path: str, tree_path: str, seed: int, other_params: str) -> dict[str, str]:
+        """結果の表に保存する解析の条件を作成します。出力先を分けて解析した結果を統合する際に照合されます。
+
+        Args:
+            sequence_path (str): 配列ファイルのパス
+            tree_path (str): 最尤樹形のファイルのパス
+            seed (int): 実際に用いたシード値
+            other_params (str): IQ-TREEのその他引数
+
+        Returns:
+            dict[str, str]: 条件の名前と値
+        """
+        return {
+            "sequence": ModelCache.hash_file(sequence_path),
+            "tree": ModelCache.hash_file(tree_path),
+            "model": self.__args.model,
+            "iqtree_params": other_params,
+            "seed": str(seed),
+            "seed_generated": str(self.__args.seed == -1),
+            "sig_level": str(self.__args.sig_level),
+            "rell_boot": str(self.__args.rell_boot),
+            "adaptive_bootstrap": str(self.__args.adaptive_bootstrap or ""),
+            "prescreen": str(self.__args.prescreen),
+            "out_format": self.__args.out_format,
+        }
+
+    def __create_test_fingerprint(self, sitelh_fingerprint: str, tree_hash: str, nni_hashes: Tuple[str, str], seed: int) -> str:
+        """二分岐の検定の入力を表すフィンガープリントを生成します。
+
+        Args:
+            sitelh_fingerprint (str): サイト尤度の計算条件のフィンガープリント
+            tree_hash (str): 最尤樹形のトポロジーのハッシュ値
+            nni_hashes (Tuple[str, str]): NNI樹形のトポロジーのハッシュ値
+            seed (int): シード値
+
+        Returns:
+            str: フィンガープリント
+        """
+        source: list[str] = [sitelh_fingerprint, tree_hash, nni_hashes[0], nni_hashes[1], str(seed), str(self.__args.rell_boot)]
+        if self.__bootstrap is not None:
+            # decisions of the adaptive bootstrap depend on the significance level
+            source += [str(self.__args.adaptive_bootstrap), str(self.__args.sig_level)]
+        return hashlib.sha256(str.join("\n", source).encode()).hexdigest()
+
+    def __iterate_sitelh_tmpfiles(self) -> Generator[str, None, None]:
+        """NNI樹形と尤度計算の中間ファイルを全て列挙します。
+
+        Yields:
+            Generator[str, None, None]: NNI樹形と尤度計算の中間ファイル名を列挙するイテレータのインスタンス
+        """
+        yield from glob.glob(OUTFILE_ALL_TREES, root_dir=self.__args.out_dir)
+        yield from glob.glob("all-*.treeset", root_dir=self.__args.out_dir)
+        yield from glob.glob("trees.*", root_dir=self.__args.out_dir)
+        yield from glob.glob("trees-*.*", root_dir=self.__args.out_dir)
+        yield from glob.glob(f"{OUTFILE_MODEL_PREFIX}.*", root_dir=self.__args.out_dir)
+
+    def __open_archive(self) -> TmpArchive:
+        """中間ファイルのアーカイブを作成します。既存のアーカイブは別名で残されます（--redoを除く）。
+
+        Returns:
+            TmpArchive: 中間ファイルのアーカイブ
+        """
+        path: str = self.__args.get_out_file_path(TmpArchive.get_file_name(self.__args.tmp_compression))
+        if not self.__args.redo and os.path.isfile(path):
+            stem, ext = path.split(".tar", 1)
+            number: int = 1
+            while os.path.exists(f"{stem}-{number}.tar{ext}"):
+                number += 1
+            os.rename(path, f"{stem}-{number}.tar{ext}")
+            print(f"Previous temporary files are kept in '{stem}-{number}.tar{ext}'", file=self.__logger)
+        return TmpArchive(path, self.__args.tmp_compression, self.__threads)
+
+    def __release_tmpfiles(self, index: int) -> int:
+        """検定が終了した二分岐の中間ファイルをアーカイブに追加するか削除します。
+
+        Args:
+            index (int): 二分岐のインデックス
+
+        Returns:
+            int: 中間ファイルの大きさの合計（バイト）
+        """
+        files: list[str] = []
+        for name in [f"{index}.sitelh", f"{index}.rmt", f"{index}.pv", f"{index}.vt", f"{index}.ci", f"{index}.catpv", f"{index}-makermt.log", f"{index}-consel.log"]:
+            path: str = self.__scratch.get_file_path(name)
+            if os.path.isfile(path):
+                files.append(path)
+        result: int = sum([os.path.getsize(file) for file in files])
+        if self.__archive is not None:
+            self.__archive.move(files)
+        else:
+            for file in files:
+                os.remove(file)
+        return result
+
+    def __list_bipartition_tmpfiles(self, indices: Container[int]) -> list[str]:
+        """二分岐の中間ファイルを一覧にします。ディレクトリは一度だけ走査されます。
+
+        Args:
+            indices (Container[int]): 二分岐のインデックス
+
+        Returns:
+            list[str]: 中間ファイルのパス（出力先と作業ディレクトリに同名のファイルがある場合は出力先のみ）
         """
-        yield from glob.glob(f"{index}.*", root_dir=self.__args.out_dir)
-        yield from glob.glob(f"{index}-nni1.*", root_dir=self.__args.out_dir)
-        yield from glob.glob(f"{index}-nni2.*", root_dir=self.__args.out_dir)
-        yield f"{index}-makermt.log"
-        yield f"{index}-consel.log"
+        found: dict[str, str] = dict[str, str]()
+        for directory in dict.fromkeys([self.__args.out_dir, self.__scratch.path]):
+            for file in sorted(os.listdir(directory)):
+                match = self.__TMPFILE_PATTERN.match(file)
+                if match is not None and int(match.group(1)) in indices and not file in found:
+                    found[file] = os.path.join(directory, file)
+        return list(found.values())
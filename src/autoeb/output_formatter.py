@@ -23,7 +23,9 @@ class OutputFormatter:
         'pp',
         'bp',
         'mbp',
+        'screen',
     }
+    __NOT_AVAILABLE: str = "NA"
 
     def __init__(self, format: str) -> None:
         """OutputFormatterの新しインスタンスを初期化します。
@@ -49,13 +51,14 @@ class OutputFormatter:
                 return False
         return True
 
-    def format(self, src: str, catpv: CatpvResult, sig_level: float) -> str:
+    def format(self, src: str, catpv: CatpvResult, sig_level: float, screen: bool | None = None) -> str:
         """出力ツリーの枝名を取得します。
 
         Args:
             src (str): 元の枝名
-            catpv (CatpvResult): CATPVファイルの情報
+            catpv (CatpvResult): CATPVファイルの情報，または事前判定の統計量
             sig_level (float): 有意水準
+            screen (bool | None, optional): 事前判定による支持（True）・不支持（False）。事前判定で結果が確定していない場合はNone. Defaults to None.
 
         Returns:フォーマットされた枝名
         """
@@ -63,8 +66,8 @@ class OutputFormatter:
         # Formats of "fmt"
         #
         # {src}: Support values in given tree
-        # {bin}, {au-bin}: 0/1 value by AU test
-        # {p}, {au-p}: p-value of the alternative topology greater than the other by AU test
+        # {bin}, {au-bin}: 0/1 value by AU test, or the decision of the pre-screen
+        # {p}, {au-p}: p-value of the alternative topology greater than the other by AU test ("NA" if decided by the pre-screen)
         # {sh-bin}: 0/1 value by SH test
         # {sh-p}: p-value of the alternative topology greater than the other by SH test
         # {kh-bin}: 0/1 value by KH test
@@ -76,10 +79,16 @@ class OutputFormatter:
         # {dlnL}: Observed log-likelihood difference of the alternative topology less than the other
         # {pp}: Bayesian posterior probability of the ML tree
         # {bp}: Bootstrap probability of the ML tree
-        # {mbp}: Bootstrap probability of the ML tree calculated from the multiscale bootstrap
+        # {mbp}: Bootstrap probability of the ML tree calculated from the multiscale bootstrap ("NA" if decided by the pre-screen)
+        # {screen}: 1 if the bipartition is decided by the pre-screen, otherwise 0
 
-        max_au_p: float = max(catpv.stat_nni1.au, catpv.stat_nni2.au)
-        au_bin: str = RESULT_OK if sig_level > max_au_p else RESULT_NG
+        # AU test is not performed for the bipartitions decided by the pre-screen
+        max_au_p: float | str = self.__NOT_AVAILABLE if screen is not None else max(catpv.stat_nni1.au, catpv.stat_nni2.au)
+        au_bin: str
+        if screen is not None:
+            au_bin = RESULT_OK if screen else RESULT_NG
+        else:
+            au_bin = RESULT_OK if sig_level > max(catpv.stat_nni1.au, catpv.stat_nni2.au) else RESULT_NG
         max_sh_p: float = max(catpv.stat_nni1.sh, catpv.stat_nni2.sh)
         sh_bin: str = RESULT_OK if sig_level > max_sh_p else RESULT_NG
         max_kh_p: float = max(catpv.stat_nni1.kh, catpv.stat_nni2.kh)
@@ -107,7 +116,8 @@ class OutputFormatter:
             'dlnL': min_obs,
             'pp': catpv.stat_ml.pp,
             'bp': '{:.01f}'.format(catpv.stat_ml.brell * 100),
-            'mbp': '{:.01f}'.format(catpv.stat_ml.np * 100),
+            'mbp': self.__NOT_AVAILABLE if screen is not None else '{:.01f}'.format(catpv.stat_ml.np * 100),
+            'screen': RESULT_NG if screen is None else RESULT_OK,
         }
 
         return self.__format.format(**replace_dict)
@@ -0,0 +1,218 @@
+import math
+from operator import mul, sub
+
+from .catpv_result import CatpvResult
+from .slh_data import SlhData
+from .statistics_entry import StatisticsEntry
+
+
+class Prescreen:
+    """サイト尤度からKH検定・SH検定などの統計量を正規近似で計算し，AU検定を行う前に二分岐をふるい分けます。
+    """
+
+    __FACTOR: float = 10.0
+    __INTERVALS: int = 200
+
+    def __init__(self, sig_level: float) -> None:
+        """Prescreenの新しいインスタンスを初期化します。
+
+        Args:
+            sig_level (float): 有意水準
+        """
+        self.__sig_level: float = sig_level
+
+    @property
+    def supported_threshold(self) -> float:
+        """全てのNNI樹形のSH検定のp値がこの値を下回る場合に，二分岐が支持されると判定する閾値を取得します。
+        """
+        return self.__sig_level / self.__FACTOR
+
+    @property
+    def unsupported_threshold(self) -> float:
+        """いずれかのNNI樹形のKH検定のp値がこの値を上回る場合に，二分岐が支持されないと判定する閾値を取得します。
+        """
+        return min(self.__sig_level * self.__FACTOR, 0.5)
+
+    def evaluate(self, sitelh: SlhData) -> list[CatpvResult]:
+        """最尤樹形と二分岐ごとのNNI樹形2つのサイト尤度から，二分岐ごとの統計量を計算します。
+
+        Args:
+            sitelh (SlhData): 最尤樹形と，二分岐ごとのNNI樹形2つの尤度一覧
+
+        Returns:
+            list[CatpvResult]: 二分岐ごとの統計量。AU検定は行わないため，AU検定のp値とマルチスケール・ブートストラップによるBPはNaN
+        """
+        ml: list[float] = sitelh[0]
+        site_count: int = len(ml)
+        ml_total: float = math.fsum(ml)
+        result: list[CatpvResult] = []
+        for tree_index in range(1, sitelh.tree_count, 2):
+            diff_1: list[float] = list(map(sub, sitelh[tree_index], ml))
+            diff_2: list[float] = list(map(sub, sitelh[tree_index + 1], ml))
+            sum_1: float = math.fsum(diff_1)
+            sum_2: float = math.fsum(diff_2)
+            # covariance of the differences of the total log-likelihood under resampling of sites
+            cov_11: float = math.fsum(map(mul, diff_1, diff_1)) - sum_1 * sum_1 / site_count
+            cov_22: float = math.fsum(map(mul, diff_2, diff_2)) - sum_2 * sum_2 / site_count
+            cov_12: float = math.fsum(map(mul, diff_1, diff_2)) - sum_1 * sum_2 / site_count
+            result.append(self.__create_result([ml_total, ml_total + sum_1, ml_total + sum_2], [[0.0, 0.0, 0.0], [0.0, cov_11, cov_12], [0.0, cov_12, cov_22]]))
+        return result
+
+    def decide(self, result: CatpvResult) -> bool | None:
+        """統計量から二分岐の支持・不支持を判定します。
+
+        Args:
+            result (CatpvResult): evaluate()で計算した統計量
+
+        Returns:
+            bool | None: 支持される場合はTrue，支持されない場合はFalse，判定できない場合はNone
+        """
+        return self.__decide([result.stat_nni1.sh, result.stat_nni2.sh], [result.stat_nni1.kh, result.stat_nni2.kh])
+
+    def __decide(self, sh: list[float], kh: list[float]) -> bool | None:
+        """NNI樹形のSH検定とKH検定のp値から二分岐の支持・不支持を判定します。
+
+        Args:
+            sh (list[float]): NNI樹形のSH検定のp値
+            kh (list[float]): NNI樹形のKH検定のp値
+
+        Returns:
+            bool | None: 支持される場合はTrue，支持されない場合はFalse，判定できない場合はNone
+        """
+        if max(sh) < self.supported_threshold:
+            return True
+        if max(kh) > self.unsupported_threshold:
+            return False
+        return None
+
+    def __create_result(self, totals: list[float], cov: list[list[float]]) -> CatpvResult:
+        """3つのツリーの対数尤度と，最尤樹形との差の共分散から統計量を計算します。
+
+        Args:
+            totals (list[float]): ツリーごとの対数尤度
+            cov (list[list[float]]): 最尤樹形との対数尤度の差の共分散行列
+
+        Returns:
+            CatpvResult: 統計量
+        """
+        max_total: float = max(totals)
+        weights: list[float] = [math.exp(t - max_total) for t in totals]
+        entries: list[StatisticsEntry] = []
+        stats: list[dict[str, float]] = []
+        for i in range(3):
+            j, k = [t for t in range(3) if t != i]
+            # variances of L_j - L_i, L_k - L_i and their correlation
+            var_j: float = max(cov[j][j] + cov[i][i] - 2 * cov[i][j], 0.0)
+            var_k: float = max(cov[k][k] + cov[i][i] - 2 * cov[i][k], 0.0)
+            cov_jk: float = cov[j][k] - cov[j][i] - cov[i][k] + cov[i][i]
+            sd_j: float = math.sqrt(var_j)
+            sd_k: float = math.sqrt(var_k)
+            rho: float = cov_jk / (sd_j * sd_k) if sd_j > 0 and sd_k > 0 else 0.0
+            delta_j: float = totals[j] - totals[i]
+            delta_k: float = totals[k] - totals[i]
+            obs: float = max(delta_j, delta_k)
+
+            # KH test against the best of the others
+            kh: float = self.__upper_normal(obs, sd_j if delta_j >= delta_k else sd_k)
+            # SH test and weighted SH test
+            sh: float = 1.0 if obs <= 0 else 1.0 - self.bivariate_normal(self.__standardize(obs, sd_j), self.__standardize(obs, sd_k), rho)
+            weighted: float = max(self.__standardize(delta_j, sd_j), self.__standardize(delta_k, sd_k))
+            wsh: float = 1.0 - self.bivariate_normal(weighted, weighted, rho)
+            # weighted KH test against the best of the others in the standardized differences
+            wkh: float = 1.0 - self.__normal(weighted)
+            # bootstrap probability that the tree has the largest log-likelihood
+            bp: float = self.bivariate_normal(self.__standardize(-delta_j, sd_j), self.__standardize(-delta_k, sd_k), rho)
+            stats.append({"obs": obs, "kh": kh, "sh": sh, "wkh": wkh, "wsh": wsh, "bp": bp, "pp": weights[i] / math.fsum(weights)})
+
+        ranks: list[int] = sorted(range(3), key=lambda t: totals[t], reverse=True)
+        for i in range(3):
+            stat: dict[str, float] = stats[i]
+            entries.append(StatisticsEntry(
+                ranks.index(i) + 1,
+                i + 1,
+                stat["obs"],
+                math.nan,
+                math.nan,
+                stat["bp"],
+                stat["pp"],
+                stat["kh"],
+                stat["sh"],
+                stat["wkh"],
+                stat["wsh"]))
+        return CatpvResult.create(entries)
+
+    @staticmethod
+    def __standardize(value: float, sd: float) -> float:
+        """値を標準偏差で割ります。標準偏差が0の場合は符号に応じて無限大を返します。
+
+        Args:
+            value (float): 値
+            sd (float): 標準偏差
+
+        Returns:
+            float: 標準化された値
+        """
+        if sd > 0:
+            return value / sd
+        if value == 0:
+            return 0.0
+        return math.copysign(math.inf, value)
+
+    @classmethod
+    def __upper_normal(cls, value: float, sd: float) -> float:
+        """正規分布N(0, sd^2)の上側確率を計算します。
+
+        Args:
+            value (float): 値
+            sd (float): 標準偏差
+
+        Returns:
+            float: 上側確率
+        """
+        return 1.0 - cls.__normal(cls.__standardize(value, sd))
+
+    @staticmethod
+    def __normal(x: float) -> float:
+        """標準正規分布の累積分布関数を計算します。
+
+        Args:
+            x (float): 値
+
+        Returns:
+            float: 累積確率
+        """
+        return 0.5 * math.erfc(-x / math.sqrt(2))
+
+    @classmethod
+    def bivariate_normal(cls, h: float, k: float, rho: float) -> float:
+        """相関係数rhoの標準2変量正規分布の累積分布関数 P(X <= h, Y <= k) を計算します。
+
+        Args:
+            h (float): Xの上限
+            k (float): Yの上限
+            rho (float): 相関係数
+
+        Returns:
+            float: 累積確率
+        """
+        if math.isinf(h) or math.isinf(k):
+            if h == -math.inf or k == -math.inf:
+                return 0.0
+            return cls.__normal(min(h, k))
+        if rho > 1 - 1e-9:
+            return cls.__normal(min(h, k))
+        if rho < -1 + 1e-9:
+            return max(cls.__normal(h) + cls.__normal(k) - 1.0, 0.0)
+
+        # integrate phi(x) * Phi((k - rho x) / sqrt(1 - rho^2)) from -8 to h by Simpson's rule
+        lower: float = -8.0
+        if h <= lower:
+            return 0.0
+        scale: float = math.sqrt(1 - rho * rho)
+        width: float = (min(h, -lower) - lower) / cls.__INTERVALS
+        total: float = 0.0
+        for index in range(cls.__INTERVALS + 1):
+            x: float = lower + width * index
+            value: float = math.exp(-x * x / 2) * cls.__normal((k - rho * x) / scale)
+            total += value * (1 if index == 0 or index == cls.__INTERVALS else (4 if index % 2 == 1 else 2))
+        return min(max(total * width / 3 / math.sqrt(2 * math.pi), 0.0), 1.0)
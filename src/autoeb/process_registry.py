@@ -0,0 +1,158 @@
+import os
+import signal
+import subprocess
+from subprocess import CalledProcessError, CompletedProcess, Popen, TimeoutExpired
+import sys
+from threading import RLock
+import time
+from types import FrameType
+from typing import IO, Any, Tuple
+
+from .operation_cancelled_error import OperationCancelledError
+from .process_usage import ProcessUsage
+
+
+class ProcessRegistry:
+    """実行中の外部プログラムを管理し，シグナルを受け取った際にまとめて終了させます。
+    """
+
+    __instance: "ProcessRegistry | None" = None
+    __TERMINATE_TIMEOUT: float = 5.0
+
+    def __init__(self) -> None:
+        """ProcessRegistryの新しいインスタンスを初期化します。
+        """
+        # the signal handler may interrupt the main thread holding the lock
+        self.__lock = RLock()
+        self.__processes: set[Popen[bytes]] = set[Popen[bytes]]()
+        self.__signal_number: int | None = None
+
+    @classmethod
+    def get_instance(cls) -> "ProcessRegistry":
+        """プロセス全体で共有するインスタンスを取得します。
+
+        Returns:
+            ProcessRegistry: 共有するインスタンス
+        """
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+    @property
+    def is_cancelled(self) -> bool:
+        """処理が取り消されたかどうかを取得します。
+        """
+        return self.__signal_number is not None
+
+    @property
+    def signal_number(self) -> int | None:
+        """処理を取り消したシグナルの番号を取得します。取り消されていない場合はNoneです。
+        """
+        return self.__signal_number
+
+    def run(self, command: list[str], cwd: str | None = None, stdout: IO | None = None) -> CompletedProcess[bytes]:
+        """外部プログラムをシェルを介さずに実行し，終了を待機します。
+
+        Args:
+            command (list[str]): プログラムと引数の一覧
+            cwd (str | None, optional): 実行ディレクトリ. Defaults to None.
+            stdout (IO | None, optional): 出力先. Defaults to None.
+
+        Raises:
+            OperationCancelledError: 処理が取り消された
+            CalledProcessError: プログラムが0以外の終了コードを返した
+
+        Returns:
+            CompletedProcess[bytes]: 実行結果
+        """
+        return self.run_measured(command, os.path.basename(command[0]), cwd, stdout)[0]
+
+    def run_measured(self, command: list[str], program: str, cwd: str | None = None, stdout: IO | None = None) -> Tuple[CompletedProcess[bytes], ProcessUsage]:
+        """外部プログラムをシェルを介さずに実行し，終了を待機して資源の使用量を取得します。
+
+        Args:
+            command (list[str]): プログラムと引数の一覧
+            program (str): 使用量に記録するプログラム名
+            cwd (str | None, optional): 実行ディレクトリ. Defaults to None.
+            stdout (IO | None, optional): 出力先. Defaults to None.
+
+        Raises:
+            OperationCancelledError: 処理が取り消された
+            CalledProcessError: プログラムが0以外の終了コードを返した
+
+        Returns:
+            Tuple[CompletedProcess[bytes], ProcessUsage]: 実行結果と資源の使用量
+        """
+        with self.__lock:
+            if self.is_cancelled:
+                raise OperationCancelledError(command[0])
+            start: float = time.monotonic()
+            process: Popen[bytes] = subprocess.Popen(command, cwd=cwd, stdout=stdout)
+            self.__processes.add(process)
+        try:
+            return_code, rusage = self.__wait(process)
+        finally:
+            with self.__lock:
+                self.__processes.discard(process)
+        wall_time: float = time.monotonic() - start
+        if self.is_cancelled:
+            raise OperationCancelledError(command[0])
+        if return_code != 0:
+            raise CalledProcessError(return_code, command)
+        usage: ProcessUsage
+        if rusage is None:
+            usage = ProcessUsage(program, 0, 0, 0, wall_time)
+        else:
+            # ru_maxrss is in kilobytes except on macOS
+            usage = ProcessUsage(program, rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024), wall_time)
+        return (CompletedProcess(command, return_code), usage)
+
+    def cancel(self, signal_number: int) -> None:
+        """新しいプログラムの実行を禁止し，実行中のプログラムを全て終了させます。
+
+        Args:
+            signal_number (int): 処理を取り消したシグナルの番号
+        """
+        with self.__lock:
+            if self.__signal_number is None:
+                self.__signal_number = signal_number
+            processes: list[Popen[bytes]] = list(self.__processes)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(self.__TERMINATE_TIMEOUT)
+            except TimeoutExpired:
+                process.kill()
+
+    @staticmethod
+    def __wait(process: Popen[bytes]) -> Tuple[int, Any]:
+        """プログラムの終了を待機し，終了コードと資源の使用量（struct_rusage）を取得します。
+
+        Args:
+            process (Popen[bytes]): 実行中のプログラム
+
+        Returns:
+            Tuple[int, Any]: 終了コードと資源の使用量。使用量を取得できない場合はNone
+        """
+        if not hasattr(os, "wait4"):
+            return (process.wait(), None)
+        try:
+            status: int
+            _, status, rusage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            # already reaped by Popen while the program is terminated by the cancellation
+            return (process.wait(), None)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return (process.returncode, rusage)
+
+    def install_signal_handlers(self) -> None:
+        """SIGINTとSIGTERMを受け取った際に，実行中のプログラムを終了させてKeyboardInterruptを送出するように設定します。
+        メインスレッドから呼び出す必要があります。
+        """
+        def handle(signal_number: int, frame: FrameType | None) -> None:
+            self.cancel(signal_number)
+            raise KeyboardInterrupt()
+
+        signal.signal(signal.SIGINT, handle)
+        signal.signal(signal.SIGTERM, handle)
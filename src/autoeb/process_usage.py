@@ -0,0 +1,75 @@
+class ProcessUsage:
+    """外部プログラムの実行に用いた資源（CPU時間，最大常駐メモリ，経過時間）を表します。
+    """
+
+    def __init__(self, program: str, user_time: float, system_time: float, max_rss: int, wall_time: float, processes: int = 1) -> None:
+        """ProcessUsageの新しいインスタンスを初期化します。
+
+        Args:
+            program (str): プログラム名
+            user_time (float): ユーザーCPU時間（秒）
+            system_time (float): システムCPU時間（秒）
+            max_rss (int): 最大常駐メモリ（バイト）
+            wall_time (float): 経過時間（秒）
+            processes (int, optional): プロセス数. Defaults to 1.
+        """
+        self.__program: str = program
+        self.__user_time: float = user_time
+        self.__system_time: float = system_time
+        self.__max_rss: int = max_rss
+        self.__wall_time: float = wall_time
+        self.__processes: int = processes
+
+    @property
+    def program(self) -> str:
+        """プログラム名を取得します。
+        """
+        return self.__program
+
+    @property
+    def user_time(self) -> float:
+        """ユーザーCPU時間（秒）を取得します。
+        """
+        return self.__user_time
+
+    @property
+    def system_time(self) -> float:
+        """システムCPU時間（秒）を取得します。
+        """
+        return self.__system_time
+
+    @property
+    def max_rss(self) -> int:
+        """最大常駐メモリ（バイト）を取得します。
+        """
+        return self.__max_rss
+
+    @property
+    def wall_time(self) -> float:
+        """経過時間（秒）を取得します。
+        """
+        return self.__wall_time
+
+    @property
+    def processes(self) -> int:
+        """プロセス数を取得します。
+        """
+        return self.__processes
+
+    def merge(self, other: "ProcessUsage", program: str | None = None) -> "ProcessUsage":
+        """2つの使用量を合計します。最大常駐メモリは大きい方の値です。
+
+        Args:
+            other (ProcessUsage): 合計する使用量
+            program (str | None, optional): 合計のプログラム名。Noneでこのインスタンスのプログラム名. Defaults to None.
+
+        Returns:
+            ProcessUsage: 合計した使用量
+        """
+        return ProcessUsage(
+            self.__program if program is None else program,
+            self.__user_time + other.user_time,
+            self.__system_time + other.system_time,
+            max(self.__max_rss, other.max_rss),
+            self.__wall_time + other.wall_time,
+            self.__processes + other.processes)
@@ -0,0 +1,174 @@
+from datetime import timedelta
+from threading import Event, Lock, Thread
+import time
+from types import TracebackType
+from typing import Hashable, TextIO, Tuple
+
+from .metrics_recorder import MetricsRecorder
+
+
+class ProgressMonitor:
+    """ジョブの待機中・実行中・完了・失敗の数を集計し，別のスレッドから定期的に表示します。
+    ジョブの状態の変化はMetricsRecorderにも記録されます。
+    """
+
+    __TTY_INTERVAL: float = 1.0
+    __LOG_INTERVAL: float = 30.0
+
+    def __init__(self, title: str, total: int, stream: TextIO | None, metrics: MetricsRecorder | None = None, stage: str = "") -> None:
+        """ProgressMonitorの新しいインスタンスを初期化します。
+
+        Args:
+            title (str): 表示する処理名
+            total (int): ジョブの総数
+            stream (TextIO | None): 表示先。Noneで表示しない
+            metrics (MetricsRecorder | None, optional): ジョブの状態の変化を記録するMetricsRecorder. Defaults to None.
+            stage (str, optional): MetricsRecorderに記録する段階の名前. Defaults to "".
+        """
+        self.__title: str = title
+        self.__total: int = total
+        self.__stream: TextIO | None = stream
+        self.__metrics: MetricsRecorder | None = metrics
+        self.__stage: str = stage
+        self.__lock = Lock()
+        self.__queued: int = 0
+        self.__running: int = 0
+        self.__done: int = 0
+        self.__failed: int = 0
+        self.__skipped: int = 0
+        self.__first_start: float | None = None
+        self.__last_finish: float | None = None
+        self.__stop = Event()
+        self.__thread: Thread | None = None
+
+    def __enter__(self) -> "ProgressMonitor":
+        if self.__metrics is not None:
+            self.__metrics.start_stage(self.__stage, self)
+        if self.__stream is not None:
+            self.__thread = Thread(target=self.__display, daemon=True)
+            self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+        if self.__metrics is not None:
+            self.__metrics.end_stage(self.__stage, exc_type)
+
+    @property
+    def total(self) -> int:
+        """ジョブの総数を取得します。
+        """
+        return self.__total
+
+    @property
+    def counts(self) -> Tuple[int, int, int, int]:
+        """待機中・実行中・完了・失敗したジョブの数を取得します。
+        """
+        with self.__lock:
+            return (self.__queued, self.__running, self.__done, self.__failed)
+
+    @property
+    def throughput(self) -> float:
+        """最初のジョブの開始から1秒あたりに終了したジョブ数を取得します。実行せずに完了したジョブは含みません。
+        """
+        with self.__lock:
+            if self.__first_start is None:
+                return 0.0
+            finished: int = self.__done + self.__failed - self.__skipped
+            # throughput is fixed when all jobs are finished
+            end: float = time.monotonic() if self.__last_finish is None or self.__done + self.__failed < self.__total else self.__last_finish
+            elapsed: float = end - self.__first_start
+        return 0.0 if elapsed <= 0 else finished / elapsed
+
+    @property
+    def eta(self) -> float | None:
+        """全てのジョブが終了するまでの推定時間（秒）を取得します。ジョブが1つも終了していない場合はNoneです。
+        """
+        throughput: float = self.throughput
+        with self.__lock:
+            remaining: int = self.__total - self.__done - self.__failed
+        if remaining <= 0:
+            return 0.0
+        return None if throughput <= 0 else remaining / throughput
+
+    def submit(self, key: Hashable) -> None:
+        """ジョブが追加されたことを記録します。
+
+        Args:
+            key (Hashable): ジョブのキー
+        """
+        with self.__lock:
+            self.__queued += 1
+        if self.__metrics is not None:
+            self.__metrics.record_job(self.__stage, key, "queued")
+
+    def start(self, key: Hashable) -> None:
+        """ジョブの実行が開始されたことを記録します。
+
+        Args:
+            key (Hashable): ジョブのキー
+        """
+        with self.__lock:
+            self.__queued -= 1
+            self.__running += 1
+            if self.__first_start is None:
+                self.__first_start = time.monotonic()
+        if self.__metrics is not None:
+            self.__metrics.record_job(self.__stage, key, "started")
+
+    def finish(self, key: Hashable, succeeded: bool) -> None:
+        """ジョブの実行が終了したことを記録します。
+
+        Args:
+            key (Hashable): ジョブのキー
+            succeeded (bool): ジョブが成功したかどうか
+        """
+        with self.__lock:
+            self.__running -= 1
+            self.__last_finish = time.monotonic()
+            if succeeded:
+                self.__done += 1
+            else:
+                self.__failed += 1
+        if self.__metrics is not None:
+            self.__metrics.record_job(self.__stage, key, "done" if succeeded else "failed", throughput=self.throughput, eta_seconds=self.eta)
+
+    def skip(self, count: int) -> None:
+        """実行せずに完了したジョブ（再開・事前判定）を記録します。
+
+        Args:
+            count (int): ジョブの数
+        """
+        with self.__lock:
+            self.__done += count
+            self.__skipped += count
+        if self.__metrics is not None:
+            self.__metrics.record_skip(self.__stage, count)
+
+    def format(self) -> str:
+        """進捗を表す文字列を取得します。
+
+        Returns:
+            str: 進捗を表す文字列
+        """
+        queued, running, done, failed = self.counts
+        result: str = f"{self.__title}: {done + failed} / {self.__total} finished ({queued} queued, {running} running, {done} done, {failed} failed)"
+        eta: float | None = self.eta
+        if eta is not None and eta > 0:
+            result += f", ETA {timedelta(seconds=round(eta))}"
+        return result
+
+    def __display(self) -> None:
+        """進捗を定期的に表示します。端末には同じ行を書き換えて表示します。
+        """
+        assert self.__stream is not None
+        is_tty: bool = self.__stream.isatty()
+        while not self.__stop.wait(self.__TTY_INTERVAL if is_tty else self.__LOG_INTERVAL):
+            if is_tty:
+                print(f"\r\033[K{self.format()}", end="", file=self.__stream, flush=True)
+            else:
+                print(self.format(), file=self.__stream, flush=True)
+        if is_tty:
+            print(f"\r\033[K{self.format()}", file=self.__stream, flush=True)
@@ -0,0 +1,176 @@
+from datetime import datetime
+import os
+import shutil
+import socket
+import tempfile
+from threading import Event, Lock, Thread
+import time
+import traceback
+from typing import Any, TextIO
+
+from .adaptive_bootstrap import AdaptiveBootstrap
+from .bipartition_tester import BipartitionTester
+from .configuration import Configuration
+from .consel_manager import ConselManager
+from .job_executor import JobExecutor
+from .scratch_dir import ScratchDir
+from .sitelh_store import SitelhStore
+from .slh_data import SlhData
+from .work_queue import WorkQueue
+
+
+class QueueWorker:
+    """ジョブキューから二分岐の検定を取得して実行するワーカーを表します。
+    """
+
+    __POLL_INTERVAL: float = 1.0
+
+    def __init__(self, queue_path: str, lease: float, idle_timeout: float, scratch_root: str | None, logger: TextIO, jobs: int = 1) -> None:
+        """QueueWorkerの新しいインスタンスを初期化します。
+
+        Args:
+            queue_path (str): ジョブキューのデータベースファイルのパス
+            lease (float): ジョブのリースの期間（秒）
+            idle_timeout (float): 取得できるジョブがない状態で終了するまでの時間（秒）。0で受付が終了するまで待機する
+            scratch_root (str | None): 作業ディレクトリの作成先。Noneで一時ディレクトリを用いる
+            logger (TextIO): 進捗の出力先
+            jobs (int, optional): 同時に実行するジョブ数. Defaults to 1.
+        """
+        self.__queue_path: str = queue_path
+        self.__lease: float = lease
+        self.__idle_timeout: float = idle_timeout
+        self.__scratch_root: str | None = scratch_root
+        self.__logger: TextIO = logger
+        self.__owner: str = f"{socket.gethostname()}:{os.getpid()}"
+        self.__jobs: int = jobs
+        self.__idle_lock: Lock = Lock()
+        self.__idle_since: float = time.monotonic()
+
+    @property
+    def owner(self) -> str:
+        """ワーカーの識別名（ホスト名:プロセスID）を取得します。
+        """
+        return self.__owner
+
+    def run(self) -> int:
+        """ジョブキューの受付が終了するまでジョブを実行します。ジョブは同時に最大でjobs個実行されます。
+
+        Returns:
+            int: 実行したジョブ数
+        """
+        consel_manager = ConselManager(Configuration.load())
+        # directories left by killed workers of this host are removed before creating a new one
+        ScratchDir.remove_stale(self.__scratch_root or tempfile.gettempdir(), [])
+        work_root: str = tempfile.mkdtemp(prefix=f"{ScratchDir.PREFIX}worker-", dir=self.__scratch_root)
+        ScratchDir.write_owner(work_root)
+        self.__idle_since = time.monotonic()
+        try:
+            with WorkQueue(self.__queue_path) as queue, JobExecutor[int, int](self.__jobs, 0, self.__logger, None, "worker") as executor:
+                print(f"Worker '{self.__owner}' started with {self.__jobs} job slot(s) (queue: '{self.__queue_path}')", file=self.__logger)
+                # each slot claims and runs the jobs one by one, sharing the connection to the queue
+                for slot in range(self.__jobs):
+                    executor.submit(slot, self.__serve, queue, consel_manager, work_root)
+                count: int = sum(executor.wait().values())
+        finally:
+            shutil.rmtree(work_root, ignore_errors=True)
+        print(f"Worker '{self.__owner}' finished {count} job(s)", file=self.__logger)
+        return count
+
+    def __serve(self, queue: WorkQueue, consel_manager: ConselManager, work_root: str) -> int:
+        """1つの実行枠でジョブキューの受付が終了するまでジョブを実行します。
+
+        Args:
+            queue (WorkQueue): ジョブキュー
+            consel_manager (ConselManager): CONSELを実行するクライアント
+            work_root (str): ジョブの作業ディレクトリの作成先
+
+        Returns:
+            int: 実行したジョブ数
+        """
+        count: int = 0
+        while True:
+            job = queue.claim(self.__owner, self.__lease)
+            if job is None:
+                if queue.is_closed:
+                    break
+                with self.__idle_lock:
+                    idle: float = time.monotonic() - self.__idle_since
+                if self.__idle_timeout > 0 and idle > self.__idle_timeout:
+                    print(f"No job is claimed in {self.__idle_timeout} seconds", file=self.__logger)
+                    break
+                time.sleep(self.__POLL_INTERVAL)
+                continue
+
+            job_id, payload = job
+            heartbeat_stop = Event()
+            heartbeat = Thread(target=self.__renew_lease, args=(queue, job_id, heartbeat_stop), daemon=True)
+            heartbeat.start()
+            try:
+                result: dict[str, Any] = self.__execute(consel_manager, os.path.join(work_root, str(job_id)), payload)
+            except Exception as e:
+                print(f"  Job {job_id} failed: {e}", file=self.__logger)
+                queue.fail(job_id, self.__owner, str.join("", traceback.format_exception_only(type(e), e)).strip())
+            else:
+                queue.complete(job_id, self.__owner, result)
+                count += 1
+            finally:
+                heartbeat_stop.set()
+                heartbeat.join()
+            # the worker is idle only when none of the slots has claimed a job
+            with self.__idle_lock:
+                self.__idle_since = time.monotonic()
+        return count
+
+    def __renew_lease(self, queue: WorkQueue, job_id: int, stop: Event) -> None:
+        """ジョブの実行中にリースを延長し続けます。
+
+        Args:
+            queue (WorkQueue): ジョブキュー
+            job_id (int): ジョブのID
+            stop (Event): 延長を終了するイベント
+        """
+        while not stop.wait(self.__lease / 3):
+            if not queue.renew(job_id, self.__owner, self.__lease):
+                print(f"  Lease of job {job_id} is lost", file=self.__logger)
+                return
+
+    def __execute(self, consel_manager: ConselManager, work_dir: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """ジョブを実行します。
+
+        Args:
+            consel_manager (ConselManager): CONSELを実行するクライアント
+            work_dir (str): ジョブの作業ディレクトリ
+            payload (dict[str, Any]): ジョブの内容
+
+        Raises:
+            KeyError: サイト尤度がストアに保存されていない
+
+        Returns:
+            dict[str, Any]: ジョブの結果
+        """
+        operation_start: datetime = datetime.now()
+        branch_index: int = payload["index"]
+        topologies: list[str] = payload["topologies"]
+        with SitelhStore(payload["store"]) as store:
+            stored: dict[str, list[float]] = store.load(payload["fingerprint"], topologies)
+        slh_set = SlhData([stored[topology] for topology in topologies])
+
+        bootstrap: AdaptiveBootstrap | None = None
+        if payload["adaptive_bootstrap"] is not None:
+            bootstrap = AdaptiveBootstrap(payload["adaptive_bootstrap"], payload["rell_boot"], payload["sig_level"])
+
+        os.makedirs(work_dir, exist_ok=True)
+        try:
+            tester = BipartitionTester(consel_manager, work_dir, payload["rell_boot"], bootstrap, self.__logger)
+            result, replicates = tester.test(slh_set, branch_index, payload["branch_count"], payload["seed"])
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        elapsed: float = (datetime.now() - operation_start).total_seconds()
+        print(f"  Operation No. {branch_index} / {payload['branch_count'] - 1} finished in {elapsed:.3f} s", file=self.__logger)
+        return {
+            "entries": result.to_rows(),
+            "replicates": replicates,
+            "delta_lnl": list(BipartitionTester.get_delta_lnl(slh_set, 1)),
+            "elapsed": elapsed,
+            "worker": self.__owner,
+        }
@@ -0,0 +1,82 @@
+from contextlib import contextmanager
+from threading import Lock, local
+from typing import Generator, Tuple
+
+from .process_usage import ProcessUsage
+
+
+class ResourceLedger:
+    """外部プログラムごとの資源の使用量を，プログラム別と処理の単位（チャンク・二分岐）別に集計します。
+    """
+
+    def __init__(self) -> None:
+        """ResourceLedgerの新しいインスタンスを初期化します。
+        """
+        self.__lock = Lock()
+        self.__local = local()
+        self.__programs: dict[str, ProcessUsage] = dict[str, ProcessUsage]()
+        self.__scopes: dict[Tuple[str, int], ProcessUsage] = dict[Tuple[str, int], ProcessUsage]()
+
+    @property
+    def programs(self) -> dict[str, ProcessUsage]:
+        """プログラム別の使用量の合計を取得します。
+        """
+        with self.__lock:
+            return dict(self.__programs)
+
+    @contextmanager
+    def scope(self, stage: str, key: int) -> Generator[None, None, None]:
+        """呼び出したスレッドで実行されるプログラムの使用量を，処理の単位に加算するコンテキストマネージャーを取得します。
+
+        Args:
+            stage (str): 処理の段階の名前
+            key (int): チャンク番号や二分岐のインデックス
+
+        Yields:
+            Generator[None, None, None]: 処理の単位を設定するコンテキストマネージャー
+        """
+        previous: Tuple[str, int] | None = getattr(self.__local, "scope", None)
+        self.__local.scope = (stage, key)
+        try:
+            yield
+        finally:
+            self.__local.scope = previous
+
+    def record(self, usage: ProcessUsage) -> None:
+        """プログラムの使用量を加算します。
+
+        Args:
+            usage (ProcessUsage): プログラムの使用量
+        """
+        scope: Tuple[str, int] | None = getattr(self.__local, "scope", None)
+        with self.__lock:
+            current: ProcessUsage | None = self.__programs.get(usage.program)
+            self.__programs[usage.program] = usage if current is None else current.merge(usage)
+            if scope is not None:
+                total: ProcessUsage | None = self.__scopes.get(scope)
+                self.__scopes[scope] = ProcessUsage(scope[0], 0, 0, 0, 0, 0).merge(usage) if total is None else total.merge(usage)
+
+    def get(self, stage: str, key: int) -> ProcessUsage | None:
+        """処理の単位の使用量の合計を取得します。
+
+        Args:
+            stage (str): 処理の段階の名前
+            key (int): チャンク番号や二分岐のインデックス
+
+        Returns:
+            ProcessUsage | None: 使用量の合計。プログラムを実行していない場合はNone
+        """
+        with self.__lock:
+            return self.__scopes.get((stage, key))
+
+    def get_stage(self, stage: str) -> dict[int, ProcessUsage]:
+        """処理の段階の全ての単位の使用量の合計を取得します。
+
+        Args:
+            stage (str): 処理の段階の名前
+
+        Returns:
+            dict[int, ProcessUsage]: チャンク番号や二分岐のインデックスと使用量の合計（昇順）
+        """
+        with self.__lock:
+            return dict(sorted([(scope[1], usage) for scope, usage in self.__scopes.items() if scope[0] == stage]))
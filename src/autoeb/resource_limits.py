@@ -0,0 +1,144 @@
+import os
+
+
+class ResourceLimits:
+    """プロセスが利用できるCPUとメモリの上限（cgroupの制限，CPUアフィニティ）を表します。
+    """
+
+    def __init__(self, cpus: int, memory: int | None) -> None:
+        """ResourceLimitsの新しいインスタンスを初期化します。
+
+        Args:
+            cpus (int): 利用できるCPU数
+            memory (int | None): 利用できるメモリ（バイト）。不明な場合はNone
+        """
+        self.__cpus: int = cpus
+        self.__memory: int | None = memory
+
+    @property
+    def cpus(self) -> int:
+        """利用できるCPU数を取得します。
+        """
+        return self.__cpus
+
+    @property
+    def memory(self) -> int | None:
+        """利用できるメモリ（バイト）を取得します。不明な場合はNoneです。
+        """
+        return self.__memory
+
+    def get_max_jobs(self, job_memory: int) -> int:
+        """メモリに収まる同時実行数を取得します。
+
+        Args:
+            job_memory (int): 1つの処理が用いるメモリ（バイト）
+
+        Returns:
+            int: 同時実行数（CPU数を上限とし，1以上）
+        """
+        if self.__memory is None or job_memory <= 0:
+            return self.__cpus
+        return max(1, min(self.__cpus, self.__memory // job_memory))
+
+    @classmethod
+    def detect(cls, cgroup_root: str = "/sys/fs/cgroup", proc_root: str = "/proc") -> "ResourceLimits":
+        """現在のプロセスの制限を取得します。cgroup v2とv1のCPUクォータとメモリ上限に対応します。
+
+        Args:
+            cgroup_root (str, optional): cgroupのマウント先. Defaults to "/sys/fs/cgroup".
+            proc_root (str, optional): procfsのマウント先. Defaults to "/proc".
+
+        Returns:
+            ResourceLimits: 現在のプロセスの制限
+        """
+        cpus: int = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        cgroups: dict[str, str] = cls.__read_cgroups(os.path.join(proc_root, "self", "cgroup"))
+
+        # cgroup v2: "QUOTA PERIOD" or "max PERIOD", cgroup v1: quota is -1 when unlimited
+        quota: float | None = None
+        cpu_max: list[str] | None = cls.__read_values(cgroup_root, cgroups.get(""), "", "cpu.max")
+        if cpu_max is not None and cpu_max[0] != "max":
+            quota = int(cpu_max[0]) / int(cpu_max[1])
+        v1_quota: list[str] | None = cls.__read_values(cgroup_root, cgroups.get("cpu"), "cpu", "cpu.cfs_quota_us")
+        v1_period: list[str] | None = cls.__read_values(cgroup_root, cgroups.get("cpu"), "cpu", "cpu.cfs_period_us")
+        if v1_quota is not None and v1_period is not None and int(v1_quota[0]) > 0:
+            quota = int(v1_quota[0]) / int(v1_period[0])
+        if quota is not None:
+            # fractional quota is rounded down so that the processes are not throttled
+            cpus = max(1, min(cpus, int(quota)))
+
+        memory: int | None = cls.__read_mem_available(os.path.join(proc_root, "meminfo"))
+        limit: int | None = None
+        for controller, names in [("", ("memory.max", "memory.current")), ("memory", ("memory.limit_in_bytes", "memory.usage_in_bytes"))]:
+            limit_values: list[str] | None = cls.__read_values(cgroup_root, cgroups.get(controller), controller, names[0])
+            usage_values: list[str] | None = cls.__read_values(cgroup_root, cgroups.get(controller), controller, names[1])
+            # cgroup v1 shows a huge value when unlimited
+            if limit_values is not None and limit_values[0] != "max" and int(limit_values[0]) < 1 << 60:
+                limit = int(limit_values[0]) - (0 if usage_values is None else int(usage_values[0]))
+                break
+        if limit is not None:
+            memory = max(0, limit) if memory is None else max(0, min(memory, limit))
+        return cls(cpus, memory)
+
+    @staticmethod
+    def __read_cgroups(path: str) -> dict[str, str]:
+        """プロセスが属するcgroupのパスをコントローラーごとに読み込みます。
+
+        Args:
+            path (str): /proc/self/cgroupのパス
+
+        Returns:
+            dict[str, str]: コントローラー名（cgroup v2は空文字列）とcgroupのパス
+        """
+        result: dict[str, str] = dict[str, str]()
+        if not os.path.isfile(path):
+            return result
+        with open(path, "rt") as cgroup_io:
+            for line in cgroup_io:
+                fields: list[str] = line.rstrip("\n").split(":", 2)
+                if len(fields) != 3:
+                    continue
+                for controller in fields[1].split(","):
+                    result[controller] = fields[2]
+        return result
+
+    @staticmethod
+    def __read_values(cgroup_root: str, cgroup: str | None, controller: str, filename: str) -> list[str] | None:
+        """cgroupのファイルの値を読み込みます。プロセスのcgroupにファイルがない場合はマウント先の直下を参照します。
+
+        Args:
+            cgroup_root (str): cgroupのマウント先
+            cgroup (str | None): プロセスが属するcgroupのパス
+            controller (str): コントローラー名（cgroup v2は空文字列）
+            filename (str): ファイル名
+
+        Returns:
+            list[str] | None: 空白で区切られた値。ファイルがない場合はNone
+        """
+        directories: list[str] = [os.path.join(cgroup_root, controller)]
+        if cgroup is not None:
+            directories.insert(0, os.path.join(cgroup_root, controller, cgroup.lstrip("/")))
+        for directory in directories:
+            path: str = os.path.join(directory, filename)
+            if os.path.isfile(path):
+                with open(path, "rt") as value_io:
+                    return value_io.read().split()
+        return None
+
+    @staticmethod
+    def __read_mem_available(path: str) -> int | None:
+        """/proc/meminfoから利用可能なメモリを読み込みます。
+
+        Args:
+            path (str): /proc/meminfoのパス
+
+        Returns:
+            int | None: 利用可能なメモリ（バイト）。取得できない場合はNone
+        """
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rt") as meminfo_io:
+            for line in meminfo_io:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+        return None
@@ -0,0 +1,160 @@
+import math
+import sqlite3
+from threading import Lock
+from types import TracebackType
+from typing import Any, Tuple
+
+from .catpv_result import CatpvResult
+from .sqlite_batch import SqliteBatch
+
+
+class ResultTable:
+    """二分岐ごとの検定結果を1行ずつ保存するSQLiteデータベースの表を表します。
+    行はまとめてコミットされます。
+    """
+
+    TREES: list[str] = ["ml", "nni1", "nni2"]
+    FIELDS: list[str] = ["rank", "obs", "au", "np", "bp", "pp", "kh", "sh", "wkh", "wsh"]
+    NULLABLE_FIELDS: list[str] = ["au", "np"]
+    """AU検定を行わない事前判定の行でNULLとなる列
+    """
+
+    def __init__(self, path: str) -> None:
+        """ResultTableの新しいインスタンスを初期化します。
+
+        Args:
+            path (str): データベースファイルのパス（存在しない場合は作成される）
+        """
+        self.__path: str = path
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        statistics: str = str.join("", [
+            f"{tree}_{field} {'INTEGER' if field == 'rank' else 'REAL'}{'' if field in self.NULLABLE_FIELDS else ' NOT NULL'}, "
+            for tree in self.TREES for field in self.FIELDS])
+        with self.__connection:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS leaf (position INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS result ("
+                "bipartition INTEGER PRIMARY KEY, split TEXT NOT NULL, fingerprint TEXT NOT NULL, method TEXT NOT NULL, replicates INTEGER, "
+                "supported INTEGER NOT NULL, delta_lnl_nni1 REAL NOT NULL, delta_lnl_nni2 REAL NOT NULL, "
+                + statistics
+                + "elapsed REAL)")
+        self.__batch = SqliteBatch(self.__connection)
+
+    def __enter__(self) -> "ResultTable":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """データベースファイルのパスを取得します。
+        """
+        return self.__path
+
+    def set_leaves(self, leaf_names: list[str]) -> None:
+        """二分岐のビット列に対応する葉の名前を設定します。葉が以前と異なる場合は保存された結果が全て削除されます。
+
+        Args:
+            leaf_names (list[str]): ビット列の位置の順に並べた葉の名前
+        """
+        with self.__lock, self.__connection:
+            current: list[str] = [name for name, in self.__connection.execute("SELECT name FROM leaf ORDER BY position")]
+            if current == leaf_names:
+                return
+            self.__connection.execute("DELETE FROM leaf")
+            self.__connection.execute("DELETE FROM result")
+            self.__connection.executemany("INSERT INTO leaf (position, name) VALUES (?, ?)", enumerate(leaf_names))
+
+    def get_metadata(self) -> dict[str, str]:
+        """解析の条件を取得します。
+
+        Returns:
+            dict[str, str]: 条件の名前と値
+        """
+        with self.__lock:
+            return dict[str, str](self.__connection.execute("SELECT key, value FROM meta ORDER BY key").fetchall())
+
+    def set_metadata(self, metadata: dict[str, str]) -> None:
+        """解析の条件を設定します。以前の条件は全て置き換えられます。
+
+        Args:
+            metadata (dict[str, str]): 条件の名前と値
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM meta")
+            self.__connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", metadata.items())
+
+    def read(self) -> dict[int, dict[str, Any]]:
+        """保存された検定結果を全て読み込みます。
+
+        Returns:
+            dict[int, dict[str, Any]]: 二分岐のインデックスと，列名と値の組
+        """
+        with self.__lock:
+            cursor = self.__connection.execute("SELECT * FROM result ORDER BY bipartition")
+            columns: list[str] = [column[0] for column in cursor.description]
+            return dict[int, dict[str, Any]]([(row[0], dict(zip(columns, row))) for row in cursor.fetchall()])
+
+    @classmethod
+    def to_catpv(cls, row: dict[str, Any]) -> CatpvResult:
+        """read()で読み込んだ行から検定結果を生成します。
+
+        Args:
+            row (dict[str, Any]): 列名と値の組
+
+        Returns:
+            CatpvResult: 検定結果
+        """
+        # items of the trees in the CATPV files are 1 (ML tree), 2 and 3 (NNI trees)
+        return CatpvResult.from_rows([
+            [row[f"{tree}_rank"], item + 1] + [math.nan if row[f"{tree}_{field}"] is None else row[f"{tree}_{field}"] for field in cls.FIELDS[1:]]
+            for item, tree in enumerate(cls.TREES)])
+
+    def write(self,
+              bipartition: int,
+              split: str,
+              fingerprint: str,
+              method: str,
+              replicates: int | None,
+              supported: bool,
+              delta_lnl: Tuple[float, float],
+              result: CatpvResult,
+              elapsed: float | None,
+              replace: bool = True) -> None:
+        """二分岐の検定結果を保存します。複数のスレッドから呼び出すことができます。
+
+        Args:
+            bipartition (int): 二分岐のインデックス
+            split (str): 二分岐のビット列（葉の位置ごとに0または1）
+            fingerprint (str): 検定の入力のフィンガープリント
+            method (str): 検定の方法（consel, multinomial, balanced, antithetic, prescreen）
+            replicates (int | None): RELL bootstrapの複製数。複製を生成していない場合はNone
+            supported (bool): 二分岐が支持されるかどうか
+            delta_lnl (Tuple[float, float]): NNI樹形の対数尤度から最尤樹形の対数尤度を引いた値
+            result (CatpvResult): 検定結果（NaNの値はNULLとして保存される）
+            elapsed (float | None): 検定に要した時間（秒）
+            replace (bool, optional): 保存された結果を置き換えるかどうか. Defaults to True.
+        """
+        # p-values which are not calculated (NaN) are stored as NULL
+        statistics: list[float | None] = [
+            None if math.isnan(value) else value
+            for value in [getattr(stat, "brell" if field == "bp" else field) for stat in [result.stat_ml, result.stat_nni1, result.stat_nni2] for field in self.FIELDS]]
+        values: list = [bipartition, split, fingerprint, method, replicates, int(supported), delta_lnl[0], delta_lnl[1]] + statistics + [elapsed]
+        placeholders: str = str.join(", ", ["?"] * len(values))
+        with self.__lock:
+            self.__batch.execute(f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO result VALUES ({placeholders})", values)
+
+    def flush(self) -> None:
+        """まとめられた行をコミットします。
+        """
+        with self.__lock:
+            self.__batch.commit()
+
+    def close(self) -> None:
+        """まとめられた行をコミットし，データベースとの接続を閉じます。
+        """
+        self.flush()
+        self.__connection.close()
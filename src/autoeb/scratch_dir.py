@@ -0,0 +1,123 @@
+import glob
+import hashlib
+import os
+import shutil
+import socket
+
+
+class ScratchDir:
+    """二分岐ごとの中間ファイルを置く作業ディレクトリを表します。
+    """
+
+    PREFIX: str = "autoeb-"
+    OWNER_FILE: str = ".owner"
+    """作業ディレクトリを使用するプロセスの識別名（ホスト名:プロセスID）を記録するファイル名
+    """
+
+    def __init__(self, root: str | None, out_dir: str) -> None:
+        """ScratchDirの新しいインスタンスを初期化します。
+
+        Args:
+            root (str | None): 作業ディレクトリを作成するディレクトリ。Noneで出力先を作業ディレクトリとして用いる
+            out_dir (str): 出力先のディレクトリ
+
+        Raises:
+            OSError: 作業ディレクトリを作成できない
+        """
+        self.__out_dir: str = out_dir
+        if root is None:
+            self.__path: str = out_dir
+        else:
+            # the same output directory uses the same working directory so that the intermediates can be resumed
+            key: str = hashlib.sha256(os.path.abspath(out_dir).encode()).hexdigest()[:16]
+            self.__path = os.path.join(root, f"{self.PREFIX}{key}")
+            self.remove_stale(root, [self.__path])
+            os.makedirs(self.__path, exist_ok=True)
+            self.write_owner(self.__path)
+
+    @property
+    def path(self) -> str:
+        """作業ディレクトリのパスを取得します。
+        """
+        return self.__path
+
+    @property
+    def is_separated(self) -> bool:
+        """作業ディレクトリが出力先と異なるかどうかを取得します。
+        """
+        return self.__path != self.__out_dir
+
+    @classmethod
+    def write_owner(cls, path: str) -> None:
+        """作業ディレクトリに現在のプロセスの識別名を記録します。
+
+        Args:
+            path (str): 作業ディレクトリのパス
+        """
+        with open(os.path.join(path, cls.OWNER_FILE), "wt") as owner_io:
+            owner_io.write(f"{socket.gethostname()}:{os.getpid()}")
+
+    @classmethod
+    def remove_stale(cls, root: str, excludes: list[str]) -> list[str]:
+        """このホストで終了したプロセスが残した作業ディレクトリを削除します。SIGKILLなどで削除されなかった作業ディレクトリが対象です。
+
+        Args:
+            root (str): 作業ディレクトリの作成先
+            excludes (list[str]): 削除しない作業ディレクトリ
+
+        Returns:
+            list[str]: 削除した作業ディレクトリの一覧
+        """
+        removed: list[str] = []
+        host: str = socket.gethostname()
+        for path in glob.glob(os.path.join(root, f"{cls.PREFIX}*")):
+            if path in excludes or not os.path.isdir(path):
+                continue
+            try:
+                with open(os.path.join(path, cls.OWNER_FILE), "rt") as owner_io:
+                    owner_host, _, owner_pid = owner_io.read().strip().rpartition(":")
+            except OSError:
+                # directories without the owner are left, as they may be being created
+                continue
+            # processes of other hosts sharing the directory cannot be checked
+            if owner_host != host or not owner_pid.isdigit() or cls.__is_alive(int(owner_pid)):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+        return removed
+
+    def get_file_path(self, filename: str) -> str:
+        """作業ディレクトリ上のファイルのパスを取得します。
+
+        Args:
+            filename (str): ファイル名
+
+        Returns:
+            str: ファイルのパス
+        """
+        return os.path.join(self.__path, filename)
+
+    def cleanup(self) -> None:
+        """出力先と異なる作業ディレクトリを削除します。
+        """
+        if self.is_separated:
+            shutil.rmtree(self.__path, ignore_errors=True)
+
+    @staticmethod
+    def __is_alive(pid: int) -> bool:
+        """プロセスが実行中かどうかを取得します。
+
+        Args:
+            pid (int): プロセスID
+
+        Returns:
+            bool: 実行中の場合はTrue
+        """
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # the process exists but is owned by another user
+            return True
+        return True
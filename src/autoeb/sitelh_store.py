@@ -0,0 +1,99 @@
+from array import array
+import hashlib
+import sqlite3
+from types import TracebackType
+from typing import Iterable
+
+from .model_cache import ModelCache
+
+
+class SitelhStore:
+    """ツリーごとのサイト尤度をSQLiteデータベースに保存するストアを表します。
+    キーはトポロジーのハッシュ値と，配列・モデル・パラメータから計算されるフィンガープリントです。
+    """
+
+    __QUERY_SIZE: int = 500
+
+    def __init__(self, path: str) -> None:
+        """SitelhStoreの新しいインスタンスを初期化します。
+
+        Args:
+            path (str): データベースファイルのパス（存在しない場合は作成される）
+        """
+        self.__path: str = path
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS sitelh ("
+            "fingerprint TEXT NOT NULL, topology TEXT NOT NULL, site_count INTEGER NOT NULL, sitelh BLOB NOT NULL, "
+            "PRIMARY KEY (fingerprint, topology))")
+        self.__connection.commit()
+
+    def __enter__(self) -> "SitelhStore":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """データベースファイルのパスを取得します。
+        """
+        return self.__path
+
+    @staticmethod
+    def create_fingerprint(sequence_path: str, model: str, tree_hash: str, other_params: str) -> str:
+        """サイト尤度の計算条件を表すフィンガープリントを生成します。
+
+        Args:
+            sequence_path (str): 配列ファイルのパス
+            model (str): 進化モデル（パラメータを固定したモデル文字列を含む）
+            tree_hash (str): パラメータの推定に用いるツリーのトポロジーのハッシュ値。パラメータが固定されている場合は空文字列
+            other_params (str): IQ-TREEのその他引数
+
+        Returns:
+            str: フィンガープリント
+        """
+        source: str = str.join("\n", [ModelCache.hash_file(sequence_path), model, tree_hash, other_params])
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def load(self, fingerprint: str, topologies: Iterable[str]) -> dict[str, list[float]]:
+        """保存されたサイト尤度を読み込みます。
+
+        Args:
+            fingerprint (str): 計算条件のフィンガープリント
+            topologies (Iterable[str]): 読み込むトポロジーのハッシュ値の一覧
+
+        Returns:
+            dict[str, list[float]]: トポロジーのハッシュ値とサイト尤度の辞書（保存されていないものは含まれない）
+        """
+        keys: list[str] = list(dict.fromkeys(topologies))
+        result = dict[str, list[float]]()
+        for start in range(0, len(keys), self.__QUERY_SIZE):
+            query: list[str] = keys[start:(start + self.__QUERY_SIZE)]
+            placeholders: str = str.join(',', ['?'] * len(query))
+            cursor = self.__connection.execute(
+                f"SELECT topology, site_count, sitelh FROM sitelh WHERE fingerprint = ? AND topology IN ({placeholders})",
+                [fingerprint] + query)
+            for topology, site_count, blob in cursor:
+                values = array('d')
+                values.frombytes(blob)
+                if len(values) == site_count:
+                    result[topology] = values.tolist()
+        return result
+
+    def save(self, fingerprint: str, values: dict[str, list[float]]) -> None:
+        """サイト尤度を保存します。既存の値は上書きされます。
+
+        Args:
+            fingerprint (str): 計算条件のフィンガープリント
+            values (dict[str, list[float]]): トポロジーのハッシュ値とサイト尤度の辞書
+        """
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO sitelh (fingerprint, topology, site_count, sitelh) VALUES (?, ?, ?, ?)",
+                [(fingerprint, topology, len(sitelh), array('d', sitelh).tobytes()) for topology, sitelh in values.items()])
+
+    def close(self) -> None:
+        """データベースとの接続を閉じます。
+        """
+        self.__connection.close()
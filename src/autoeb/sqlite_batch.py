@@ -0,0 +1,56 @@
+import sqlite3
+import time
+from typing import Any, Iterable
+
+
+class SqliteBatch:
+    """SQLiteデータベースへの書き込みをまとめてコミットします。
+    書き込みは一定の件数または時間ごとにコミットされ，コミットされていない書き込みも同じ接続からは読み込むことができます。
+    """
+
+    RECORDS: int = 100
+    """コミットするまでの書き込みの件数
+    """
+    INTERVAL: float = 5.0
+    """コミットするまでの時間（秒）
+    """
+
+    def __init__(self, connection: sqlite3.Connection, records: int = RECORDS, interval: float = INTERVAL) -> None:
+        """SqliteBatchの新しいインスタンスを初期化します。
+
+        Args:
+            connection (sqlite3.Connection): データベースとの接続
+            records (int, optional): コミットするまでの書き込みの件数. Defaults to RECORDS.
+            interval (float, optional): コミットするまでの時間（秒）. Defaults to INTERVAL.
+        """
+        self.__connection: sqlite3.Connection = connection
+        self.__records: int = records
+        self.__interval: float = interval
+        self.__pending: int = 0
+        self.__committed_at: float = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        """コミットされていない書き込みの件数を取得します。
+        """
+        return self.__pending
+
+    def execute(self, sql: str, parameters: Iterable[Any]) -> None:
+        """書き込みを実行し，件数または時間が上限に達した場合はコミットします。呼び出し側で排他制御を行う必要があります。
+
+        Args:
+            sql (str): SQL文
+            parameters (Iterable[Any]): SQL文のパラメーター
+        """
+        self.__connection.execute(sql, tuple(parameters))
+        self.__pending += 1
+        if self.__pending >= self.__records or time.monotonic() - self.__committed_at >= self.__interval:
+            self.commit()
+
+    def commit(self) -> None:
+        """コミットされていない書き込みをコミットします。呼び出し側で排他制御を行う必要があります。
+        """
+        if self.__pending > 0:
+            self.__connection.commit()
+        self.__pending = 0
+        self.__committed_at = time.monotonic()
@@ -0,0 +1,157 @@
+from contextlib import contextmanager, nullcontext
+import cProfile
+import os
+import pstats
+from threading import Lock, local
+import time
+import tracemalloc
+from typing import ContextManager, Generator, Iterable, Tuple
+
+from .nnigen import TreeCounters
+
+
+class StageProfiler:
+    """指定された段階の処理をcProfileで計測し，tracemallocでメモリの確保を標本調査して，段階ごとの報告を出力します。
+    """
+
+    STAGES: list[str] = ["nni", "sitelh", "catpv", "summary"]
+    __SNAPSHOT_INTERVAL: int = 100
+    __TOP_FUNCTIONS: int = 30
+    __TOP_ALLOCATIONS: int = 20
+
+    def __init__(self, stages: Iterable[str], out_dir: str) -> None:
+        """StageProfilerの新しいインスタンスを初期化します。
+
+        Args:
+            stages (Iterable[str]): 計測する段階の名前
+            out_dir (str): 報告の出力先
+        """
+        self.__stages: set[str] = set(stages)
+        self.__out_dir: str = out_dir
+        self.__lock = Lock()
+        self.__local = local()
+        self.__tracing: bool = False
+        self.__stats: dict[str, pstats.Stats] = dict[str, pstats.Stats]()
+        self.__invocations: dict[str, int] = dict[str, int]()
+        self.__seconds: dict[str, float] = dict[str, float]()
+        self.__counts: dict[str, Tuple[int, int]] = dict[str, Tuple[int, int]]()
+        self.__samples: dict[str, int] = dict[str, int]()
+        self.__allocations: dict[str, dict[str, Tuple[int, int]]] = dict[str, dict[str, Tuple[int, int]]]()
+
+    @property
+    def stages(self) -> set[str]:
+        """計測する段階の名前を取得します。
+        """
+        return set(self.__stages)
+
+    def start(self) -> None:
+        """メモリの確保の追跡を開始します。計測する段階がない場合は何もしません。
+        """
+        if len(self.__stages) > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__tracing = True
+
+    def stop(self) -> None:
+        """開始したメモリの確保の追跡を終了します。
+        """
+        if self.__tracing:
+            tracemalloc.stop()
+            self.__tracing = False
+
+    def profile(self, stage: str) -> ContextManager[None]:
+        """段階の処理を計測するコンテキストマネージャーを取得します。計測しない段階の場合は何もしません。
+
+        Args:
+            stage (str): 段階の名前
+
+        Returns:
+            ContextManager[None]: 段階の処理を計測するコンテキストマネージャー
+        """
+        if not stage in self.__stages:
+            return nullcontext()
+        return self.__profile(stage)
+
+    @contextmanager
+    def __profile(self, stage: str) -> Generator[None, None, None]:
+        """段階の処理を計測します。1つのスレッドで入れ子になった計測は外側の段階に含めます。
+
+        Args:
+            stage (str): 段階の名前
+
+        Yields:
+            Generator[None, None, None]: 段階の処理を計測するコンテキストマネージャー
+        """
+        if getattr(self.__local, "active", False):
+            yield
+            return
+        with self.__lock:
+            invocation: int = self.__invocations.get(stage, 0)
+            self.__invocations[stage] = invocation + 1
+        # snapshots of the whole heap are expensive, so allocations are sampled
+        before: tracemalloc.Snapshot | None = None
+        if invocation % self.__SNAPSHOT_INTERVAL == 0 and tracemalloc.is_tracing():
+            before = tracemalloc.take_snapshot()
+        counts: Tuple[int, int] = TreeCounters.get_counts()
+        start: float = time.perf_counter()
+        profile = cProfile.Profile()
+        self.__local.active = True
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.__local.active = False
+            elapsed: float = time.perf_counter() - start
+            visited, copies = TreeCounters.get_counts()
+            differences: list[tracemalloc.StatisticDiff] = []
+            if before is not None and tracemalloc.is_tracing():
+                filters: list[tracemalloc.Filter] = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+                differences = tracemalloc.take_snapshot().filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+            with self.__lock:
+                if stage in self.__stats:
+                    self.__stats[stage].add(profile)
+                else:
+                    self.__stats[stage] = pstats.Stats(profile)
+                self.__seconds[stage] = self.__seconds.get(stage, 0.0) + elapsed
+                total: Tuple[int, int] = self.__counts.get(stage, (0, 0))
+                self.__counts[stage] = (total[0] + visited - counts[0], total[1] + copies - counts[1])
+                if before is not None:
+                    self.__samples[stage] = self.__samples.get(stage, 0) + 1
+                    allocations: dict[str, Tuple[int, int]] = self.__allocations.setdefault(stage, dict[str, Tuple[int, int]]())
+                    for difference in differences:
+                        location: str = str(difference.traceback)
+                        size, count = allocations.get(location, (0, 0))
+                        allocations[location] = (size + difference.size_diff, count + difference.count_diff)
+
+    def write_reports(self) -> list[str]:
+        """計測した段階ごとに，関数ごとの時間の報告（profile-STAGE.txt）とpstatsのデータ（profile-STAGE.pstats）を出力します。
+
+        Returns:
+            list[str]: 出力した報告のパス
+        """
+        result: list[str] = []
+        with self.__lock:
+            for stage, stats in self.__stats.items():
+                stats.dump_stats(os.path.join(self.__out_dir, f"profile-{stage}.pstats"))
+                path: str = os.path.join(self.__out_dir, f"profile-{stage}.txt")
+                with open(path, "wt") as report_io:
+                    visited, copies = self.__counts[stage]
+                    print(f"Stage: {stage}", file=report_io)
+                    print(f"Invocations: {self.__invocations[stage]}", file=report_io)
+                    print(f"Total seconds: {self.__seconds[stage]:.3f}", file=report_io)
+                    print(f"Tree nodes visited: {visited}", file=report_io)
+                    print(f"Tree copies: {copies}", file=report_io)
+                    print(f"Allocation samples: {self.__samples.get(stage, 0)} (every {self.__SNAPSHOT_INTERVAL} invocations)", file=report_io)
+                    print(file=report_io)
+
+                    print("[Hotspots]", file=report_io)
+                    stats.stream = report_io  # type: ignore
+                    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.__TOP_FUNCTIONS)
+
+                    print("[Allocations]", file=report_io)
+                    print("size_kib\tblocks\tlocation", file=report_io)
+                    allocations: list[Tuple[str, Tuple[int, int]]] = sorted(self.__allocations.get(stage, dict()).items(), key=lambda x: x[1][0], reverse=True)
+                    for location, (size, count) in allocations[:self.__TOP_ALLOCATIONS]:
+                        print(f"{size / 1024:.1f}\t{count}\t{location}", file=report_io)
+                result.append(path)
+        return result
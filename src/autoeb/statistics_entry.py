@@ -1,3 +1,6 @@
+import math
+
+
 class StatisticsEntry:
     """catpvの樹形比較の結果を表します。
     """
@@ -18,6 +21,12 @@ class StatisticsEntry:
     def au(self) -> float:
         return self.__au
 
+    @property
+    def au_se(self) -> float:
+        """AU検定のp値の標準誤差を取得します。不明な場合はNaNです。
+        """
+        return self.__au_se
+
     @property
     def np(self) -> float:
         return self.__np
@@ -57,7 +66,8 @@ class StatisticsEntry:
                  kh: float,
                  sh: float,
                  wkh: float,
-                 wsh: float
+                 wsh: float,
+                 au_se: float = math.nan
                  ) -> None:
         """StatisticsEntryの新しいインスタンスを初期化します。
 
@@ -73,6 +83,7 @@ class StatisticsEntry:
             sh (float): SH-Test
             wkh (float): 
             wsh (float): 
+            au_se (float, optional): AU-Testの標準誤差（catpv -sの出力）。不明な場合はNaN. Defaults to math.nan.
         """
         self.__index: int = index
         self.__rank: int = rank
@@ -85,13 +96,14 @@ class StatisticsEntry:
         self.__sh: float = sh
         self.__wkh: float = wkh
         self.__wsh: float = wsh
+        self.__au_se: float = au_se
 
     @classmethod
     def from_table_dict(cls, source: dict[str, str]) -> "StatisticsEntry":
         """IQTREEのテーブルのエントリを表す辞書からStatisticsEntryの新しいインスタンスを生成します。
 
         Args:
-            source (dict[str, str]): 読み込む辞書
+            source (dict[str, str]): 読み込む辞書（標準誤差はキー"au_se"に格納）
 
         Returns:
             StatisticsEntry: StatisticsEntryの新しいインスタンス
@@ -107,4 +119,5 @@ class StatisticsEntry:
         sh: float = float(source["sh"])
         wkh: float = float(source["wkh"])
         wsh: float = float(source["wsh"])
-        return cls(rank, index, obs, au, np, brell, pp, kh, sh, wkh, wsh)
+        au_se: float = float(source["au_se"]) if "au_se" in source else math.nan
+        return cls(rank, index, obs, au, np, brell, pp, kh, sh, wkh, wsh, au_se)
@@ -6,13 +6,15 @@ from .consts import INFILE_SEQ, INFILE_TREE, OUTFILE_INDEX_TREE, OUTFILE_TREE
 from .cui.command_arguments import CommandArguments
 from .nnigen import Tree
 from .nnigen.io.iohandler import TreeIOHandler
+from .process_usage import ProcessUsage
+from .resource_ledger import ResourceLedger
 
 
 class SummaryInfo:
     """サマリーファイルの情報を表します。
     """
 
-    def __init__(self, valid_tree: list[Tuple[float, Tree]], args: CommandArguments, time: timedelta, seed: int) -> None:
+    def __init__(self, valid_tree: list[Tuple[float, Tree]], args: CommandArguments, time: timedelta, seed: int, replicates: dict[int, int] | None = None, screened: dict[int, bool] | None = None, ledger: ResourceLedger | None = None, tree_counts: Tuple[int, int] | None = None, selected: Tuple[int, int] | None = None) -> None:
         """SummaryInfoの新しいインスタンスを初期化します。
 
         Args:
@@ -20,6 +22,11 @@ class SummaryInfo:
             args (CommandArguments): 引数情報
             seed (int): 乱数で使用したシード値
             time (deltatime): 実行時間
+            replicates (dict[int, int] | None, optional): 二分岐ごとに結果を確定させた複製数。適応的なRELL bootstrapでない場合はNone. Defaults to None.
+            screened (dict[int, bool] | None, optional): 事前判定で結果を確定させた二分岐と支持されるかどうか。事前判定を行わない場合はNone. Defaults to None.
+            ledger (ResourceLedger | None, optional): 外部プログラムの資源の使用量。Noneで出力しない. Defaults to None.
+            tree_counts (Tuple[int, int] | None, optional): 走査したノード数とコピーしたツリー数。Noneで出力しない. Defaults to None.
+            selected (Tuple[int, int] | None, optional): 解析した二分岐数と全ての二分岐数。Noneで出力しない. Defaults to None.
         """
         self.__nni: list[Tuple[float, Tree]] = list(valid_tree) or []
         self.__nni.sort(key=lambda x: x[0], reverse=True)
@@ -34,7 +41,14 @@ class SummaryInfo:
         self.__seed: int = seed
         self.__seed_generated: bool = args.seed == -1
         self.__rell_boot: int = args.rell_boot
+        self.__adaptive_boot: int | None = args.adaptive_bootstrap
+        self.__replicates: dict[int, int] | None = None if replicates is None else dict(sorted(replicates.items()))
+        self.__screened: dict[int, bool] | None = screened
         self.__time: timedelta = time
+        self.__tree_counts: Tuple[int, int] | None = tree_counts
+        self.__selected: Tuple[int, int] | None = selected
+        self.__programs: dict[str, ProcessUsage] = dict[str, ProcessUsage]() if ledger is None else ledger.programs
+        self.__bipartition_usages: dict[int, ProcessUsage] = dict[int, ProcessUsage]() if ledger is None else ledger.get_stage("au_test")
 
     @property
     def valid_nni_trees(self) -> list[Tuple[float, Tree]]:
@@ -90,6 +104,12 @@ class SummaryInfo:
         """
         return self.__rell_boot
 
+    @property
+    def replicates(self) -> dict[int, int] | None:
+        """二分岐ごとに結果を確定させたRELL-Bootstrapの複製数を取得します。適応的なRELL-Bootstrapでない場合はNoneです。
+        """
+        return self.__replicates
+
     @property
     def seed(self) -> int:
         """シード値を取得します。
@@ -160,10 +180,43 @@ class SummaryInfo:
                 writeline(f"{au}\t{str_io.getvalue()}")
         writeline()
 
+        if self.replicates is not None:
+            write_title("Bootstrap replicates")
+            writeline("bipartition\treplicates")
+            for index, replicates in self.replicates.items():
+                writeline(f"{index}\t{replicates}")
+            writeline()
+
+        if len(self.__programs) > 0:
+            write_title("Resource usage")
+            writeline("program\tprocesses\tuser_seconds\tsystem_seconds\twall_seconds\tmax_rss_mib")
+            for program, usage in sorted(self.__programs.items()):
+                writeline(f"{program}\t{self.__format_usage(usage)}")
+            writeline()
+
+        if len(self.__bipartition_usages) > 0:
+            write_title("Resource usage per bipartition")
+            writeline("bipartition\tprocesses\tuser_seconds\tsystem_seconds\twall_seconds\tmax_rss_mib")
+            for index, usage in self.__bipartition_usages.items():
+                writeline(f"{index}\t{self.__format_usage(usage)}")
+            writeline()
+
         write_title("Result tree")
         with open(self.output_result_tree_path, "r") as tree_io:
             writeline(tree_io.read(-1).strip())
 
+    @staticmethod
+    def __format_usage(usage: ProcessUsage) -> str:
+        """資源の使用量をTSVの列に変換します。
+
+        Args:
+            usage (ProcessUsage): 資源の使用量
+
+        Returns:
+            str: プロセス数，ユーザーCPU時間，システムCPU時間，経過時間，最大常駐メモリ（MiB）の列
+        """
+        return f"{usage.processes}\t{usage.user_time:.3f}\t{usage.system_time:.3f}\t{usage.wall_time:.3f}\t{usage.max_rss / 1024 / 1024:.1f}"
+
     def __get_summary(self) -> Generator[Tuple[str, Any], None, None]:
         yield ("Substitution model", self.model)
         yield ("Significant level", self.sig_level)
@@ -171,11 +224,22 @@ class SummaryInfo:
             yield ("Seed", f"-1 ({self.seed})")
         else:
             yield ("Seed", self.seed)
-        yield ("RELL-Bootstrap replicates", self.rell_boot)
+        if self.__adaptive_boot is None:
+            yield ("RELL-Bootstrap replicates", self.rell_boot)
+        else:
+            yield ("RELL-Bootstrap replicates", f"{self.__adaptive_boot}-{self.rell_boot} (adaptive)")
+        if self.__screened is not None:
+            supported: int = sum([1 for decision in self.__screened.values() if decision])
+            yield ("Bipartitions decided by pre-screen", f"{len(self.__screened)} ({supported} supported, {len(self.__screened) - supported} not supported, not AU-tested)")
+        if self.__selected is not None:
+            yield ("Analyzed bipartitions", f"{self.__selected[0]} / {self.__selected[1]}")
         yield ("Branch name format", self.out_format)
         yield ("Not rejected NNI trees", len(self.__nni))
         yield ("Sequence file", self.input_tree_seq)
         yield ("Best tree file", self.input_tree_path)
         yield ("Branch index file", self.output_indexed_tree_path)
         yield ("Result tree file", self.output_result_tree_path)
+        if self.__tree_counts is not None:
+            yield ("Tree nodes visited", self.__tree_counts[0])
+            yield ("Tree copies", self.__tree_counts[1])
         yield ("Total time", self.total_time)
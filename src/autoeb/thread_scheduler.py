@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from queue import Queue
+from typing import Generator
+
+
+class ThreadScheduler:
+    """スレッド数を同時に実行するワーカーに分配します。
+    """
+
+    def __init__(self, threads: int, workers: int) -> None:
+        """ThreadSchedulerの新しいインスタンスを初期化します。
+
+        Args:
+            threads (int): 分配するスレッド数
+            workers (int): 同時に実行するワーカー数（threadsを上限とする）
+        """
+        if threads < 1 or workers < 1:
+            raise ValueError("threads and workers must be greater or equal to 1")
+        count: int = min(threads, workers)
+        self.__shares: list[int] = [threads // count + (1 if i < threads % count else 0) for i in range(count)]
+        self.__queue: Queue[int] = Queue()
+        for share in self.__shares:
+            self.__queue.put(share)
+
+    @property
+    def workers(self) -> int:
+        """同時に実行するワーカー数を取得します。
+        """
+        return len(self.__shares)
+
+    @property
+    def shares(self) -> list[int]:
+        """各ワーカーに分配されるスレッド数を取得します。
+        """
+        return list(self.__shares)
+
+    @contextmanager
+    def allocate(self) -> Generator[int, None, None]:
+        """ワーカーにスレッドを割り当てます。空きがない場合は解放されるまで待機します。
+
+        Yields:
+            Generator[int, None, None]: 割り当てられたスレッド数
+        """
+        share: int = self.__queue.get()
+        try:
+            yield share
+        finally:
+            self.__queue.put(share)
@@ -0,0 +1,105 @@
+import os
+import shutil
+import subprocess
+from subprocess import CalledProcessError, Popen
+import tarfile
+from threading import Lock
+from types import TracebackType
+from typing import IO
+
+from .consts import OUTFILE_TMPZIP, OUTFILE_TMPZIP_ZSTD
+
+
+class TmpArchive:
+    """中間ファイルを逐次追加するtarアーカイブを表します。
+    圧縮は外部のプログラム（pigz, zstd）によりマルチスレッドで行われます。pigzが見つからない場合はgzipで圧縮されます。
+    """
+
+    COMPRESSIONS: dict[str, str] = {"gzip": "pigz", "zstd": "zstd"}
+
+    def __init__(self, path: str, compression: str, threads: int) -> None:
+        """TmpArchiveの新しいインスタンスを初期化します。
+
+        Args:
+            path (str): アーカイブのパス
+            compression (str): 圧縮方式（gzip, zstd）
+            threads (int): 圧縮に用いるスレッド数
+
+        Raises:
+            ValueError: 圧縮方式が不正であるか，zstdが見つからない
+        """
+        if not compression in self.COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}'")
+        self.__path: str = path
+        self.__lock = Lock()
+        self.__process: Popen[bytes] | None = None
+        self.__output: IO[bytes] | None = None
+        self.__closed: bool = False
+
+        command: str | None = shutil.which(self.COMPRESSIONS[compression])
+        if command is None and compression == "gzip":
+            # single-threaded gzip of tarfile
+            self.__tar: tarfile.TarFile = tarfile.open(path, "w|gz")
+            return
+        if command is None:
+            raise ValueError(f"'{self.COMPRESSIONS[compression]}' is not found")
+        arguments: list[str] = [command, "-p", str(threads), "-c"] if compression == "gzip" else [command, f"-T{threads}", "-q", "-c"]
+        self.__output = open(path, "wb")
+        self.__process = Popen(arguments, stdin=subprocess.PIPE, stdout=self.__output)
+        assert self.__process.stdin is not None
+        self.__tar = tarfile.open(fileobj=self.__process.stdin, mode="w|")
+
+    def __enter__(self) -> "TmpArchive":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """アーカイブのパスを取得します。
+        """
+        return self.__path
+
+    @staticmethod
+    def get_file_name(compression: str) -> str:
+        """圧縮方式に対応するアーカイブのファイル名を取得します。
+
+        Args:
+            compression (str): 圧縮方式（gzip, zstd）
+
+        Returns:
+            str: アーカイブのファイル名
+        """
+        return OUTFILE_TMPZIP_ZSTD if compression == "zstd" else OUTFILE_TMPZIP
+
+    def move(self, files: list[str]) -> None:
+        """ファイルをアーカイブに追加し，削除します。複数のスレッドから呼び出すことができます。
+
+        Args:
+            files (list[str]): 追加するファイルのパス（アーカイブ内ではファイル名のみ）
+        """
+        with self.__lock:
+            for file in files:
+                self.__tar.add(file, os.path.basename(file))
+                os.remove(file)
+
+    def close(self) -> None:
+        """アーカイブを閉じ，圧縮の完了を待機します。
+
+        Raises:
+            CalledProcessError: 圧縮プログラムが0以外の終了コードを返した
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__tar.close()
+            if self.__process is None or self.__output is None:
+                return
+            assert self.__process.stdin is not None
+            self.__process.stdin.close()
+            return_code: int = self.__process.wait()
+            self.__output.close()
+            if return_code != 0:
+                raise CalledProcessError(return_code, self.__process.args)
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+import json
+import os
+import threading
+from threading import Lock
+import time
+from typing import Any, Generator
+
+
+class TraceRecorder:
+    """処理の区間をスレッドごとに記録し，Chromeのtrace event形式で出力します。
+    """
+
+    def __init__(self, path: str) -> None:
+        """TraceRecorderの新しいインスタンスを初期化します。
+
+        Args:
+            path (str): 出力するファイルのパス
+        """
+        self.__path: str = path
+        self.__lock = Lock()
+        self.__origin: float = time.perf_counter()
+        self.__pid: int = os.getpid()
+        self.__lanes: dict[int, int] = dict[int, int]()
+        self.__events: list[dict[str, Any]] = [{"name": "process_name", "ph": "M", "pid": self.__pid, "tid": 0, "args": {"name": "AUTOEB"}}]
+
+    @property
+    def path(self) -> str:
+        """出力するファイルのパスを取得します。
+        """
+        return self.__path
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Generator[None, None, None]:
+        """区間を記録するコンテキストマネージャーを取得します。区間は呼び出したスレッドのレーンに表示されます。
+
+        Args:
+            name (str): 区間の名前
+            category (str): 区間の分類
+            args (Any): 区間に付加する値
+
+        Yields:
+            Generator[None, None, None]: 区間を記録するコンテキストマネージャー
+        """
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            end: float = time.perf_counter()
+            lane: int = self.__get_lane()
+            event: dict[str, Any] = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start - self.__origin) * 1_000_000, 3),
+                "dur": round((end - start) * 1_000_000, 3),
+                "pid": self.__pid,
+                "tid": lane,
+            }
+            if len(args) > 0:
+                event["args"] = args
+            with self.__lock:
+                self.__events.append(event)
+
+    def write(self) -> None:
+        """記録した区間をファイルに書き込みます。
+        """
+        with self.__lock:
+            events: list[dict[str, Any]] = list(self.__events)
+        with open(self.__path, "wt") as trace_io:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_io)
+
+    def __get_lane(self) -> int:
+        """呼び出したスレッドのレーン番号を取得します。初めて記録するスレッドにはスレッド名を付けたレーンを割り当てます。
+
+        Returns:
+            int: レーン番号
+        """
+        ident: int = threading.get_ident()
+        with self.__lock:
+            if not ident in self.__lanes:
+                self.__lanes[ident] = len(self.__lanes)
+                self.__events.append({"name": "thread_name", "ph": "M", "pid": self.__pid, "tid": self.__lanes[ident], "args": {"name": threading.current_thread().name}})
+            return self.__lanes[ident]
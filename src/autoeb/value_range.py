@@ -241,6 +241,28 @@ class ValueRange:
         """
         yield from self.__list
 
+    def to_mask(self, count: int) -> list[bool]:
+        """0からcount - 1までの値が範囲に含まれるかどうかの一覧を取得します。値と範囲はそれぞれ1回だけ走査されます。
+
+        Args:
+            count (int): 値の個数
+
+        Returns:
+            list[bool]: 値ごとに範囲に含まれるかどうか
+        """
+        if self.is_all:
+            return [True] * count
+        result: list[bool] = [False] * count
+        for current in self.__list:
+            if isinstance(current, _Point):
+                if 0 <= current.value < count:
+                    result[current.value] = True
+                continue
+            start: int = 0 if current.start is None else max(0, current.start)
+            end: int = count if current.end is None else min(count, current.end + 1)
+            result[start:end] = [True] * max(0, end - start)
+        return result
+
     def __add_point(self, value: "_Point") -> None:
         """値を追加します。
 
@@ -0,0 +1,237 @@
+import errno
+import fcntl
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from threading import Lock
+import time
+from types import TracebackType
+from typing import Any, Tuple
+
+
+class WorkQueue:
+    """複数のプロセス・ホストで二分岐の検定を分担するためのSQLiteデータベースのジョブキューを表します。
+    ワーカーはリース付きでジョブを取得し，リースが切れたジョブは他のワーカーが再取得します。
+    """
+
+    STATE_PENDING: str = "pending"
+    STATE_RUNNING: str = "running"
+    STATE_DONE: str = "done"
+    STATE_FAILED: str = "failed"
+
+    __LOCK_PROBE: str = (
+        "import errno, fcntl, sys\n"
+        "try:\n"
+        "    fcntl.lockf(open(sys.argv[1], 'r+'), fcntl.LOCK_EX | fcntl.LOCK_NB)\n"
+        "except OSError as e:\n"
+        "    sys.exit(1 if e.errno in (errno.EACCES, errno.EAGAIN) else 2)\n")
+    """別のプロセスからロックを取得するスクリプト。ロックが競合した場合は1，ロックを使用できない場合は2を返す
+    """
+
+    def __init__(self, path: str, timeout: float = 60.0) -> None:
+        """WorkQueueの新しいインスタンスを初期化します。
+
+        Args:
+            path (str): データベースファイルのパス（存在しない場合は作成される）
+            timeout (float, optional): 他のプロセスによるロックの解除を待機する時間（秒）. Defaults to 60.0.
+        """
+        self.__path: str = path
+        self.__lock = Lock()
+        # transactions are started explicitly so that a job is claimed by only one worker
+        self.__connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS job ("
+            "id INTEGER PRIMARY KEY, payload TEXT NOT NULL, state TEXT NOT NULL, owner TEXT, lease_until REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, result TEXT, collected INTEGER NOT NULL DEFAULT 0)")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @classmethod
+    def check_locks(cls, path: str) -> None:
+        """ジョブキューのデータベースファイルを置くディレクトリで，SQLiteが用いるPOSIXのファイルロックがプロセス間で機能するかを確認します。
+        ロックが機能しないファイルシステム（ロックを無効にしたNFSなど）では，複数のワーカーが同じジョブを取得する可能性があります。
+
+        Args:
+            path (str): データベースファイルのパス
+
+        Raises:
+            OSError: ロックを取得できないか，ロックが他のプロセスを排他しない
+        """
+        descriptor, probe_path = tempfile.mkstemp(prefix=".autoeb-lock-", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            fcntl.lockf(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # POSIX locks are owned by processes, so the exclusion is checked from another process
+            probe = subprocess.run([sys.executable, "-c", cls.__LOCK_PROBE, probe_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if probe.returncode == 0:
+                raise OSError(errno.ENOLCK, "File lock does not exclude other processes", probe_path)
+            if probe.returncode != 1:
+                raise OSError(errno.ENOLCK, "File lock is not available to other processes", probe_path)
+        finally:
+            os.close(descriptor)
+            os.remove(probe_path)
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None) -> None:
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """データベースファイルのパスを取得します。
+        """
+        return self.__path
+
+    @property
+    def is_closed(self) -> bool:
+        """ジョブの受付が終了しているかどうかを取得します。
+        """
+        with self.__lock:
+            row: Tuple[str] | None = self.__connection.execute("SELECT value FROM meta WHERE key = 'closed'").fetchone()
+        return row is not None and row[0] == "1"
+
+    def reset(self) -> None:
+        """全てのジョブを削除し，ジョブの受付を開始します。
+        """
+        with self.__lock:
+            self.__execute_transaction([
+                ("DELETE FROM job", ()),
+                ("INSERT OR REPLACE INTO meta (key, value) VALUES ('closed', '0')", ())])
+
+    def finish(self) -> None:
+        """ジョブの受付を終了します。ワーカーは実行中のジョブを終えた後に終了します。
+        """
+        with self.__lock:
+            self.__execute_transaction([("INSERT OR REPLACE INTO meta (key, value) VALUES ('closed', '1')", ())])
+
+    def put(self, job_id: int, payload: dict[str, Any], max_attempts: int) -> None:
+        """ジョブを追加します。同じIDのジョブは置き換えられます。
+
+        Args:
+            job_id (int): ジョブのID（二分岐のインデックス）
+            payload (dict[str, Any]): ジョブの内容
+            max_attempts (int): 失敗したジョブを含めて実行する回数の上限
+        """
+        with self.__lock:
+            self.__execute_transaction([(
+                "INSERT OR REPLACE INTO job (id, payload, state, max_attempts) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(payload), self.STATE_PENDING, max_attempts))])
+
+    def claim(self, owner: str, lease: float) -> Tuple[int, dict[str, Any]] | None:
+        """待機中のジョブか，リースが切れたジョブを1つ取得します。
+
+        Args:
+            owner (str): ワーカーの識別名
+            lease (float): リースの期間（秒）
+
+        Returns:
+            Tuple[int, dict[str, Any]] | None: ジョブのIDと内容。取得できるジョブがないか，受付が終了している場合はNone
+        """
+        now: float = time.time()
+        with self.__lock:
+            self.__connection.execute("BEGIN IMMEDIATE")
+            try:
+                # jobs of lost workers are retried until the number of attempts reaches the limit
+                self.__connection.execute(
+                    "UPDATE job SET state = ?, result = ? WHERE state = ? AND lease_until < ? AND attempts >= max_attempts",
+                    (self.STATE_FAILED, json.dumps("lease expired"), self.STATE_RUNNING, now))
+                row: Tuple[int, str] | None = self.__connection.execute(
+                    "SELECT id, payload FROM job WHERE (state = ? OR (state = ? AND lease_until < ?)) "
+                    "AND NOT EXISTS (SELECT * FROM meta WHERE key = 'closed' AND value = '1') ORDER BY id LIMIT 1",
+                    (self.STATE_PENDING, self.STATE_RUNNING, now)).fetchone()
+                if row is not None:
+                    self.__connection.execute(
+                        "UPDATE job SET state = ?, owner = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                        (self.STATE_RUNNING, owner, now + lease, row[0]))
+                self.__connection.execute("COMMIT")
+            except BaseException:
+                self.__connection.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return (row[0], json.loads(row[1]))
+
+    def renew(self, job_id: int, owner: str, lease: float) -> bool:
+        """ジョブのリースを延長します。
+
+        Args:
+            job_id (int): ジョブのID
+            owner (str): ワーカーの識別名
+            lease (float): 現在からのリースの期間（秒）
+
+        Returns:
+            bool: 延長できた場合はTrue，他のワーカーに取得されていた場合はFalse
+        """
+        with self.__lock:
+            cursor = self.__connection.execute(
+                "UPDATE job SET lease_until = ? WHERE id = ? AND owner = ? AND state = ?",
+                (time.time() + lease, job_id, owner, self.STATE_RUNNING))
+            return cursor.rowcount > 0
+
+    def complete(self, job_id: int, owner: str, result: dict[str, Any]) -> None:
+        """ジョブの結果を書き込みます。
+
+        Args:
+            job_id (int): ジョブのID
+            owner (str): ワーカーの識別名
+            result (dict[str, Any]): ジョブの結果
+        """
+        with self.__lock:
+            self.__execute_transaction([(
+                "UPDATE job SET state = ?, result = ? WHERE id = ? AND owner = ? AND state = ?",
+                (self.STATE_DONE, json.dumps(result), job_id, owner, self.STATE_RUNNING))])
+
+    def fail(self, job_id: int, owner: str, error: str) -> None:
+        """ジョブの失敗を書き込みます。実行回数が上限に達していない場合，ジョブは待機中に戻ります。
+
+        Args:
+            job_id (int): ジョブのID
+            owner (str): ワーカーの識別名
+            error (str): エラーの内容
+        """
+        with self.__lock:
+            self.__execute_transaction([(
+                "UPDATE job SET state = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, result = ?, owner = NULL "
+                "WHERE id = ? AND owner = ? AND state = ?",
+                (self.STATE_FAILED, self.STATE_PENDING, json.dumps(error), job_id, owner, self.STATE_RUNNING))])
+
+    def collect(self) -> list[Tuple[int, str, Any]]:
+        """終了したジョブのうち，まだ取得していないものの結果を取得します。
+
+        Returns:
+            list[Tuple[int, str, Any]]: ジョブのID，状態（done, failed），結果（失敗した場合はエラーの内容）の一覧
+        """
+        with self.__lock:
+            self.__connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows: list[Tuple[int, str, str]] = self.__connection.execute(
+                    "SELECT id, state, result FROM job WHERE state IN (?, ?) AND collected = 0 ORDER BY id",
+                    (self.STATE_DONE, self.STATE_FAILED)).fetchall()
+                self.__connection.executemany("UPDATE job SET collected = 1 WHERE id = ?", [(row[0],) for row in rows])
+                self.__connection.execute("COMMIT")
+            except BaseException:
+                self.__connection.execute("ROLLBACK")
+                raise
+        return [(job_id, state, json.loads(result)) for job_id, state, result in rows]
+
+    def close(self) -> None:
+        """データベースとの接続を閉じます。
+        """
+        self.__connection.close()
+
+    def __execute_transaction(self, statements: list[Tuple[str, tuple]]) -> None:
+        """SQL文を1つのトランザクションで実行します。
+
+        Args:
+            statements (list[Tuple[str, tuple]]): SQL文と引数の一覧
+        """
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, parameters in statements:
+                self.__connection.execute(sql, parameters)
+            self.__connection.execute("COMMIT")
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            raise
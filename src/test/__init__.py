@@ -1,2 +1,20 @@
 from .treetest import TreeTest
-from .conseltest import CatpvResult
+from .conseltest import ConselTest
+from .adaptivetest import AdaptiveTest
+from .archivetest import ArchiveTest
+from .batchtest import BatchTest
+from .executortest import ExecutorTest
+from .journaltest import JournalTest
+from .limitstest import LimitsTest
+from .mergetest import MergeTest
+from .metricstest import MetricsTest
+from .modeltest import ModelTest
+from .prescreentest import PrescreenTest
+from .processtest import ProcessTest
+from .progresstest import ProgressTest
+from .queuetest import QueueTest
+from .resulttabletest import ResultTableTest
+from .schedulertest import SchedulerTest
+from .scratchtest import ScratchTest
+from .stubtest import StubTest
+from .tracetest import TraceTest
@@ -0,0 +1,66 @@
+import io
+from io import TextIOWrapper
+import math
+from subprocess import CompletedProcess
+import unittest
+from autoeb import AdaptiveBootstrap, CatpvResult, Configuration, ConselManager, SlhData
+from autoeb.bipartition_tester import BipartitionTester
+
+from test.common import get_output_dir, get_test_data_dir
+
+
+class AdaptiveTest(unittest.TestCase):
+    """AdaptiveBootstrapのユニットテストを行うクラスです。
+    """
+
+    def test_adaptive_bootstrap(self) -> None:
+        """RELL bootstrapの複製数の段階的な増加をテストします。
+        """
+        assert AdaptiveBootstrap(1000, 100000, 0.05).replicates == [1000, 10000, 100000]
+        assert AdaptiveBootstrap(2000, 50000, 0.05).replicates == [2000, 20000, 50000]
+        assert AdaptiveBootstrap(100000, 100000, 0.05).replicates == [100000]
+
+        # standard errors printed by 'catpv -s' are read, and the p-values of NNI trees are 0.061 (0.011) and 0.030 (0.004)
+        catpv: CatpvResult = CatpvResult.load(get_test_data_dir() + "catpv-se.txt")[0]
+        assert catpv.stat_nni1.au_se == 0.004 and catpv.stat_nni2.au_se == 0.011
+        assert CatpvResult.from_rows(catpv.to_rows()).stat_nni2.au_se == 0.011
+        assert not AdaptiveBootstrap(1000, 100000, 0.05).is_decided(catpv)
+        assert AdaptiveBootstrap(1000, 100000, 0.01).is_decided(catpv)
+        assert AdaptiveBootstrap(1000, 100000, 0.1).is_decided(catpv)
+        # the result without standard errors is never decided before the maximum replicates
+        assert math.isnan(CatpvResult.load(get_test_data_dir() + "catpv.txt")[0].stat_nni1.au_se)
+        assert not AdaptiveBootstrap(1000, 100000, 0.7).is_decided(CatpvResult.load(get_test_data_dir() + "catpv.txt")[0])
+
+    def test_adaptive_escalation(self) -> None:
+        """p値が有意水準に近い二分岐の複製数が増やされることをテストします。
+        """
+        class RegressionConsel(ConselManager):
+            """AU検定のp値が0.06，標準誤差が複製数の平方根に反比例するCONSELです。
+            """
+
+            def __init__(self) -> None:
+                super().__init__(Configuration.load())
+                self.replicates: list[int] = []
+
+            def makermt(self, sitelh_path: str, seed: int, rellboot: int, cwd: str | None = None, stdout: TextIOWrapper | None = None) -> CompletedProcess[bytes]:
+                self.replicates.append(rellboot)
+                return CompletedProcess([], 0)
+
+            def consel(self, rmt_path: str, cwd: str | None = None, stdout: TextIOWrapper | None = None) -> CompletedProcess[bytes]:
+                return CompletedProcess([], 0)
+
+            def catpv(self, pv_path: str, cwd: str | None = None, stdout: TextIOWrapper | None = None, standard_error: bool = False) -> CompletedProcess[bytes]:
+                assert standard_error and stdout is not None
+                se: float = 0.5 / math.sqrt(self.replicates[-1])
+                stdout.write(f"\n# reading {pv_path}.pv\n# rank item    obs     au     np |     bp     pp     kh     sh    wkh    wsh |\n")
+                for rank, item, au in [(1, 1, 0.9), (2, 2, 0.06), (3, 3, 0.01)]:
+                    stdout.write(f"# {rank:4d} {item:4d}    0.0  {au:.3f}  0.500 |  0.500  0.500  0.500  0.500  0.500  0.500 |\n")
+                    stdout.write(f"#                 ({se:.4f}) (0.001) |(0.001) (0.000) (0.001) (0.001) (0.001) (0.001)|\n")
+                return CompletedProcess([], 0)
+
+        # the binomial error of 10,000 replicates (0.0024) would decide the bipartition, but the error of the regression (0.005) does not
+        consel = RegressionConsel()
+        tester = BipartitionTester(consel, get_output_dir(), 100000, AdaptiveBootstrap(1000, 100000, 0.05), io.StringIO())
+        result, replicates = tester.test(SlhData([[-1.0, -2.0], [-1.5, -2.5], [-1.2, -2.1]]), 0, 1, 1)
+        assert consel.replicates == [1000, 10000, 100000]
+        assert replicates == 100000 and result.stat_nni1.au == 0.06
@@ -0,0 +1,112 @@
+import os
+import shutil
+import subprocess
+from subprocess import CalledProcessError
+import tarfile
+import unittest
+from autoeb.consts import OUTFILE_TMPZIP, OUTFILE_TMPZIP_ZSTD
+from autoeb.tmp_archive import TmpArchive
+
+from test.common import get_output_dir
+
+
+class ArchiveTest(unittest.TestCase):
+    """TmpArchiveのユニットテストを行うクラスです。
+    """
+
+    def setUp(self) -> None:
+        self.__path: str | None = os.environ.get("PATH")
+
+    def tearDown(self) -> None:
+        if self.__path is not None:
+            os.environ["PATH"] = self.__path
+
+    @staticmethod
+    def __write_files(directory: str, count: int) -> list[str]:
+        """アーカイブに追加するファイルを出力します。
+
+        Args:
+            directory (str): 出力先のディレクトリ
+            count (int): ファイル数
+
+        Returns:
+            list[str]: 出力したファイルのパス
+        """
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        result: list[str] = []
+        for index in range(count):
+            path: str = os.path.join(directory, f"{index}.rmt")
+            with open(path, "wb") as io:
+                io.write(bytes([index]) * 1000)
+            result.append(path)
+        return result
+
+    @staticmethod
+    def __write_command(directory: str, name: str, script: str) -> None:
+        """PATHに置くコマンドを出力します。
+
+        Args:
+            directory (str): 出力先のディレクトリ
+            name (str): コマンド名
+            script (str): シェルスクリプト
+        """
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        path: str = os.path.join(directory, name)
+        with open(path, "wt") as io:
+            io.write("#!/bin/sh\n" + script + "\n")
+        os.chmod(path, 0o755)
+
+    def test_gzip(self) -> None:
+        """gzipで圧縮したアーカイブの読み込みをテストします。pigzが見つからない場合もgzipで圧縮されます。
+        """
+        assert TmpArchive.get_file_name("gzip") == OUTFILE_TMPZIP
+        # 'pigz' is replaced by gzip so that the test does not depend on the installed programs
+        command_dir: str = get_output_dir() + "archive-bin"
+        self.__write_command(command_dir, "pigz", f"exec {shutil.which('gzip')} -c")
+        for path_env in [command_dir, get_output_dir() + "archive-empty"]:
+            os.environ["PATH"] = path_env
+            files: list[str] = self.__write_files(get_output_dir() + "archive-gzip", 3)
+            path: str = get_output_dir() + OUTFILE_TMPZIP
+            with TmpArchive(path, "gzip", 2) as archive:
+                archive.move(files[:2])
+                archive.move(files[2:])
+            # files are removed after they are added
+            assert not any([os.path.exists(file) for file in files])
+            with tarfile.open(path, "r:gz") as tar:
+                members: dict[str, bytes] = dict([(member.name, tar.extractfile(member).read()) for member in tar])  # type: ignore
+            assert members == {"0.rmt": bytes([0]) * 1000, "1.rmt": bytes([1]) * 1000, "2.rmt": bytes([2]) * 1000}
+
+    @unittest.skipIf(shutil.which("zstd") is None, "zstd is not found")
+    def test_zstd(self) -> None:
+        """zstdで圧縮したアーカイブの読み込みをテストします。
+        """
+        assert TmpArchive.get_file_name("zstd") == OUTFILE_TMPZIP_ZSTD
+        files: list[str] = self.__write_files(get_output_dir() + "archive-zstd", 2)
+        path: str = get_output_dir() + OUTFILE_TMPZIP_ZSTD
+        with TmpArchive(path, "zstd", 2) as archive:
+            archive.move(files)
+        listed: subprocess.CompletedProcess[str] = subprocess.run(f"zstd -dc '{path}' | tar -t", shell=True, capture_output=True, text=True, check=True)
+        assert listed.stdout.split() == ["0.rmt", "1.rmt"]
+
+    def test_failure(self) -> None:
+        """圧縮プログラムが見つからないか失敗した場合をテストします。
+        """
+        with self.assertRaises(ValueError):
+            TmpArchive(get_output_dir() + "archive.tar", "xz", 1)
+        os.environ["PATH"] = get_output_dir() + "archive-empty"
+        with self.assertRaises(ValueError):
+            TmpArchive(get_output_dir() + OUTFILE_TMPZIP_ZSTD, "zstd", 1)
+
+        # the exit code of the compressor is reported when the archive is closed
+        command_dir: str = get_output_dir() + "archive-bin"
+        self.__write_command(command_dir, "zstd", "cat > /dev/null\nexit 3")
+        os.environ["PATH"] = command_dir
+        archive = TmpArchive(get_output_dir() + OUTFILE_TMPZIP_ZSTD, "zstd", 1)
+        archive.move(self.__write_files(get_output_dir() + "archive-failure", 1))
+        with self.assertRaises(CalledProcessError) as raised:
+            archive.close()
+        assert raised.exception.returncode == 3
+        # closing again does not raise
+        archive.close()
@@ -0,0 +1,148 @@
+from argparse import ArgumentError
+import os
+import shutil
+import unittest
+from autoeb.bench.pipeline import run_autoeb, write_dataset
+from autoeb.bench.stub_programs import TOOLS
+from autoeb.consts import OUTFILE_LOG, OUTFILE_TREE
+from autoeb.cui import BatchArguments
+from autoeb.resource_limits import ResourceLimits
+
+from test.common import get_output_dir, get_stub_env
+
+
+class BatchTest(unittest.TestCase):
+    """複数のデータセットを1つのプロセスで解析するコマンドのユニットテストを行うクラスです。
+    """
+
+    __root: str = get_output_dir() + "batch/"
+
+    def setUp(self) -> None:
+        shutil.rmtree(self.__root, ignore_errors=True)
+        os.makedirs(self.__root)
+
+    def write_manifest(self, lines: list[str]) -> str:
+        """データセットの一覧のファイルを出力します。
+
+        Args:
+            lines (list[str]): ファイルの行
+
+        Returns:
+            str: ファイルのパス
+        """
+        path: str = self.__root + "manifest.tsv"
+        with open(path, "wt") as manifest_io:
+            manifest_io.write(str.join("\n", lines) + "\n")
+        return path
+
+    def write_datasets(self, count: int) -> list[str]:
+        """データセットと，それらの一覧の行を出力します。
+
+        Args:
+            count (int): データセット数
+
+        Returns:
+            list[str]: データセットの一覧の行（相対パス）
+        """
+        result: list[str] = []
+        for index in range(count):
+            os.makedirs(self.__root + f"data{index}")
+            write_dataset(self.__root + f"data{index}", 5 + index, 200)
+            result.append(str.join("\t", [f"data{index}/seq.fa", f"data{index}/ml.tree", "GTR+F+I+G4", f"out{index}"]))
+        return result
+
+    def wrap_stub_programs(self, stub_dir: str) -> str:
+        """スタブの実行の開始と終了を記録するラッパーでスタブを置き換えます。
+
+        Args:
+            stub_dir (str): スタブのディレクトリ
+
+        Returns:
+            str: 開始を'+'，終了を'-'として1行ずつ記録するファイルのパス
+        """
+        log_path: str = self.__root + "processes.log"
+        for tool in TOOLS:
+            path: str = os.path.join(stub_dir, tool)
+            os.rename(path, path + ".stub")
+            with open(path, "wt") as script_io:
+                script_io.write(f"#!/bin/sh\necho + >> '{log_path}'\n'{path}.stub' \"$@\"\ncode=$?\necho - >> '{log_path}'\nexit $code\n")
+            os.chmod(path, 0o755)
+        return log_path
+
+    @staticmethod
+    def get_max_processes(log_path: str) -> int:
+        """同時に実行されていたスタブの数の最大値を取得します。
+
+        Args:
+            log_path (str): スタブの実行の開始と終了を記録したファイルのパス
+
+        Returns:
+            int: 同時に実行されていたスタブの数の最大値
+        """
+        running: int = 0
+        result: int = 0
+        with open(log_path, "rt") as log_io:
+            for line in log_io:
+                running += 1 if line.strip() == "+" else -1
+                result = max(result, running)
+        assert running == 0
+        return result
+
+    def test_arguments(self) -> None:
+        """データセットの一覧とコア数の引数をテストします。
+        """
+        manifest: str = self.write_manifest(["# sequence\ttree\tmodel\tdestination", "", "a.fa\ta.tree\tLG\tout-a", "b.fa\tb.tree\tout-b"])
+        with self.assertRaises(ArgumentError) as raised:
+            BatchArguments([manifest]).datasets
+        assert raised.exception.message.startswith("Line 4 of ")
+        manifest = self.write_manifest(["a.fa\ta.tree\tLG\tout-a"])
+        assert BatchArguments([manifest]).datasets == [(self.__root + "a.fa", self.__root + "a.tree", "LG", self.__root + "out-a")]
+        with self.assertRaises(ArgumentError):
+            BatchArguments([self.__root + "missing.tsv"]).manifest
+
+        # the datasets analyzed at once are as many as the shared cores by default
+        assert BatchArguments([manifest]).cores == ResourceLimits.detect().cpus
+        assert BatchArguments([manifest, "--cores", "3"]).concurrent_datasets == 3
+        assert BatchArguments([manifest, "--cores", "3", "--datasets", "5"]).concurrent_datasets == 5
+        for options in [["--cores", "0"], ["--datasets", "0"]]:
+            with self.assertRaises(ArgumentError):
+                BatchArguments([manifest] + options).concurrent_datasets
+
+        # the other options are given to every dataset
+        assert BatchArguments([manifest, "--cores", "2", "-b", "2000", "--seed", "1"]).options == ["-b", "2000", "--seed", "1"]
+        for option in ["-o", "--trace"]:
+            with self.assertRaises(ArgumentError):
+                BatchArguments([manifest, option, "x"]).options
+
+    def test_failed_dataset(self) -> None:
+        """一部のデータセットの解析が失敗しても他のデータセットの解析が続くことをテストします。
+        """
+        env: dict[str, str] = get_stub_env(self.__root + "stubs")
+        lines: list[str] = self.write_datasets(3)
+        os.remove(self.__root + "data1/ml.tree")
+        log_path: str = self.__root + "autoeb.log"
+        return_code, _ = run_autoeb(["batch", self.write_manifest(lines), "--datasets", "1", "-b", "1000", "--seed", "1"], env, log_path)
+        assert return_code == 1
+        assert os.path.isfile(self.__root + "out0/" + OUTFILE_TREE) and os.path.isfile(self.__root + "out2/" + OUTFILE_TREE)
+        assert not os.path.isfile(self.__root + "out1/" + OUTFILE_TREE)
+        with open(log_path, "rt") as log_io:
+            log: str = log_io.read()
+        assert "Dataset No. 1 / 2 failed" in log
+        assert "Dataset No. 2 / 2 finished" in log
+        # the progress of each dataset is written in its destination
+        with open(self.__root + "out2/" + OUTFILE_LOG, "rt") as dataset_log_io:
+            assert "Finish CONSEL operation" in dataset_log_io.read()
+
+    def test_shared_cores(self) -> None:
+        """同時に解析するデータセットが共有するコア数を超えて外部プログラムを実行しないことをテストします。
+        """
+        stub_dir: str = self.__root + "stubs"
+        env: dict[str, str] = get_stub_env(stub_dir, 0.05)
+        process_log_path: str = self.wrap_stub_programs(stub_dir)
+        manifest: str = self.write_manifest(self.write_datasets(3))
+        for cores in [1, 2]:
+            if os.path.isfile(process_log_path):
+                os.remove(process_log_path)
+            return_code, _ = run_autoeb(["batch", manifest, "--cores", str(cores), "--datasets", "3", "-b", "1000", "-T", "2", "--seed", "1", "--redo"], env, self.__root + "autoeb.log")
+            assert return_code == 0
+            assert self.get_max_processes(process_log_path) == cores
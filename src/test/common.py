@@ -1,5 +1,8 @@
 import os
 
+from autoeb import Configuration, StatisticsEntry
+from autoeb.bench.stub_programs import write_stub_programs
+
 
 def get_test_data_dir() -> str:
     """テスト用データの配置されているディレクトリのパスを取得します。
@@ -20,3 +23,51 @@ def get_output_dir() -> str:
     if not os.path.isdir(result):
         os.mkdir(result)
     return result
+
+
+def compare_statistics_entry(stat: StatisticsEntry, rank: int, item: int, obs: float, au: float, np: float, bp: float, pp: float, kh: float, sh: float, wkh: float, wsh: float) -> None:
+    """StatisticsEntryの値を検証します。
+
+    Args:
+        stat (StatisticsEntry): 検証するインスタンス
+        rank (int): 順位
+        item (int): ツリーの番号
+        obs (float): 最尤樹形との対数尤度の差
+        au (float): AU検定のp値
+        np (float): マルチスケール・ブートストラップによるBP
+        bp (float): RELL bootstrapによるBP
+        pp (float): ベイズ事後確率
+        kh (float): KH検定のp値
+        sh (float): SH検定のp値
+        wkh (float): 重み付きKH検定のp値
+        wsh (float): 重み付きSH検定のp値
+    """
+    assert stat.rank == rank
+    assert stat.index == item
+    assert stat.obs == obs
+    assert stat.au == au
+    assert stat.np == np
+    assert stat.brell == bp
+    assert stat.pp == pp
+    assert stat.kh == kh
+    assert stat.sh == sh
+    assert stat.wkh == wkh
+    assert stat.wsh == wsh
+
+
+def get_stub_env(stub_dir: str, delay: float = 0.0) -> dict[str, str]:
+    """スタブのIQ-TREEとCONSELを使用してAUTOEBを子プロセスとして実行するための環境変数を取得します。
+
+    Args:
+        stub_dir (str): スタブを出力するディレクトリ
+        delay (float, optional): スタブが1回の実行で待機する秒数. Defaults to 0.0.
+
+    Returns:
+        dict[str, str]: 環境変数
+    """
+    os.makedirs(stub_dir, exist_ok=True)
+    settings: dict[str, float] = {"model_delay": delay, "iqtree_delay": 0, "makermt_delay": delay, "consel_delay": delay, "catpv_delay": delay}
+    result: dict[str, str] = dict(os.environ)
+    result[Configuration.ENV_CONFIG_PATH] = write_stub_programs(stub_dir, settings)
+    result["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return result
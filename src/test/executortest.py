@@ -0,0 +1,48 @@
+import unittest
+from autoeb import JobExecutionError, JobExecutor
+
+
+class ExecutorTest(unittest.TestCase):
+    """JobExecutorのユニットテストを行うクラスです。
+    """
+
+    def test_results(self) -> None:
+        """ジョブの結果の収集をテストします。
+        """
+        with JobExecutor[int, int](4) as executor:
+            for i in range(10):
+                executor.submit(i, lambda x: x * x, i)
+            result: dict[int, int] = executor.wait()
+        assert list(result.keys()) == list(range(10))
+        assert all([result[i] == i * i for i in range(10)])
+
+    def test_retry(self) -> None:
+        """失敗したジョブの再実行をテストします。
+        """
+        attempts: list[int] = []
+
+        def flaky() -> str:
+            attempts.append(len(attempts))
+            if len(attempts) < 3:
+                raise RuntimeError("failed")
+            return "done"
+
+        with JobExecutor[str, str](2, retries=2) as executor:
+            executor.submit("flaky", flaky)
+            assert executor.wait() == {"flaky": "done"}
+        assert len(attempts) == 3
+
+    def test_failure(self) -> None:
+        """再実行しても失敗したジョブの報告をテストします。
+        """
+        def fail() -> int:
+            raise RuntimeError("failed")
+
+        with JobExecutor[int, int](2, retries=1) as executor:
+            executor.submit(0, lambda: 0)
+            executor.submit(1, fail)
+            try:
+                executor.wait()
+                assert False
+            except JobExecutionError as e:
+                assert list(e.failures.keys()) == [1]
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import unittest
+from autoeb import CatpvResult
+from autoeb.checkpoint_journal import CheckpointJournal
+from autoeb.sqlite_batch import SqliteBatch
+
+from test.common import compare_statistics_entry, get_output_dir, get_test_data_dir
+
+
+class JournalTest(unittest.TestCase):
+    """CheckpointJournalとSqliteBatchのユニットテストを行うクラスです。
+    """
+
+    def test_checkpoint_journal(self) -> None:
+        """検定結果のジャーナルへの記録をテストします。
+        """
+        path: str = get_output_dir() + "checkpoint.sqlite"
+        if os.path.isfile(path):
+            os.remove(path)
+        catpv: CatpvResult = CatpvResult.load(get_test_data_dir() + "catpv.txt")[0]
+        with CheckpointJournal(path) as journal:
+            journal.record_result(3, "a" * 64, catpv, 1000)
+            journal.record(CheckpointJournal.STAGE_MAKERMT, 3, "a" * 64, "1000")
+            journal.discard(CheckpointJournal.STAGE_MAKERMT, 3)
+            # records are committed together, and the pending records are read by the same journal
+            assert journal.get_result(3, "a" * 64) is not None
+            with sqlite3.connect(path) as connection:
+                assert connection.execute("SELECT COUNT(*) FROM journal").fetchone()[0] == 0
+            journal.flush()
+            with sqlite3.connect(path) as connection:
+                assert connection.execute("SELECT COUNT(*) FROM journal").fetchone()[0] == 1
+
+        # records are committed and reused only with the same fingerprint
+        with CheckpointJournal(path) as journal:
+            assert journal.get_result(3, "b" * 64) is None
+            assert journal.get(CheckpointJournal.STAGE_MAKERMT, 3, "a" * 64) is None
+            recorded = journal.get_result(3, "a" * 64)
+            assert recorded is not None
+            assert recorded[1] == 1000
+            compare_statistics_entry(recorded[0].stat_nni1, 1, 2, -0.0, 0.596, 0.446, 0.441, 0.343, 0.563, 0.731, 0.563, 0.733)
+            journal.clear()
+            assert journal.get_result(3, "a" * 64) is None
+
+    def test_sqlite_batch(self) -> None:
+        """書き込みが件数と時間ごとにまとめてコミットされることをテストします。
+        """
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE item (value INTEGER)")
+        connection.commit()
+        batch = SqliteBatch(connection, 3, 3600)
+        for value in range(2):
+            batch.execute("INSERT INTO item VALUES (?)", (value,))
+        assert batch.pending == 2 and connection.in_transaction
+        batch.execute("INSERT INTO item VALUES (?)", (2,))
+        assert batch.pending == 0 and not connection.in_transaction
+        # the interval also commits the writes
+        batch = SqliteBatch(connection, 100, 0)
+        batch.execute("INSERT INTO item VALUES (?)", (3,))
+        assert batch.pending == 0 and not connection.in_transaction
+        assert connection.execute("SELECT COUNT(*) FROM item").fetchone()[0] == 4
+        connection.close()
@@ -0,0 +1,42 @@
+import os
+import unittest
+from autoeb.resource_limits import ResourceLimits
+
+from test.common import get_output_dir
+
+
+class LimitsTest(unittest.TestCase):
+    """ResourceLimitsのユニットテストを行うクラスです。
+    """
+
+    def test_resource_limits(self) -> None:
+        """cgroupのCPUクォータとメモリ上限の読み込みをテストします。
+        """
+        root: str = get_output_dir() + "limits/"
+        files: dict[str, str] = {
+            "proc/self/cgroup": "0::/job\n",
+            "proc/meminfo": "MemTotal: 16777216 kB\nMemAvailable: 8388608 kB\n",
+            "cgroup/job/cpu.max": "150000 100000\n",
+            "cgroup/job/memory.max": "1073741824\n",
+            "cgroup/job/memory.current": "268435456\n",
+        }
+        for name, content in files.items():
+            os.makedirs(os.path.dirname(root + name), exist_ok=True)
+            with open(root + name, "wt") as io:
+                io.write(content)
+
+        # fractional quota is rounded down and the memory is limited by the cgroup
+        limits: ResourceLimits = ResourceLimits.detect(root + "cgroup", root + "proc")
+        assert limits.cpus == min(1, len(os.sched_getaffinity(0)))
+        assert limits.memory == 768 * 1024 * 1024
+        assert ResourceLimits(8, 1000).get_max_jobs(300) == 3
+        assert ResourceLimits(8, None).get_max_jobs(300) == 8
+
+        # unlimited
+        with open(root + "cgroup/job/cpu.max", "wt") as io:
+            io.write("max 100000\n")
+        with open(root + "cgroup/job/memory.max", "wt") as io:
+            io.write("max\n")
+        limits = ResourceLimits.detect(root + "cgroup", root + "proc")
+        assert limits.cpus == len(os.sched_getaffinity(0))
+        assert limits.memory == 8 * 1024 * 1024 * 1024
@@ -0,0 +1,139 @@
+from argparse import ArgumentError
+import os
+import shutil
+import sqlite3
+from typing import Any
+import unittest
+from autoeb.bench.pipeline import run_autoeb, write_dataset
+from autoeb.consts import OUTFILE_RESULTS, OUTFILE_SUMMARY, OUTFILE_TREE
+from autoeb.cui import MergeArguments
+from autoeb.merge_manager import MergeManager
+from autoeb.result_table import ResultTable
+
+from test.common import get_output_dir, get_stub_env
+
+
+class MergeTest(unittest.TestCase):
+    """出力先を分けて解析した結果の統合のユニットテストを行うクラスです。
+    """
+
+    __root: str = get_output_dir() + "merge/"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """スタブのIQ-TREEとCONSELを使用して，全ての二分岐と一部の二分岐の解析を実行します。
+        """
+        shutil.rmtree(cls.__root, ignore_errors=True)
+        os.makedirs(cls.__root)
+        env: dict[str, str] = get_stub_env(cls.__root + "stubs")
+        sequence_path, tree_path = write_dataset(cls.__root, 8, 200)
+        arguments: list[str] = ["-s", sequence_path, "-t", tree_path, "-m", "GTR+F+I+G4", "-b", "1000"]
+        runs: dict[str, list[str]] = {
+            "full": ["--seed", "1"],
+            "first": ["--seed", "1", "--range", "0-1"],
+            "second": ["--seed", "1", "--range", "2-"],
+            "other-seed": ["--seed", "2", "--range", "2-"],
+        }
+        for name, extra in runs.items():
+            return_code, _ = run_autoeb(arguments + extra + ["-o", cls.__root + name], env, cls.__root + "autoeb.log")
+            assert return_code == 0
+
+    @classmethod
+    def merge(cls, names: list[str], out_name: str) -> str:
+        """解析の結果を統合します。
+
+        Args:
+            names (list[str]): 統合する出力先の名前
+            out_name (str): 統合した結果の出力先の名前
+
+        Returns:
+            str: 統合した結果の出力先ディレクトリ
+        """
+        out_dir: str = cls.__root + out_name
+        MergeManager(MergeArguments([cls.__root + name for name in names] + ["-o", out_dir])).execute()
+        return out_dir
+
+    @staticmethod
+    def read_text(path: str) -> str:
+        """テキストファイルを読み込みます。
+
+        Args:
+            path (str): ファイルのパス
+
+        Returns:
+            str: ファイルの内容
+        """
+        with open(path, "rt") as io:
+            return io.read()
+
+    @staticmethod
+    def read_section(path: str, name: str) -> list[str]:
+        """サマリーファイルの1つのセクションの行を読み込みます。
+
+        Args:
+            path (str): サマリーファイルのパス
+            name (str): セクション名
+
+        Returns:
+            list[str]: セクションの行（空行を除く）
+        """
+        with open(path, "rt") as io:
+            sections: list[str] = io.read().split("\n\n")
+        return [section.splitlines()[1:] for section in sections if section.startswith(f"[{name}]")][0]
+
+    def test_merge(self) -> None:
+        """範囲を分けた解析の統合が全ての二分岐の解析と同じ結果になることをテストします。
+        """
+        full_dir: str = self.__root + "full"
+        out_dir: str = self.merge(["first", "second"], "merged")
+        assert self.read_text(os.path.join(out_dir, OUTFILE_TREE)) == self.read_text(os.path.join(full_dir, OUTFILE_TREE))
+        with ResultTable(os.path.join(out_dir, OUTFILE_RESULTS)) as merged, ResultTable(os.path.join(full_dir, OUTFILE_RESULTS)) as full:
+            merged_rows: dict[int, dict[str, Any]] = merged.read()
+            full_rows: dict[int, dict[str, Any]] = full.read()
+        assert list(merged_rows.keys()) == [0, 1, 2, 3, 4]
+        for i, row in merged_rows.items():
+            # the stub IQ-TREE generates the site likelihood values of each chunk separately, and the elapsed time differs
+            ignored: dict[str, Any] = {"delta_lnl_nni1": None, "delta_lnl_nni2": None, "elapsed": None}
+            assert row | ignored == full_rows[i] | ignored
+
+        # the summary lists the same trees as the full run
+        summary_path: str = os.path.join(out_dir, OUTFILE_SUMMARY)
+        full_summary_path: str = os.path.join(full_dir, OUTFILE_SUMMARY)
+        for name in ["Best tree", "Not rejected NNI trees", "Result tree"]:
+            assert self.read_section(summary_path, name) == self.read_section(full_summary_path, name)
+        summary: list[str] = self.read_section(summary_path, "Summary")
+        assert "Seed: 1" in summary
+        assert f"Result tree file: {os.path.join(out_dir, OUTFILE_TREE)}" in summary
+        assert [line for line in summary if line.startswith("Not rejected NNI trees: ")] == [line for line in self.read_section(full_summary_path, "Summary") if line.startswith("Not rejected NNI trees: ")]
+
+        # the same results of overlapping runs are merged
+        assert self.read_text(os.path.join(self.merge(["full", "second"], "merged-overlap"), OUTFILE_TREE)) == self.read_text(os.path.join(full_dir, OUTFILE_TREE))
+
+    def test_missing(self) -> None:
+        """一部の二分岐の結果がない場合の統合をテストします。
+        """
+        out_dir: str = self.merge(["first"], "merged-missing")
+        with ResultTable(os.path.join(out_dir, OUTFILE_RESULTS)) as results:
+            assert list(results.read().keys()) == [0, 1]
+        # the bipartitions without the results are not annotated
+        tree: str = self.read_text(os.path.join(out_dir, OUTFILE_TREE))
+        full_tree: str = self.read_text(os.path.join(self.__root + "full", OUTFILE_TREE))
+        assert tree.count("/") == 2 and full_tree.count("/") == 5
+
+    def test_conflict(self) -> None:
+        """解析の条件や同じ二分岐の結果が異なる場合のエラーをテストします。
+        """
+        with self.assertRaises(ArgumentError) as raised:
+            self.merge(["first", "other-seed"], "merged-seed")
+        assert "different seed" in raised.exception.message
+
+        # the results of the same bipartition must have the same fingerprint
+        conflict_dir: str = self.__root + "conflict"
+        shutil.rmtree(conflict_dir, ignore_errors=True)
+        shutil.copytree(self.__root + "second", conflict_dir)
+        with sqlite3.connect(os.path.join(conflict_dir, OUTFILE_RESULTS)) as connection:
+            connection.execute("UPDATE result SET fingerprint = 'conflict' WHERE bipartition = 3")
+        connection.close()
+        with self.assertRaises(ArgumentError) as raised:
+            self.merge(["first", "second", "conflict"], "merged-conflict")
+        assert raised.exception.message == "Results of bipartition 3 are different in the merged folders"
@@ -0,0 +1,49 @@
+import json
+import os
+import unittest
+from autoeb import JobExecutor
+from autoeb.metrics_recorder import MetricsRecorder
+from autoeb.progress_monitor import ProgressMonitor
+
+from test.common import get_output_dir
+
+
+class MetricsTest(unittest.TestCase):
+    """MetricsRecorderのユニットテストを行うクラスです。
+    """
+
+    def test_metrics(self) -> None:
+        """段階とジョブの状態の変化の記録をテストします。
+        """
+        events_path: str = get_output_dir() + "metrics.jsonl"
+        textfile_path: str = get_output_dir() + "metrics.prom"
+        if os.path.isfile(events_path):
+            os.remove(events_path)
+
+        with MetricsRecorder(events_path, textfile_path, {"out": "a\"b"}) as metrics:
+            def run(key: int) -> int:
+                metrics.add_io("test", key, 100)
+                return key
+
+            with ProgressMonitor("test", 4, None, metrics, "test") as progress:
+                progress.skip(1)
+                with JobExecutor[int, int](2, progress=progress) as executor:
+                    for i in range(3):
+                        executor.submit(i, run, i)
+                    executor.wait()
+                assert progress.eta == 0
+
+        with open(events_path, "rt") as events_io:
+            events: list[dict] = [json.loads(line) for line in events_io]
+        assert [e["event"] for e in events[:3]] == ["run_start", "stage_start", "job_skipped"]
+        assert [e["event"] for e in events[-2:]] == ["stage_end", "run_end"]
+        finished: list[dict] = [e for e in events if e["event"] == "job_finished"]
+        assert sorted([e["key"] for e in finished]) == [0, 1, 2]
+        assert all([e["status"] == "done" and e["io_bytes"] == 100 and e["run_seconds"] >= 0 for e in finished])
+        assert events[-2]["io_bytes"] == 300 and events[-1]["status"] == "finished"
+
+        with open(textfile_path, "rt") as textfile_io:
+            lines: list[str] = textfile_io.read().splitlines()
+        assert 'autoeb_jobs{out="a\\"b",stage="test",state="done"} 4.0' in lines
+        assert 'autoeb_stage_running{out="a\\"b",stage="test"} 0.0' in lines
+        assert 'autoeb_io_bytes_total{out="a\\"b",stage="test"} 300.0' in lines
@@ -0,0 +1,61 @@
+import unittest
+from autoeb.model_cache import ModelCache
+from autoeb.model_parameters import ModelParameters
+
+from test.common import get_output_dir, get_test_data_dir
+
+
+class ModelTest(unittest.TestCase):
+    """モデルパラメータのユニットテストを行うクラスです。
+    """
+
+    def test_load_dna(self) -> None:
+        """塩基置換モデルのレポートの読み込みをテストします。
+        """
+        parameters: ModelParameters = ModelParameters.load(get_test_data_dir() + "model-dna.iqtree")
+        assert parameters.model == "HKY+F+I+G4"
+        assert parameters.rates["A-G"] == 3.2551
+        assert parameters.frequencies == [0.3526, 0.2204, 0.1161, 0.3109]
+        assert parameters.invariable == 0.2795
+        assert parameters.gamma_alpha == 0.8125
+        assert not parameters.is_mixture
+        assert parameters.to_fixed_model() == "GTR{1,3.2551,1,1,3.2551}+F{0.3526,0.2204,0.1161,0.3109}+I{0.2795}+G4{0.8125}"
+
+    def test_load_protein(self) -> None:
+        """アミノ酸置換モデルのレポートの読み込みをテストします。
+        """
+        parameters: ModelParameters = ModelParameters.load(get_test_data_dir() + "model-aa.iqtree")
+        assert parameters.model == "LG+F+R3"
+        assert len(parameters.frequencies) == 20
+        assert parameters.free_rates == [[0.4009, 0.1161], [0.3213, 0.8212], [0.2778, 2.5080]]
+        assert parameters.to_fixed_model() == "LG+F+R3{0.4009,0.1161,0.3213,0.8212,0.2778,2.508}"
+
+    def test_load_mixture(self) -> None:
+        """混合モデルのレポートの読み込みをテストします。
+        """
+        parameters: ModelParameters = ModelParameters.load(get_test_data_dir() + "model-mixture.iqtree")
+        assert parameters.model == "LG+C20+F+G4"
+        assert parameters.is_mixture
+        assert parameters.gamma_alpha == 0.7021
+        # weights of the components are not fixed
+        assert parameters.to_fixed_model() == "LG+C20+F+G4{0.7021}"
+
+    def test_cache(self) -> None:
+        """モデルパラメータのキャッシュをテストします。
+        """
+        cache = ModelCache(get_output_dir() + "model-cache")
+        sequence: str = get_test_data_dir() + "catpv.txt"
+        tree: str = get_test_data_dir() + "newick-7.tree"
+        key: str = ModelCache.create_key(sequence, "LG+F+R3", tree, "")
+        assert key != ModelCache.create_key(sequence, "LG+F+G4", tree, "")
+        assert key != ModelCache.create_key(sequence, "LG+F+R3", get_test_data_dir() + "newick-5.tree", "")
+
+        parameters: ModelParameters = ModelParameters.load(get_test_data_dir() + "model-aa.iqtree")
+        cache.save(key, parameters)
+        loaded: ModelParameters | None = cache.load(key)
+        assert loaded is not None
+        assert loaded.to_fixed_model() == parameters.to_fixed_model()
+        assert cache.load("0" * 64) is None
+        # a directory cannot be created under a file
+        with self.assertRaises(OSError):
+            ModelCache(sequence + "/model-cache")
@@ -0,0 +1,46 @@
+import math
+import os
+import unittest
+from autoeb import CatpvResult, Prescreen, SlhData
+from autoeb.output_formatter import OutputFormatter
+from autoeb.result_table import ResultTable
+
+from test.common import get_output_dir
+
+
+class PrescreenTest(unittest.TestCase):
+    """Prescreenのユニットテストを行うクラスです。
+    """
+
+    def test_prescreen(self) -> None:
+        """サイト尤度からの事前判定をテストします。
+        """
+        for rho in [-0.9, -0.3, 0.0, 0.5, 0.95]:
+            assert abs(Prescreen.bivariate_normal(0, 0, rho) - (0.25 + math.asin(rho) / (2 * math.pi))) < 1e-6
+
+        ml: list[float] = [-1.0 - (i % 7) * 0.5 for i in range(1000)]
+        # 1st bipartition: NNI trees are much worse than ML tree
+        worse: list[list[float]] = [[v - 0.2 - (i % 3) * 0.1 for i, v in enumerate(ml)], [v - 0.3 + (i % 2) * 0.1 for i, v in enumerate(ml)]]
+        # 2nd bipartition: NNI tree is slightly better than ML tree
+        close: list[list[float]] = [[v + (0.1 if i % 2 == 0 else -0.099) for i, v in enumerate(ml)], worse[0]]
+        prescreen = Prescreen(0.05)
+        results: list[CatpvResult] = prescreen.evaluate(SlhData([ml] + worse + close))
+        assert len(results) == 2
+        assert results[0].stat_ml.rank == 1 and results[0].stat_nni1.obs > 0
+        assert prescreen.decide(results[0]) is True
+        assert results[1].stat_nni1.kh > 0.5
+        assert prescreen.decide(results[1]) is False
+
+        # AU test is not performed, so the branch name and the result table show the decision instead of the AU p-value
+        assert math.isnan(results[1].stat_nni1.au) and math.isnan(results[1].stat_ml.np)
+        assert OutputFormatter("{bin}/{p}/{kh-bin}/{screen}").format("90", results[1], 0.05, False) == "0/NA/0/1"
+        assert OutputFormatter("{bin}/{p}/{screen}").format("90", results[0], 0.05, True) == "1/NA/1"
+        path: str = get_output_dir() + "prescreen.sqlite"
+        if os.path.isfile(path):
+            os.remove(path)
+        with ResultTable(path) as table:
+            table.set_leaves(["A", "B", "C", "D"])
+            table.write(0, "0011", "a" * 64, "prescreen", None, False, (0.1, -0.2), results[1], None)
+            row = table.read()[0]
+            assert row["nni1_au"] is None and row["nni1_kh"] == results[1].stat_nni1.kh
+            assert math.isnan(ResultTable.to_catpv(row).stat_nni1.au)
@@ -0,0 +1,62 @@
+import signal
+import sys
+from threading import Thread
+import time
+import unittest
+from autoeb.operation_cancelled_error import OperationCancelledError
+from autoeb.process_registry import ProcessRegistry
+from autoeb.resource_ledger import ResourceLedger
+
+
+class ProcessTest(unittest.TestCase):
+    """ProcessRegistryとResourceLedgerのユニットテストを行うクラスです。
+    """
+
+    def test_cancel_processes(self) -> None:
+        """実行中の外部プログラムの取り消しをテストします。
+        """
+        registry = ProcessRegistry()
+        errors: list[BaseException] = []
+
+        def run() -> None:
+            try:
+                registry.run(["sleep", "30"])
+            except BaseException as e:
+                errors.append(e)
+
+        thread = Thread(target=run)
+        thread.start()
+        time.sleep(0.5)
+        started: float = time.monotonic()
+        registry.cancel(signal.SIGTERM)
+        thread.join()
+        assert time.monotonic() - started < 5
+        assert len(errors) == 1 and isinstance(errors[0], OperationCancelledError)
+
+        # programs are not started after the cancellation
+        assert registry.is_cancelled and registry.signal_number == signal.SIGTERM
+        try:
+            registry.run(["true"])
+            assert False
+        except OperationCancelledError:
+            pass
+
+    def test_process_usage(self) -> None:
+        """外部プログラムの資源の使用量の集計をテストします。
+        """
+        registry = ProcessRegistry()
+        ledger = ResourceLedger()
+        with ledger.scope("test", 1):
+            for size in [64, 16]:
+                result, usage = registry.run_measured([sys.executable, "-c", f"bytearray({size} * 1024 * 1024)"], "python")
+                assert result.returncode == 0
+                ledger.record(usage)
+        ledger.record(registry.run_measured(["true"], "true")[1])
+
+        programs = ledger.programs
+        assert sorted(programs.keys()) == ["python", "true"]
+        assert programs["python"].processes == 2 and programs["python"].max_rss >= 64 * 1024 * 1024
+        assert programs["python"].wall_time > 0 and programs["python"].user_time > 0
+        scoped = ledger.get_stage("test")
+        assert list(scoped.keys()) == [1] and scoped[1].processes == 2
+        assert ledger.get("test", 0) is None
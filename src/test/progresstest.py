@@ -0,0 +1,27 @@
+import unittest
+from autoeb import JobExecutionError, JobExecutor
+from autoeb.progress_monitor import ProgressMonitor
+
+
+class ProgressTest(unittest.TestCase):
+    """ProgressMonitorのユニットテストを行うクラスです。
+    """
+
+    def test_progress(self) -> None:
+        """ジョブの状態の集計をテストします。
+        """
+        def fail() -> int:
+            raise RuntimeError("failed")
+
+        with ProgressMonitor("test", 12, None) as progress:
+            progress.skip(2)
+            with JobExecutor[int, int](2, retries=1, progress=progress) as executor:
+                for i in range(9):
+                    executor.submit(i, lambda x: x, i)
+                executor.submit(9, fail)
+                try:
+                    executor.wait()
+                except JobExecutionError:
+                    pass
+            assert progress.counts == (0, 0, 11, 1)
+            assert progress.format() == "test: 12 / 12 finished (0 queued, 0 running, 11 done, 1 failed)"
@@ -0,0 +1,105 @@
+import os
+import random
+import subprocess
+import sys
+import time
+import unittest
+from autoeb import CatpvResult
+from autoeb.sitelh_store import SitelhStore
+from autoeb.work_queue import WorkQueue
+
+from test.common import get_output_dir, get_stub_env
+
+
+class QueueTest(unittest.TestCase):
+    """WorkQueueとQueueWorkerのユニットテストを行うクラスです。
+    """
+
+    def test_work_queue(self) -> None:
+        """ジョブキューのリースと再実行をテストします。
+        """
+        path: str = get_output_dir() + "queue.sqlite"
+        if os.path.isfile(path):
+            os.remove(path)
+        with WorkQueue(path) as queue:
+            queue.reset()
+            queue.put(0, {"index": 0}, 2)
+            queue.put(1, {"index": 1}, 2)
+            assert queue.claim("a", 60) == (0, {"index": 0})
+            assert queue.claim("b", -1) == (1, {"index": 1})
+
+            # jobs whose lease is expired are claimed by another worker
+            assert queue.claim("c", 60) == (1, {"index": 1})
+            assert queue.claim("c", 60) is None
+            queue.complete(1, "b", {"value": 0})
+
+            # failed jobs are retried until the number of attempts reaches the limit
+            queue.fail(0, "a", "error")
+            assert queue.claim("d", 60) == (0, {"index": 0})
+            assert not queue.renew(0, "a", 60)
+            queue.complete(0, "d", {"value": 1})
+            queue.fail(1, "c", "error")
+            assert queue.collect() == [(0, WorkQueue.STATE_DONE, {"value": 1}), (1, WorkQueue.STATE_FAILED, "error")]
+            assert queue.collect() == []
+
+            queue.finish()
+            queue.put(2, {"index": 2}, 1)
+            assert queue.is_closed
+            assert queue.claim("a", 60) is None
+
+        # file locks of the local file system exclude other processes, and the probe file is removed
+        WorkQueue.check_locks(path)
+        assert not any([name.startswith(".autoeb-lock-") for name in os.listdir(os.path.dirname(path))])
+
+    def test_queue_workers(self) -> None:
+        """ジョブキューのジョブを複数のワーカーで実行するテストを行います。
+        """
+        queue_path: str = get_output_dir() + "workers.sqlite"
+        store_path: str = get_output_dir() + "workers-sitelh.sqlite"
+        for path in [queue_path, store_path]:
+            if os.path.isfile(path):
+                os.remove(path)
+        generator = random.Random(1)
+        topologies: list[str] = [f"tree{i}" for i in range(9)]
+        with SitelhStore(store_path) as store:
+            store.save("f" * 64, dict([(topology, [generator.gauss(-10.0, 1.0) for _ in range(200)]) for topology in topologies]))
+
+        with WorkQueue(queue_path) as queue:
+            queue.reset()
+            for i in range(4):
+                queue.put(i, {
+                    "index": i,
+                    "branch_count": 4,
+                    "seed": 1,
+                    "store": store_path,
+                    "fingerprint": "f" * 64,
+                    "topologies": [topologies[0], topologies[1 + i * 2], topologies[2 + i * 2]],
+                    "rell_boot": 1000,
+                    "adaptive_bootstrap": None,
+                    "sig_level": 0.05,
+                }, 1)
+            src_dir: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            # the workers run the stub CONSEL
+            env: dict[str, str] = get_stub_env(get_output_dir() + "workers-stubs")
+            # a worker runs several jobs at once with '-j'
+            workers: list[subprocess.Popen] = [
+                subprocess.Popen([sys.executable, "-m", "autoeb", "worker", queue_path, "--idle-timeout", "30"] + options, cwd=src_dir, env=env, stdout=subprocess.DEVNULL)
+                for options in [["-j", "2"], list[str]()]]
+            try:
+                collected: list = []
+                deadline: float = time.monotonic() + 60
+                while len(collected) < 4 and time.monotonic() < deadline:
+                    collected += queue.collect()
+                    time.sleep(0.1)
+            finally:
+                # workers exit when the queue is closed
+                queue.finish()
+                for worker in workers:
+                    worker.wait(60)
+        assert sorted([job_id for job_id, _, _ in collected]) == [0, 1, 2, 3]
+        for _, state, value in collected:
+            assert state == WorkQueue.STATE_DONE
+            assert value["replicates"] == 1000
+            result: CatpvResult = CatpvResult.from_rows(value["entries"])
+            assert 0 <= result.stat_nni1.au <= 1 and 0 <= result.stat_nni2.au <= 1
+        assert all([worker.returncode == 0 for worker in workers])
@@ -0,0 +1,36 @@
+import os
+import unittest
+from autoeb import CatpvResult
+from autoeb.result_table import ResultTable
+
+from test.common import compare_statistics_entry, get_output_dir, get_test_data_dir
+
+
+class ResultTableTest(unittest.TestCase):
+    """ResultTableのユニットテストを行うクラスです。
+    """
+
+    def test_result_table(self) -> None:
+        """検定結果の表の保存と読み込みをテストします。
+        """
+        path: str = get_output_dir() + "results.sqlite"
+        if os.path.isfile(path):
+            os.remove(path)
+        catpv: CatpvResult = CatpvResult.load(get_test_data_dir() + "catpv.txt")[0]
+        with ResultTable(path) as table:
+            table.set_leaves(["A", "B", "C", "D"])
+            table.set_metadata({"model": "JTT", "seed": "1"})
+            table.write(3, "0011", "a" * 64, "consel", 1000, False, (-1.0, -2.0), catpv, 0.5)
+            # rows are committed when the table is closed
+            assert list(table.read().keys()) == [3]
+
+        # leaves and metadata are kept, and rows are restored into CatpvResult
+        with ResultTable(path) as table:
+            table.set_leaves(["A", "B", "C", "D"])
+            assert table.get_metadata() == {"model": "JTT", "seed": "1"}
+            rows = table.read()
+            assert list(rows.keys()) == [3]
+            assert rows[3]["split"] == "0011" and rows[3]["replicates"] == 1000
+            compare_statistics_entry(ResultTable.to_catpv(rows[3]).stat_nni1, 1, 2, -0.0, 0.596, 0.446, 0.441, 0.343, 0.563, 0.731, 0.563, 0.733)
+            table.set_leaves(["A", "B", "C", "E"])
+            assert table.read() == {}
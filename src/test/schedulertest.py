@@ -0,0 +1,45 @@
+from threading import Thread
+import time
+import unittest
+from autoeb.core_pool import CorePool
+from autoeb.thread_scheduler import ThreadScheduler
+
+
+class SchedulerTest(unittest.TestCase):
+    """ThreadSchedulerとCorePoolのユニットテストを行うクラスです。
+    """
+
+    def test_thread_scheduler(self) -> None:
+        """スレッド数の分配をテストします。
+        """
+        assert ThreadScheduler(8, 3).shares == [3, 3, 2]
+        assert ThreadScheduler(2, 4).shares == [1, 1]
+        scheduler = ThreadScheduler(5, 2)
+        with scheduler.allocate() as first:
+            with scheduler.allocate() as second:
+                assert first + second == 5
+
+    def test_core_pool(self) -> None:
+        """共有するコアの割り当てをテストします。
+        """
+        pool = CorePool(4)
+        order: list[str] = []
+
+        def run(name: str, cores: int) -> None:
+            with pool.acquire(cores) as share:
+                order.append(f"{name}:{share}")
+
+        with pool.acquire(3) as first:
+            assert first == 3 and pool.free == 1
+            # the large request is not overtaken by the later small request
+            large = Thread(target=run, args=("large", 8))
+            large.start()
+            time.sleep(0.1)
+            small = Thread(target=run, args=("small", 1))
+            small.start()
+            time.sleep(0.1)
+            assert order == []
+        large.join()
+        small.join()
+        assert order == ["large:4", "small:1"]
+        assert pool.free == 4
@@ -0,0 +1,66 @@
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import unittest
+from autoeb.scratch_dir import ScratchDir
+
+from test.common import get_output_dir
+
+
+class ScratchTest(unittest.TestCase):
+    """作業ディレクトリのユニットテストを行うクラスです。
+    """
+
+    def test_scratch_dir(self) -> None:
+        """作業ディレクトリの作成と削除をテストします。
+        """
+        out_dir: str = get_output_dir() + "scratch-out"
+        os.makedirs(out_dir, exist_ok=True)
+        # intermediates are placed in the output directory by default
+        assert ScratchDir(None, out_dir).path == out_dir
+        assert not ScratchDir(None, out_dir).is_separated
+
+        root: str = get_output_dir() + "scratch"
+        shutil.rmtree(root, ignore_errors=True)
+        os.makedirs(root)
+        scratch = ScratchDir(root, out_dir)
+        assert scratch.is_separated
+        assert os.path.basename(scratch.path).startswith(ScratchDir.PREFIX)
+        with open(os.path.join(scratch.path, ScratchDir.OWNER_FILE), "rt") as owner_io:
+            assert owner_io.read() == f"{socket.gethostname()}:{os.getpid()}"
+        # the same output directory uses the same working directory
+        assert ScratchDir(root, out_dir).path == scratch.path
+        scratch.cleanup()
+        assert not os.path.exists(scratch.path)
+
+    def test_remove_stale(self) -> None:
+        """終了したプロセスが残した作業ディレクトリの削除をテストします。
+        """
+        root: str = get_output_dir() + "stale"
+        shutil.rmtree(root, ignore_errors=True)
+        process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, check=True)
+        dead_pid: int = int(process.stdout)
+        owners: dict[str, str | None] = {
+            "autoeb-dead": f"{socket.gethostname()}:{dead_pid}",
+            "autoeb-alive": f"{socket.gethostname()}:{os.getpid()}",
+            "autoeb-remote": f"other-host.invalid:{dead_pid}",
+            "autoeb-unknown": None,
+            "other-dead": f"{socket.gethostname()}:{dead_pid}",
+        }
+        for name, owner in owners.items():
+            os.makedirs(os.path.join(root, name))
+            if owner is not None:
+                with open(os.path.join(root, name, ScratchDir.OWNER_FILE), "wt") as owner_io:
+                    owner_io.write(owner)
+
+        # only the directories of the finished processes of this host are removed
+        assert ScratchDir.remove_stale(root, []) == [os.path.join(root, "autoeb-dead")]
+        assert sorted(os.listdir(root)) == ["autoeb-alive", "autoeb-remote", "autoeb-unknown", "other-dead"]
+
+        # the working directory of the same output directory is kept for resuming
+        os.makedirs(os.path.join(root, "autoeb-dead"))
+        with open(os.path.join(root, "autoeb-dead", ScratchDir.OWNER_FILE), "wt") as owner_io:
+            owner_io.write(f"{socket.gethostname()}:{dead_pid}")
+        assert ScratchDir.remove_stale(root, [os.path.join(root, "autoeb-dead")]) == []
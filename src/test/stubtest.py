@@ -0,0 +1,40 @@
+import os
+import unittest
+from autoeb import CatpvResult, Configuration, ConselManager, SlhData
+from autoeb.bench.stub_programs import write_stub_programs
+
+from test.common import get_output_dir
+
+
+class StubTest(unittest.TestCase):
+    """スタブのIQ-TREEとCONSELのユニットテストを行うクラスです。
+    """
+
+    def test_stub_programs(self) -> None:
+        """AUTOEB_CONFIGで指定したスタブのCONSELによるAU検定をテストします。
+        """
+        stub_dir: str = get_output_dir() + "stubs"
+        os.makedirs(stub_dir, exist_ok=True)
+        config_path: str = write_stub_programs(stub_dir, {"makermt_delay": 0, "consel_delay": 0, "reject_ratio": 1.0})
+        os.environ[Configuration.ENV_CONFIG_PATH] = config_path
+        try:
+            config: Configuration = Configuration.load()
+        finally:
+            del os.environ[Configuration.ENV_CONFIG_PATH]
+        assert config.consel_dir == stub_dir
+        assert Configuration.get_config_path() != config_path
+
+        SlhData([[-1.0, -2.0], [-1.5, -2.5], [-1.2, -2.1]]).export(os.path.join(stub_dir, "0.sitelh"))
+        manager = ConselManager(config)
+        manager.makermt("0.sitelh", 1, 1000, cwd=stub_dir)
+        # 3 trees x 1000 replicates x 10 scales in double precision
+        assert os.path.getsize(os.path.join(stub_dir, "0.rmt")) == 8 * 3 * 1000 * 10
+        # the memory of CONSEL is estimated from the layout of the RMT file and the site likelihood values
+        assert ConselManager.get_rmt_size(1000) == os.path.getsize(os.path.join(stub_dir, "0.rmt"))
+        assert ConselManager.estimate_memory(2, 1000) == ConselManager.get_rmt_size(1000) + 8 * 3 * 2
+        manager.consel("0", cwd=stub_dir)
+        with open(os.path.join(stub_dir, "0.catpv"), "wt") as catpv_io:
+            manager.catpv("0", cwd=stub_dir, stdout=catpv_io)
+        result: CatpvResult = CatpvResult.load(os.path.join(stub_dir, "0.catpv"))[0]
+        assert result.stat_ml.rank == 1
+        assert result.stat_nni1.au < 0.05 and result.stat_nni2.au < 0.05
@@ -0,0 +1,38 @@
+import json
+import time
+import unittest
+from autoeb import JobExecutor
+from autoeb.trace_recorder import TraceRecorder
+
+from test.common import get_output_dir
+
+
+class TraceTest(unittest.TestCase):
+    """TraceRecorderのユニットテストを行うクラスです。
+    """
+
+    def test_trace(self) -> None:
+        """スレッドごとの区間の記録をテストします。
+        """
+        tracer = TraceRecorder(get_output_dir() + "trace.json")
+
+        def run(key: int) -> int:
+            with tracer.span(f"job {key}", "test", key=key):
+                time.sleep(0.01)
+            return key
+
+        with tracer.span("all jobs", "test"):
+            with JobExecutor[int, int](2, name="lane") as executor:
+                for i in range(4):
+                    executor.submit(i, run, i)
+                executor.wait()
+        tracer.write()
+
+        with open(tracer.path, "rt") as trace_io:
+            events: list[dict] = json.load(trace_io)["traceEvents"]
+        spans: dict[str, dict] = dict([(e["name"], e) for e in events if e["ph"] == "X"])
+        lanes: dict[int, str] = dict([(e["tid"], e["args"]["name"]) for e in events if e["name"] == "thread_name"])
+        assert len(spans) == 5 and spans["job 2"]["args"] == {"key": 2}
+        assert all([spans[f"job {i}"]["dur"] >= 10_000 and spans[f"job {i}"]["ts"] >= spans["all jobs"]["ts"] for i in range(4)])
+        assert lanes[spans["all jobs"]["tid"]] == "MainThread"
+        assert all([lanes[spans[f"job {i}"]["tid"]].startswith("lane_") for i in range(4)])
@@ -1,7 +1,12 @@
+from argparse import ArgumentError
 from io import StringIO
+import os
 import unittest
-from autoeb.nnigen import read_tree, Node, Tree
+from autoeb.nnigen import read_tree, Node, TopologyIndex, Tree, TreeCounters
+from autoeb import ValueRange
+from autoeb.branch_selector import BranchSelector
 from autoeb.nnigen.io import treetype
+from autoeb.stage_profiler import StageProfiler
 
 from test.common import get_output_dir, get_test_data_dir
 
@@ -93,3 +98,77 @@ class TreeTest(unittest.TestCase):
         actual.sort()
         for i in range(len(actual)):
             assert predict[i] == actual[i]
+
+    def test_branch_selector(self) -> None:
+        """支持値・枝長・クレードによる二分岐の選択をテストします。
+        """
+        tree: Tree = read_tree(get_test_data_dir() + "newick-7.tree", treetype.newick)
+        index = TopologyIndex(tree)
+        all_range: ValueRange = ValueRange.parse("ALL")
+
+        # branches: 100/100:0.2, 98/97:0.3 (211,212), 95/100:0.1 (2211,2212,222) and 50/75:0.2 (2211,2212)
+        assert BranchSelector(all_range).select(tree, index) == [True, True, True, True]
+        assert BranchSelector(all_range, support_below=96).select(tree, index) == [False, False, True, True]
+        assert BranchSelector(all_range, length_below=0.25).select(tree, index) == [True, False, True, True]
+        assert BranchSelector(all_range, clade=["2211", "2212", "222"]).select(tree, index) == [False, False, True, True]
+        # either side of the unrooted split may lie inside the clade
+        assert BranchSelector(all_range, clade=["1", "3", "211", "212"]).select(tree, index) == [True, True, True, False]
+        assert BranchSelector(ValueRange.parse("1-"), support_below=99, length_below=0.25).select(tree, index) == [False, False, True, True]
+        assert BranchSelector.parse_support("abc") is None
+        with self.assertRaises(ArgumentError):
+            BranchSelector(all_range, clade=["1", "4"]).select(tree, index)
+
+        # the range is converted to the mask at once
+        branch_range: ValueRange = ValueRange.parse("2,4-6,9-")
+        assert branch_range.to_mask(12) == [i in branch_range for i in range(12)]
+
+    def test_counters(self) -> None:
+        """ノードの走査数とツリーのコピー数の計数，段階の計測をテストします。
+        """
+        tree: Tree = read_tree(get_test_data_dir() + "newick-7.tree", treetype.newick)
+        profiler = StageProfiler(["nni"], get_output_dir())
+        profiler.start()
+        try:
+            visited, copies = TreeCounters.get_counts()
+            assert len(list(tree.root.iterate_all_nodes())) == 11
+            assert TreeCounters.get_counts() == (visited + 11, copies)
+
+            # unfinished generators are counted when closed
+            generator = tree.root.iterate_all_nodes()
+            next(generator)
+            generator.close()
+            assert TreeCounters.get_counts()[0] == visited + 12
+
+            with profiler.profile("nni"), profiler.profile("nni"):
+                trees: list[Tree] = list(tree.iterate_all_nni_trees())
+            with profiler.profile("catpv"):
+                pass
+            assert TreeCounters.get_counts()[1] == copies + (len(trees) - 1) // 2 * 3
+        finally:
+            profiler.stop()
+
+        assert profiler.write_reports() == [get_output_dir() + "profile-nni.txt"]
+        assert os.path.isfile(get_output_dir() + "profile-nni.pstats")
+        with open(get_output_dir() + "profile-nni.txt", "rt") as report_io:
+            report: list[str] = report_io.read().splitlines()
+        assert report[:2] == ["Stage: nni", "Invocations: 1"]
+        assert f"Tree copies: {(len(trees) - 1) // 2 * 3}" in report
+        assert "[Hotspots]" in report and "[Allocations]" in report
+
+    def test_topology_hash(self) -> None:
+        """トポロジーのハッシュ値のテストを行います。
+        """
+        tree: Tree = read_tree(get_test_data_dir() + "newick-7.tree", treetype.newick)
+        index = TopologyIndex(tree)
+
+        # branch lengths, labels and order of children are ignored
+        with StringIO("(3,((222,(2212,2211)),(212,211)),1);") as io:
+            assert TopologyIndex(read_tree(io, treetype.newick)).topology_hash == index.topology_hash
+
+        # hashes derived from the ML tree are equal to those of NNI trees
+        actual: list[str] = [TopologyIndex(current).topology_hash for current in tree.iterate_all_nni_trees()]
+        predict: list[str] = [index.topology_hash]
+        for branch_index in range(len(index.branch_splits)):
+            predict += index.get_nni_topology_hashes(branch_index)
+        assert actual == predict
+        assert len(set(actual)) == len(actual)